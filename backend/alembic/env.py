@@ -3,7 +3,7 @@ from alembic import context
 import asyncio
 from sqlalchemy.ext.asyncio import AsyncEngine
 from app.models.base import Base
-from app.models import variant  # noqa: F401
+from app.models import variant, user, classification_event, batch_job, evidence_blob  # noqa: F401
 
 config = context.config
 
@@ -0,0 +1,41 @@
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20261018_0003'
+down_revision = '20250821_0002'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'batch_jobs',
+        sa.Column('id', sa.String, primary_key=True),
+        sa.Column('user_id', sa.Integer, nullable=True),
+        sa.Column('status', sa.String, nullable=False),
+        sa.Column('total', sa.Integer, nullable=False),
+        sa.Column('completed', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('failed', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now())
+    )
+    op.create_index('ix_batch_jobs_user_id', 'batch_jobs', ['user_id'])
+
+    op.create_table(
+        'batch_job_items',
+        sa.Column('id', sa.Integer, primary_key=True),
+        sa.Column('job_id', sa.String, nullable=False),
+        sa.Column('position', sa.Integer, nullable=False),
+        sa.Column('hgvs', sa.String, nullable=False),
+        sa.Column('genome_build', sa.String, nullable=False),
+        sa.Column('classification', sa.String, nullable=True),
+        sa.Column('variant_id', sa.Integer, nullable=True),
+        sa.Column('error', sa.String, nullable=True)
+    )
+    op.create_index('ix_batch_job_items_job_position', 'batch_job_items', ['job_id', 'position'], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_batch_job_items_job_position', table_name='batch_job_items')
+    op.drop_table('batch_job_items')
+    op.drop_index('ix_batch_jobs_user_id', table_name='batch_jobs')
+    op.drop_table('batch_jobs')
@@ -0,0 +1,57 @@
+"""Deduplicate variants on (hgvs, genome_build); add evidence_hash and last_seen_at."""
+from alembic import op
+import sqlalchemy as sa
+import hashlib
+import json
+
+revision = '20261018_0004'
+down_revision = '20261018_0003'
+branch_labels = None
+depends_on = None
+
+
+def _evidence_hash(evidence) -> str:
+    if isinstance(evidence, str):
+        evidence = json.loads(evidence)
+    return hashlib.sha256(json.dumps(evidence, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+def upgrade():
+    conn = op.get_bind()
+    # SQLite cannot ADD COLUMN with a non-constant default, so it gets a table rebuild instead
+    with op.batch_alter_table('variants', recreate='always' if conn.dialect.name == 'sqlite' else 'auto') as batch:
+        batch.add_column(sa.Column('evidence_hash', sa.String(64), nullable=True))
+        batch.add_column(sa.Column('last_seen_at', sa.DateTime(timezone=True), server_default=sa.func.now()))
+    variants = sa.table(
+        'variants',
+        sa.column('id', sa.Integer), sa.column('hgvs', sa.String), sa.column('genome_build', sa.String),
+        sa.column('evidence', sa.JSON), sa.column('evidence_hash', sa.String),
+        sa.column('created_at', sa.DateTime), sa.column('last_seen_at', sa.DateTime),
+    )
+
+    # Normalize keys, then keep the newest row per (hgvs, genome_build)
+    rows = conn.execute(sa.select(variants.c.id, variants.c.hgvs, variants.c.genome_build).order_by(variants.c.id)).all()
+    keys = {vid: (''.join((hgvs or '').split()), build or 'GRCh38') for vid, hgvs, build in rows}
+    survivor = {key: vid for vid, key in keys.items()}  # ascending ids: the newest wins
+    for vid, hgvs, build in rows:
+        key = keys[vid]
+        keep = survivor[key]
+        if keep != vid:
+            # History and job results of the dropped copy move to the surviving variant
+            conn.execute(sa.text('UPDATE classification_events SET variant_id = :new WHERE variant_id = :old'), {'new': keep, 'old': vid})
+            conn.execute(sa.text('UPDATE batch_job_items SET variant_id = :new WHERE variant_id = :old'), {'new': keep, 'old': vid})
+            conn.execute(variants.delete().where(variants.c.id == vid))
+        elif key != (hgvs, build):
+            conn.execute(variants.update().where(variants.c.id == vid).values(hgvs=key[0], genome_build=key[1]))
+
+    for vid, evidence in conn.execute(sa.select(variants.c.id, variants.c.evidence)).all():
+        conn.execute(variants.update().where(variants.c.id == vid).values(evidence_hash=_evidence_hash(evidence)))
+    conn.execute(variants.update().values(last_seen_at=variants.c.created_at))
+    op.create_index('uq_variants_hgvs_build', 'variants', ['hgvs', 'genome_build'], unique=True)
+
+
+def downgrade():
+    op.drop_index('uq_variants_hgvs_build', table_name='variants')
+    with op.batch_alter_table('variants') as batch:
+        batch.drop_column('last_seen_at')
+        batch.drop_column('evidence_hash')
@@ -0,0 +1,88 @@
+"""Content-addressed evidence blobs; variants and events reference evidence by hash."""
+from alembic import op
+import sqlalchemy as sa
+import hashlib
+import json
+import zlib
+
+revision = '20261018_0005'
+down_revision = '20261018_0004'
+branch_labels = None
+depends_on = None
+
+COMPRESS_MIN_BYTES = 512
+CHUNK = 1000
+
+
+def _load(evidence):
+    return json.loads(evidence) if isinstance(evidence, str) else evidence
+
+
+def _encode(raw: bytes):
+    if len(raw) >= COMPRESS_MIN_BYTES:
+        packed = zlib.compress(raw, 6)
+        if len(packed) < len(raw):
+            return 'zlib', packed
+    return 'json', raw
+
+
+def _move_to_blobs(conn, table, blobs, known):
+    """Replace inline evidence with blob references, one chunk of rows at a time."""
+    while True:
+        rows = conn.execute(
+            sa.select(table.c.id, table.c.evidence).where(table.c.evidence.isnot(None)).limit(CHUNK)
+        ).all()
+        if not rows:
+            return
+        new_blobs = []
+        for vid, evidence in rows:
+            raw = json.dumps(_load(evidence), sort_keys=True, separators=(',', ':')).encode()
+            digest = hashlib.sha256(raw).hexdigest()
+            if digest not in known:
+                known.add(digest)
+                encoding, data = _encode(raw)
+                new_blobs.append(dict(hash=digest, encoding=encoding, data=data, size=len(raw)))
+            conn.execute(table.update().where(table.c.id == vid).values(evidence=None, evidence_hash=digest))
+        if new_blobs:
+            conn.execute(blobs.insert(), new_blobs)
+
+
+def upgrade():
+    op.create_table(
+        'evidence_blobs',
+        sa.Column('hash', sa.String(64), primary_key=True),
+        sa.Column('encoding', sa.String, nullable=False),
+        sa.Column('data', sa.LargeBinary, nullable=False),
+        sa.Column('size', sa.Integer, nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now())
+    )
+    with op.batch_alter_table('variants') as batch:
+        batch.alter_column('evidence', existing_type=sa.JSON, nullable=True)
+    with op.batch_alter_table('classification_events') as batch:
+        batch.alter_column('evidence', existing_type=sa.JSON, nullable=True)
+        batch.add_column(sa.Column('evidence_hash', sa.String(64), nullable=True))
+
+    conn = op.get_bind()
+    blobs = sa.table('evidence_blobs', sa.column('hash'), sa.column('encoding'), sa.column('data'), sa.column('size'))
+    known = set()
+    for name in ('variants', 'classification_events'):
+        table = sa.table(name, sa.column('id', sa.Integer), sa.column('evidence', sa.JSON(none_as_null=True)), sa.column('evidence_hash', sa.String))
+        _move_to_blobs(conn, table, blobs, known)
+
+
+def downgrade():
+    conn = op.get_bind()
+    blobs = {
+        h: json.loads(zlib.decompress(data) if encoding == 'zlib' else data)
+        for h, encoding, data in conn.execute(sa.text('SELECT hash, encoding, data FROM evidence_blobs'))
+    }
+    for name in ('variants', 'classification_events'):
+        table = sa.table(name, sa.column('id', sa.Integer), sa.column('evidence', sa.JSON), sa.column('evidence_hash', sa.String))
+        for vid, digest in conn.execute(sa.select(table.c.id, table.c.evidence_hash).where(table.c.evidence.is_(None))).all():
+            conn.execute(table.update().where(table.c.id == vid).values(evidence=blobs.get(digest, [])))
+    with op.batch_alter_table('classification_events') as batch:
+        batch.drop_column('evidence_hash')
+        batch.alter_column('evidence', existing_type=sa.JSON, nullable=False)
+    with op.batch_alter_table('variants') as batch:
+        batch.alter_column('evidence', existing_type=sa.JSON, nullable=False)
+    op.drop_table('evidence_blobs')
@@ -0,0 +1,26 @@
+from alembic import op
+
+revision = '20261018_0006'
+down_revision = '20261018_0005'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Filter column + id, so filtered keyset pages (id DESC) are a single index range
+    op.create_index('ix_variants_classification_id', 'variants', ['classification', 'id'])
+    op.create_index('ix_variants_build_id', 'variants', ['genome_build', 'id'])
+    op.create_index('ix_variants_created_by_id', 'variants', ['created_by', 'id'])
+    op.create_index('ix_variants_created_at_id', 'variants', ['created_at', 'id'])
+    op.drop_index('ix_variants_created_by', table_name='variants')
+    op.create_index('ix_classification_events_variant_id_id', 'classification_events', ['variant_id', 'id'])
+    op.drop_index('ix_classification_events_variant_id', table_name='classification_events')
+
+
+def downgrade():
+    op.create_index('ix_classification_events_variant_id', 'classification_events', ['variant_id'])
+    op.drop_index('ix_classification_events_variant_id_id', table_name='classification_events')
+    op.create_index('ix_variants_created_by', 'variants', ['created_by'])
+    op.drop_index('ix_variants_created_at_id', table_name='variants')
+    op.drop_index('ix_variants_created_by_id', table_name='variants')
+    op.drop_index('ix_variants_build_id', table_name='variants')
+    op.drop_index('ix_variants_classification_id', table_name='variants')
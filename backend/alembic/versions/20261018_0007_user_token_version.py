@@ -0,0 +1,15 @@
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20261018_0007'
+down_revision = '20261018_0006'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('users', sa.Column('token_version', sa.Integer, nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('users') as batch:
+        batch.drop_column('token_version')
@@ -0,0 +1,15 @@
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20261018_0008'
+down_revision = '20261018_0007'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('batch_job_items', sa.Column('missing_sources', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('batch_job_items') as batch:
+        batch.drop_column('missing_sources')
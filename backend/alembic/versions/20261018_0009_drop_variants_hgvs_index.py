@@ -0,0 +1,14 @@
+from alembic import op
+
+revision = '20261018_0009'
+down_revision = '20261018_0008'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # uq_variants_hgvs_build leads with hgvs, so it serves every hgvs lookup
+    op.drop_index('ix_variants_hgvs', table_name='variants')
+
+
+def downgrade():
+    op.create_index('ix_variants_hgvs', 'variants', ['hgvs'])
@@ -25,15 +25,15 @@ async def register(req: RegisterRequest, session: AsyncSession = Depends(get_ses
     existing = await repo.get_by_email(req.email)
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
-    user = await repo.create(email=req.email, hashed_password=hash_password(req.password))
-    token = create_access_token(user.email)
+    user = await repo.create(email=req.email, hashed_password=await hash_password(req.password))
+    token = create_access_token(user.email, version=user.token_version)
     return TokenResponse(access_token=token)
 
 @router.post("/login", response_model=TokenResponse)
 async def login(req: LoginRequest, session: AsyncSession = Depends(get_session)):
     repo = UserRepository(session)
     user = await repo.get_by_email(req.email)
-    if not user or not verify_password(req.password, user.hashed_password):
+    if not user or not await verify_password(req.password, user.hashed_password):
         raise HTTPException(status_code=401, detail="Invalid credentials")
-    token = create_access_token(user.email)
+    token = create_access_token(user.email, version=user.token_version)
     return TokenResponse(access_token=token)
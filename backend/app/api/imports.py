@@ -0,0 +1,90 @@
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, List
+import re
+import uuid
+import anyio
+from ..core.db import get_session
+from ..core.security import get_current_user
+from ..config import get_settings
+from ..services.batch import evaluate_variants, persist_evaluations
+from ..services.variant_import import ImportRecord, detect_format, iter_chunks, parse_upload
+from .variants import BatchResultItem
+
+class ImportResultItem(BatchResultItem):
+    position: int
+
+router = APIRouter()
+
+_RESULT_ID = re.compile(r"[0-9a-f]{32}")
+
+def _result_path(user_id: int, result_id: str) -> anyio.Path:
+    # Results are kept per user, so a result id is only resolvable by the user who imported it
+    return anyio.Path(get_settings().import_results_dir) / str(user_id) / f"{result_id}.ndjson"
+
+async def _classify_records(records: AsyncIterator[ImportRecord], session: AsyncSession, user_id: int | None) -> AsyncIterator[List[ImportResultItem]]:
+    """Evaluate and persist records chunk by chunk, yielding each chunk's results as soon as it commits."""
+    settings = get_settings()
+    async for chunk in iter_chunks(records, settings.import_chunk_size):
+        todo = [r for r in chunk if r.error is None]
+        results = await evaluate_variants([(r.hgvs, r.genome_build) for r in todo], settings.batch_concurrency)
+        evaluated = {r.position: res for r, res in zip(todo, results)}
+        ok = [(r.hgvs, r.genome_build, res) for r, res in zip(todo, results) if not isinstance(res, Exception)]
+        ids = iter(await persist_evaluations(session, ok, user_id))
+        items: List[ImportResultItem] = []
+        for r in chunk:
+            res = evaluated.get(r.position)
+            if r.error is not None or isinstance(res, Exception):
+                items.append(ImportResultItem(position=r.position, hgvs=r.hgvs, genome_build=r.genome_build, error=r.error or str(res) or type(res).__name__))
+            else:
+                items.append(ImportResultItem(position=r.position, hgvs=r.hgvs, genome_build=r.genome_build, classification=res["classification"], id=next(ids), missing_sources=res["missing_sources"], degraded=res["degraded"]))
+        yield items
+
+@router.post("/import")
+async def import_variants(
+    file: UploadFile = File(...),
+    format: str | None = None,
+    genome_build: str = "GRCh38",
+    output: str = "stream",
+    session: AsyncSession = Depends(get_session),
+    current_user=Depends(get_current_user),
+):
+    """Classify every variant in a CSV or minimal VCF upload.
+
+    `output=stream` (default) streams NDJSON result lines as each chunk completes;
+    `output=file` writes them to an NDJSON file under IMPORT_RESULTS_DIR and returns a
+    `result_id` to download it from `GET /variants/import/{result_id}`.
+    """
+    fmt = detect_format(file.filename, format)
+    if fmt not in ("csv", "vcf"):
+        raise HTTPException(status_code=422, detail="format must be csv or vcf")
+    if output not in ("stream", "file"):
+        raise HTTPException(status_code=422, detail="output must be stream or file")
+    results = _classify_records(parse_upload(file, fmt, genome_build), session, current_user.id)
+
+    if output == "file":
+        result_id = uuid.uuid4().hex
+        path = _result_path(current_user.id, result_id)
+        await path.parent.mkdir(parents=True, exist_ok=True)
+        total = failed = 0
+        async with await path.open("w") as fh:
+            async for items in results:
+                await fh.write("".join(item.model_dump_json() + "\n" for item in items))
+                total += len(items)
+                failed += sum(1 for i in items if i.error)
+        return {"result_id": result_id, "result_url": f"/variants/import/{result_id}", "total": total, "failed": failed}
+
+    async def ndjson():
+        async for items in results:
+            yield "".join(item.model_dump_json() + "\n" for item in items)
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+@router.get("/import/{result_id}")
+async def import_result(result_id: str, current_user=Depends(get_current_user)):
+    """Download the NDJSON results of an `output=file` import."""
+    path = _result_path(current_user.id, result_id) if _RESULT_ID.fullmatch(result_id) else None
+    if path is None or not await path.is_file():
+        raise HTTPException(status_code=404, detail="Import result not found")
+    return FileResponse(str(path), media_type="application/x-ndjson", filename=f"import-{result_id}.ndjson")
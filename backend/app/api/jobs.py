@@ -0,0 +1,76 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+import uuid
+from ..core.db import get_session
+from ..core.security import get_current_user
+from ..core.tasks import classify_chunk, chunk_variants
+from ..repository.batch_jobs import BatchJobRepository
+from ..config import get_settings
+from .variants import BatchRequest, BatchResultItem
+
+class JobResponse(BaseModel):
+    job_id: str
+    status: str
+    total: int
+    completed: int
+    failed: int
+    progress: float
+
+class JobResultItem(BatchResultItem):
+    position: int
+
+class JobResultsPage(BaseModel):
+    job_id: str
+    items: List[JobResultItem]
+    next_after: int | None
+
+router = APIRouter()
+
+def _job_response(job) -> JobResponse:
+    done = job.completed + job.failed
+    return JobResponse(job_id=job.id, status=job.status, total=job.total, completed=job.completed, failed=job.failed, progress=round(done / job.total, 4) if job.total else 1.0)
+
+async def _get_owned_job(job_id: str, session: AsyncSession, current_user):
+    job = await BatchJobRepository(session).get(job_id)
+    if not job or job.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+def _dispatch(job_id: str, chunks, user_id: int):
+    for offset, chunk in chunks:
+        classify_chunk.delay(job_id, offset, chunk, user_id)
+
+@router.post("/batch", response_model=JobResponse, status_code=202)
+async def submit_batch_job(req: BatchRequest, session: AsyncSession = Depends(get_session), current_user=Depends(get_current_user)):
+    if not req.variants:
+        raise HTTPException(status_code=422, detail="Batch is empty")
+    repo = BatchJobRepository(session)
+    job = await repo.create(job_id=uuid.uuid4().hex, user_id=current_user.id, total=len(req.variants))
+    # Job row is committed before dispatch so workers can always find it. Dispatch runs in a
+    # worker thread: publishing to the broker blocks, and in eager mode it runs the chunks
+    chunks = chunk_variants([[v.hgvs, v.genome_build] for v in req.variants], get_settings().job_chunk_size)
+    await run_in_threadpool(_dispatch, job.id, chunks, current_user.id)
+    await session.refresh(job)
+    return _job_response(job)
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def job_status(job_id: str, session: AsyncSession = Depends(get_session), current_user=Depends(get_current_user)):
+    return _job_response(await _get_owned_job(job_id, session, current_user))
+
+@router.get("/{job_id}/results", response_model=JobResultsPage)
+async def job_results(job_id: str, after: int = -1, limit: int = Query(100, ge=1, le=1000), session: AsyncSession = Depends(get_session), current_user=Depends(get_current_user)):
+    """Results in position order. Pass `next_after` back as `after`; it is None once every
+    result has been returned. While the job runs a page may be short or empty (results past
+    an unfinished chunk are held back), so keep polling with the same `next_after`.
+    """
+    job = await _get_owned_job(job_id, session, current_user)
+    items = await BatchJobRepository(session).list_results(job_id, after=after, limit=limit)
+    last = items[-1].position if items else after
+    return JobResultsPage(
+        job_id=job_id,
+        items=[JobResultItem(position=i.position, hgvs=i.hgvs, genome_build=i.genome_build, classification=i.classification, id=i.variant_id, error=i.error, missing_sources=i.missing_sources or [], degraded=bool(i.missing_sources)) for i in items],
+        next_after=last if last < job.total - 1 else None,
+    )
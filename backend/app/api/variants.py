@@ -1,14 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
-from ..services.acmg_engine import evaluate_variant
-from ..services.hgvs_validate import validate_hgvs_cdna
+from typing import List, Literal
+from datetime import datetime
+from ..services.acmg_engine import evaluate_variant, EvidenceUnavailable
+from ..services.hgvs_validate import validate_hgvs_cdna, normalize_hgvs
+from ..services.batch import evaluate_variants, persist_evaluations
+from ..services.write_behind import WriteBehindQueue, get_write_behind
+from ..config import get_settings
 from ..core.db import get_session
 from ..repository.variants import VariantRepository
 from ..models.variant import Variant as VariantModel
 from ..repository.classification_events import ClassificationEventRepository
+from ..repository.evidence_blobs import EvidenceBlobRepository
 from ..core.security import get_current_user
+from ..core.replica import get_read_session
 
 class VariantRequest(BaseModel):
     hgvs: str
@@ -21,82 +27,141 @@ class VariantResponse(BaseModel):
     classification: str
     applied_rules: list
     rationale: str
+    missing_sources: list[str] = []
+    degraded: bool = False
+
+# Upper bound on any list page
+MAX_PAGE_SIZE = 200
 
 router = APIRouter()
 
 @router.post("/classify", response_model=VariantResponse)
-async def classify_variant(req: VariantRequest, session: AsyncSession = Depends(get_session), current_user=Depends(get_current_user)):
+async def classify_variant(
+    req: VariantRequest,
+    session: AsyncSession = Depends(get_session),
+    current_user=Depends(get_current_user),
+    writer: WriteBehindQueue | None = Depends(get_write_behind),
+):
     # Validate HGVS format (simplified)
     try:
         validate_hgvs_cdna(req.hgvs)
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
-    result = await evaluate_variant(req.hgvs, req.genome_build)
-    repo = VariantRepository(session)
-    variant = await repo.create(
-        hgvs=req.hgvs,
-        genome_build=req.genome_build,
-        classification=result["classification"],
-        evidence=result["applied_rules"],
-        created_by=current_user.id,
-    )
-    ev_repo = ClassificationEventRepository(session)
-    await ev_repo.add_event(variant_id=variant.id, user_id=current_user.id, classification=result["classification"], evidence=result["applied_rules"])
-    return VariantResponse(id=variant.id, hgvs=variant.hgvs, genome_build=variant.genome_build, **result)
+    try:
+        result = await evaluate_variant(req.hgvs, req.genome_build)
+    except EvidenceUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    if writer is not None and writer.accepting():
+        variant_id = await writer.submit(req.hgvs, req.genome_build, result, current_user.id)
+    else:
+        (variant_id,) = await persist_evaluations(session, [(req.hgvs, req.genome_build, result)], current_user.id)
+    return VariantResponse(id=variant_id, hgvs=normalize_hgvs(req.hgvs), genome_build=req.genome_build, **result)
 
 
 @router.get("/{variant_id}", response_model=VariantResponse)
-async def get_variant(variant_id: int, session: AsyncSession = Depends(get_session), current_user=Depends(get_current_user)):
+async def get_variant(variant_id: int, session: AsyncSession = Depends(get_read_session), current_user=Depends(get_current_user)):
     repo = VariantRepository(session)
     variant = await repo.get(variant_id)
     if not variant:
         raise HTTPException(status_code=404, detail="Variant not found")
+    (evidence,) = await EvidenceBlobRepository(session).resolve([variant])
     return VariantResponse(
         id=variant.id,
         hgvs=variant.hgvs,
         genome_build=variant.genome_build,
         classification=variant.classification,
-        applied_rules=variant.evidence,
+        applied_rules=evidence or [],
         rationale="Persisted record",
     )
 
 
-@router.get("/", response_model=List[VariantResponse])
-async def list_variants(hgvs: str | None = None, limit: int = 25, session: AsyncSession = Depends(get_session), current_user=Depends(get_current_user)):
+class VariantSummary(BaseModel):
+    """List-view projection: no evidence, no rationale."""
+    id: int
+    hgvs: str
+    genome_build: str
+    classification: str
+
+
+@router.get("/", response_model=List[VariantResponse] | List[VariantSummary])
+async def list_variants(
+    response: Response,
+    view: Literal["full", "summary"] = "full",
+    hgvs: str | None = None,
+    classification: str | None = None,
+    genome_build: str | None = None,
+    created_by: int | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    cursor: int | None = None,
+    limit: int = Query(25, ge=1, le=MAX_PAGE_SIZE),
+    session: AsyncSession = Depends(get_read_session),
+    current_user=Depends(get_current_user),
+):
+    """Newest-first variants; pass the `X-Next-Cursor` response header back as `cursor` for the next page.
+
+    `view=summary` returns only id, hgvs, genome_build and classification, selecting just those
+    columns so no evidence is loaded or decoded.
+    """
     repo = VariantRepository(session)
-    variants = await repo.list(hgvs=hgvs, limit=limit)
+    filters = dict(
+        hgvs=normalize_hgvs(hgvs) if hgvs else None,
+        classification=classification,
+        genome_build=genome_build,
+        created_by=created_by,
+        created_after=created_after,
+        created_before=created_before,
+    )
+    if view == "summary":
+        rows = await repo.list_summaries(before_id=cursor, limit=limit + 1, **filters)
+        _set_next_cursor(response, rows, limit)
+        return [VariantSummary(id=r.id, hgvs=r.hgvs, genome_build=r.genome_build, classification=r.classification) for r in rows[:limit]]
+    variants = await repo.list(before_id=cursor, limit=limit + 1, **filters)
+    _set_next_cursor(response, variants, limit)
+    variants = variants[:limit]
+    evidence = await EvidenceBlobRepository(session).resolve(variants)
     return [
         VariantResponse(
             id=v.id,
             hgvs=v.hgvs,
             genome_build=v.genome_build,
             classification=v.classification,
-            applied_rules=v.evidence,
+            applied_rules=ev or [],
             rationale="Persisted record",
         )
-        for v in variants
+        for v, ev in zip(variants, evidence)
     ]
 
 
+def _set_next_cursor(response: Response, rows: list, limit: int):
+    # One extra row was fetched: if it exists there is a next page, starting after rows[limit - 1]
+    if len(rows) > limit:
+        response.headers["X-Next-Cursor"] = str(rows[limit - 1].id)
+
+
 class BatchRequest(BaseModel):
     variants: List[VariantRequest]
 
 class BatchResultItem(BaseModel):
     hgvs: str
     genome_build: str
-    classification: str
-    id: int
+    classification: str | None = None
+    id: int | None = None
+    error: str | None = None
+    missing_sources: list[str] = []
+    degraded: bool = False
 
 @router.post("/batch", response_model=List[BatchResultItem])
 async def batch_classify(req: BatchRequest, session: AsyncSession = Depends(get_session), current_user=Depends(get_current_user)):
-    repo = VariantRepository(session)
+    evaluated = await evaluate_variants([(v.hgvs, v.genome_build) for v in req.variants], get_settings().batch_concurrency)
+    ok = [(v.hgvs, v.genome_build, r) for v, r in zip(req.variants, evaluated) if not isinstance(r, Exception)]
+    ids = iter(await persist_evaluations(session, ok, current_user.id))
     results: List[BatchResultItem] = []
-    for v in req.variants:
-        eval_res = await evaluate_variant(v.hgvs, v.genome_build)
-        persisted = await repo.create(hgvs=v.hgvs, genome_build=v.genome_build, classification=eval_res["classification"], evidence=eval_res["applied_rules"], created_by=current_user.id)
-        ev_repo = ClassificationEventRepository(session)
-        await ev_repo.add_event(variant_id=persisted.id, user_id=current_user.id, classification=eval_res["classification"], evidence=eval_res["applied_rules"])
-        results.append(BatchResultItem(hgvs=persisted.hgvs, genome_build=persisted.genome_build, classification=persisted.classification, id=persisted.id))
+    for v, r in zip(req.variants, evaluated):
+        if isinstance(r, Exception):
+            results.append(BatchResultItem(hgvs=v.hgvs, genome_build=v.genome_build, error=str(r) or type(r).__name__))
+        else:
+            results.append(BatchResultItem(hgvs=v.hgvs, genome_build=v.genome_build, classification=r["classification"], id=next(ids), missing_sources=r["missing_sources"], degraded=r["degraded"]))
     return results
 
 class ClassificationEventResponse(BaseModel):
@@ -107,7 +172,18 @@ class ClassificationEventResponse(BaseModel):
     user_id: int | None
 
 @router.get("/{variant_id}/history", response_model=List[ClassificationEventResponse])
-async def variant_history(variant_id: int, session: AsyncSession = Depends(get_session), current_user=Depends(get_current_user)):
+async def variant_history(
+    variant_id: int,
+    response: Response,
+    cursor: int | None = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    session: AsyncSession = Depends(get_read_session),
+    current_user=Depends(get_current_user),
+):
     ev_repo = ClassificationEventRepository(session)
-    events = await ev_repo.list_for_variant(variant_id)
-    return [ClassificationEventResponse(id=e.id, classification=e.classification, evidence=e.evidence, created_at=str(e.created_at), user_id=e.user_id) for e in events]
+    events = await ev_repo.list_for_variant(variant_id, limit=limit + 1, before_id=cursor)
+    _set_next_cursor(response, events, limit)
+    events = events[:limit]
+    # One batched blob lookup for the whole page; repeated evidence is fetched and decoded once
+    evidence = await EvidenceBlobRepository(session).resolve(events)
+    return [ClassificationEventResponse(id=e.id, classification=e.classification, evidence=ev or [], created_at=str(e.created_at), user_id=e.user_id) for e, ev in zip(events, evidence)]
@@ -1,4 +1,5 @@
 """Configuration helpers for backend."""
+from functools import lru_cache
 from pydantic import BaseModel
 import os
 
@@ -7,7 +8,95 @@ class Settings(BaseModel):
     mcp_server_url: str = os.getenv("MCP_SERVER_URL", "http://mcp:8100")
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
     database_url: str = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./dev.db")
+    # Optional read replica for GET routes (empty: reads go to the primary), and how long after
+    # a write the writer and the written variant ids keep reading from the primary (seconds)
+    database_replica_url: str = os.getenv("DATABASE_REPLICA_URL", "")
+    read_your_writes_window: float = float(os.getenv("READ_YOUR_WRITES_WINDOW", "5"))
+    db_echo: bool = os.getenv("DB_ECHO", "0") == "1"
+    # Connection pool: persistent connections, extra burst connections, seconds to wait for a
+    # free one, and max connection age (seconds; -1 keeps connections forever)
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    db_pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    db_pool_pre_ping: bool = os.getenv("DB_POOL_PRE_PING", "1") == "1"
+    # asyncpg prepared statements cached per connection (0 disables, e.g. behind PgBouncer)
+    db_statement_cache_size: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "500"))
+    # SQLite connection pragmas
+    sqlite_journal_mode: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    sqlite_synchronous: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    sqlite_busy_timeout_ms: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
     jwt_secret: str = os.getenv("JWT_SECRET", "dev-secret-change")
+    # bcrypt cost factor (log2 rounds) for new hashes; existing hashes keep verifying
+    bcrypt_rounds: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    # Password hashing thread pool: concurrent hashes, and how many more may wait before 503
+    password_hash_workers: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    password_hash_max_queue: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64"))
+    # Verified principals cached in-process per token subject (seconds; 0 disables)
+    principal_cache_ttl: float = float(os.getenv("PRINCIPAL_CACHE_TTL", "30"))
+    principal_cache_max_entries: int = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+    # In-process L1 cache in front of Redis (0 entries disables it)
+    cache_l1_max_entries: int = int(os.getenv("CACHE_L1_MAX_ENTRIES", "10000"))
+    cache_l1_max_bytes: int = int(os.getenv("CACHE_L1_MAX_BYTES", str(64 * 1024 * 1024)))
+    # Raw MCP payload cache: per-source TTL (seconds) and data version (bump to invalidate)
+    clinvar_cache_ttl: int = int(os.getenv("CLINVAR_CACHE_TTL", str(24 * 3600)))
+    gnomad_cache_ttl: int = int(os.getenv("GNOMAD_CACHE_TTL", str(30 * 24 * 3600)))
+    predictions_cache_ttl: int = int(os.getenv("PREDICTIONS_CACHE_TTL", str(7 * 24 * 3600)))
+    clinvar_data_version: str = os.getenv("CLINVAR_DATA_VERSION", "1")
+    gnomad_data_version: str = os.getenv("GNOMAD_DATA_VERSION", "4.1")
+    predictions_data_version: str = os.getenv("PREDICTIONS_DATA_VERSION", "1")
+    # Stale-while-revalidate: how long past its TTL an entry may still be served while it refreshes,
+    # and the XFetch beta for probabilistic early refresh (0 disables early refresh)
+    cache_stale_window: int = int(os.getenv("CACHE_STALE_WINDOW", "3600"))
+    cache_early_refresh_beta: float = float(os.getenv("CACHE_EARLY_REFRESH_BETA", "1.0"))
+    # Cross-process single-flight lock on evidence fetches; should exceed the slowest source deadline
+    singleflight_lock_ms: int = int(os.getenv("SINGLEFLIGHT_LOCK_MS", "10000"))
+    singleflight_poll_ms: int = int(os.getenv("SINGLEFLIGHT_POLL_MS", "50"))
+    # Shared MCP HTTP client pool
+    mcp_timeout: float = float(os.getenv("MCP_TIMEOUT", "8.0"))
+    mcp_max_connections: int = int(os.getenv("MCP_MAX_CONNECTIONS", "100"))
+    mcp_max_keepalive: int = int(os.getenv("MCP_MAX_KEEPALIVE", "20"))
+    mcp_keepalive_expiry: float = float(os.getenv("MCP_KEEPALIVE_EXPIRY", "30.0"))
+    mcp_http2: bool = os.getenv("MCP_HTTP2", "0") == "1"
+    # Micro-batch concurrent per-variant lookups into bulk MCP calls
+    mcp_coalesce: bool = os.getenv("MCP_COALESCE", "1") == "1"
+    mcp_coalesce_window_ms: float = float(os.getenv("MCP_COALESCE_WINDOW_MS", "5"))
+    mcp_coalesce_max_keys: int = int(os.getenv("MCP_COALESCE_MAX_KEYS", "100"))
+    # Per-source MCP deadlines (seconds); a source that misses its deadline is dropped
+    clinvar_deadline: float = float(os.getenv("CLINVAR_DEADLINE", "8.0"))
+    gnomad_deadline: float = float(os.getenv("GNOMAD_DEADLINE", "8.0"))
+    predictions_deadline: float = float(os.getenv("PREDICTIONS_DEADLINE", "8.0"))
+    # Per-endpoint circuit breaker: open after N consecutive failures, probe again after the reset (s)
+    mcp_breaker_failures: int = int(os.getenv("MCP_BREAKER_FAILURES", "5"))
+    mcp_breaker_reset: float = float(os.getenv("MCP_BREAKER_RESET", "30.0"))
+    # Adaptive per-call timeout: multiplier x observed latency percentile, clamped to [min, source deadline]
+    mcp_adaptive_timeout: bool = os.getenv("MCP_ADAPTIVE_TIMEOUT", "1") == "1"
+    mcp_timeout_percentile: float = float(os.getenv("MCP_TIMEOUT_PERCENTILE", "0.99"))
+    mcp_timeout_multiplier: float = float(os.getenv("MCP_TIMEOUT_MULTIPLIER", "3.0"))
+    mcp_timeout_min: float = float(os.getenv("MCP_TIMEOUT_MIN", "0.5"))
+    # Hedged requests: send a second copy once a call is slower than this latency percentile
+    mcp_hedge: bool = os.getenv("MCP_HEDGE", "0") == "1"
+    mcp_hedge_percentile: float = float(os.getenv("MCP_HEDGE_PERCENTILE", "0.95"))
+    # "degrade": classify without unavailable sources and flag them; "strict": fail the classification
+    evidence_partial_policy: str = os.getenv("EVIDENCE_PARTIAL_POLICY", "degrade")
+    # Group commit for /variants/classify: rows from concurrent requests share one commit,
+    # flushed after WINDOW_MS or at MAX_ROWS; beyond MAX_PENDING outstanding rows requests commit on their own
+    write_behind: bool = os.getenv("WRITE_BEHIND", "0") == "1"
+    write_behind_window_ms: float = float(os.getenv("WRITE_BEHIND_WINDOW_MS", "5"))
+    write_behind_max_rows: int = int(os.getenv("WRITE_BEHIND_MAX_ROWS", "100"))
+    write_behind_max_pending: int = int(os.getenv("WRITE_BEHIND_MAX_PENDING", "5000"))
+    # Upstream requests in flight per batch: coalesced groups of MCP_COALESCE_MAX_KEYS variants, or single variants without coalescing
+    batch_concurrency: int = int(os.getenv("BATCH_CONCURRENCY", "16"))
+    # Variants per Celery task for asynchronous batch jobs
+    job_chunk_size: int = int(os.getenv("JOB_CHUNK_SIZE", "200"))
+    # Evidence blobs at least this large (canonical JSON bytes) are stored zlib-compressed
+    evidence_compress_min_bytes: int = int(os.getenv("EVIDENCE_COMPRESS_MIN_BYTES", "512"))
+    # Streaming CSV/VCF import: variants per evaluate+persist chunk, and where result files go
+    import_chunk_size: int = int(os.getenv("IMPORT_CHUNK_SIZE", "100"))
+    import_results_dir: str = os.getenv("IMPORT_RESULTS_DIR", "./import_results")
 
+@lru_cache
 def get_settings() -> Settings:
+    # Defaults are read from the environment once, at import; tests that need other values
+    # patch get_settings where it is used (or call get_settings.cache_clear())
     return Settings()
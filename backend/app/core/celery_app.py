@@ -8,6 +8,14 @@ celery_app = Celery(
     "cardio_classifier",
     broker=broker_url,
     backend=backend_url,
+    include=["app.core.tasks"],
 )
 
-celery_app.conf.update(task_track_started=True, result_expires=3600)
+celery_app.conf.update(
+    task_track_started=True,
+    result_expires=3600,
+    # Eager mode runs tasks inline (tests, single-process dev)
+    task_always_eager=os.getenv("CELERY_TASK_ALWAYS_EAGER", "0") == "1",
+    # Chunks are long-running; don't let one worker hoard prefetched chunks
+    worker_prefetch_multiplier=1,
+)
@@ -1,11 +1,157 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
-import os
+from typing import Any, Dict
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+from ..config import Settings, get_settings
+from .metrics import LatencyTracker
 
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./dev.db")
 
-engine = create_async_engine(DATABASE_URL, echo=False, future=True)
+class PoolMetrics:
+    """Connection and checkout counters for one pool, fed by pool events."""
+
+    def __init__(self):
+        self.connects = 0
+        self.checkouts = 0
+        self.waited = 0  # checkouts that found no idle connection and no overflow room
+        self.timeouts = 0
+        self.wait_time = LatencyTracker(min_samples=1)  # of the checkouts that waited
+        self.hold_time = LatencyTracker(min_samples=1)  # checkout to checkin
+
+    def attach(self, pool: Pool):
+        # Pool.recreate() (engine.dispose()) copies these listeners to the new pool
+        event.listen(pool, "connect", self._on_connect)
+        event.listen(pool, "checkout", self._on_checkout)
+        event.listen(pool, "checkin", self._on_checkin)
+
+    def _on_connect(self, dbapi_conn, record):
+        self.connects += 1
+
+    def _on_checkout(self, dbapi_conn, record, proxy):
+        self.checkouts += 1
+        record.info["checked_out_at"] = time.monotonic()
+
+    def _on_checkin(self, dbapi_conn, record):
+        started = record.info.pop("checked_out_at", None)
+        if started is not None:
+            self.hold_time.observe(time.monotonic() - started)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "waited": self.waited,
+            "timeouts": self.timeouts,
+            "wait_time": self.wait_time.stats(),
+            "hold_time": self.hold_time.stats(),
+        }
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool with PoolMetrics attached.
+
+    Pool events have no hook before a checkout starts, so the time spent queueing for a
+    returned connection is measured around the public `connect()`.
+    """
+
+    def __init__(self, *args, max_overflow: int = 10, **kwargs):
+        super().__init__(*args, max_overflow=max_overflow, **kwargs)
+        self.overflow_limit = max_overflow
+        self.metrics = PoolMetrics()
+
+    def recreate(self) -> "InstrumentedPool":
+        # The new pool inherits this pool's listeners, so it keeps feeding the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def connect(self):
+        if self.checkedin() or self.overflow_limit < 0 or self.overflow() < self.overflow_limit:
+            return super().connect()
+        # No idle connection and no overflow room: this checkout queues for a returned one
+        self.metrics.waited += 1
+        started = time.monotonic()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.wait_time.observe(time.monotonic() - started)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"size": self.size(), "checked_out": self.checkedout(), "overflow": self.overflow(), **self.metrics.stats()}
+
+
+def _sqlite_pragmas(settings: Settings):
+    def on_connect(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+        cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+        cursor.close()
+    return on_connect
+
+
+def build_engine(url: str | None = None, settings: Settings | None = None, **overrides: Any) -> AsyncEngine:
+    """Async engine configured from Settings.
+
+    PostgreSQL goes through asyncpg with a prepared-statement cache; file-backed SQLite gets
+    WAL and busy-timeout pragmas on every connection. Queue-pooled engines use
+    InstrumentedPool unless `poolclass` is overridden (e.g. NullPool for Celery tasks).
+    """
+    settings = settings or get_settings()
+    url_obj = make_url(url or settings.database_url)
+    if url_obj.drivername in ("postgresql", "postgres"):
+        url_obj = url_obj.set(drivername="postgresql+asyncpg")
+    kwargs: Dict[str, Any] = {"echo": settings.db_echo}
+    backend = url_obj.get_backend_name()
+    memory = backend == "sqlite" and url_obj.database in (None, "", ":memory:")
+    if "poolclass" not in overrides and not memory:
+        kwargs.update(
+            poolclass=InstrumentedPool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+            pool_pre_ping=settings.db_pool_pre_ping,
+        )
+    if url_obj.drivername == "postgresql+asyncpg":
+        # 0 disables the cache (required behind PgBouncer in transaction mode)
+        kwargs["connect_args"] = {"prepared_statement_cache_size": settings.db_statement_cache_size}
+    kwargs.update(overrides)
+    engine = create_async_engine(url_obj, **kwargs)
+    pool = engine.sync_engine.pool
+    if isinstance(pool, InstrumentedPool):
+        pool.metrics.attach(pool)
+    if backend == "sqlite" and not memory:
+        event.listen(engine.sync_engine, "connect", _sqlite_pragmas(settings))
+    return engine
+
+
+def pool_stats(engine: AsyncEngine) -> Dict[str, Any]:
+    pool = engine.sync_engine.pool
+    if isinstance(pool, InstrumentedPool):
+        return pool.stats()
+    return {"pool": type(pool).__name__}
+
+
+DATABASE_URL = get_settings().database_url
+REPLICA_URL = get_settings().database_replica_url
+
+engine = build_engine(DATABASE_URL)
 AsyncSessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+# None when no replica is configured; reads then use the primary
+replica_engine = build_engine(REPLICA_URL) if REPLICA_URL else None
+ReadSessionLocal = async_sessionmaker(replica_engine, autoflush=False, expire_on_commit=False) if replica_engine else None
 
 async def get_session():
     async with AsyncSessionLocal() as session:
         yield session
+
+def db_stats() -> Dict[str, Any]:
+    stats = {"primary": pool_stats(engine)}
+    if replica_engine is not None:
+        stats["replica"] = pool_stats(replica_engine)
+    return stats
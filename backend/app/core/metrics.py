@@ -0,0 +1,24 @@
+"""Small in-process metrics shared by the core and service layers."""
+from collections import deque
+from typing import Any, Dict, Optional
+
+
+class LatencyTracker:
+    """Sliding window of recent latencies, in seconds."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self._samples: deque[float] = deque(maxlen=window)
+        self.min_samples = min_samples
+
+    def observe(self, seconds: float):
+        self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """The `q` quantile (0..1) of the window, or None until `min_samples` calls were seen."""
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"samples": len(self._samples), "p50": self.percentile(0.5), "p95": self.percentile(0.95), "p99": self.percentile(0.99)}
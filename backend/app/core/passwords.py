@@ -0,0 +1,107 @@
+"""Password hashing on a dedicated, bounded thread pool.
+
+bcrypt is deliberately slow (tens to hundreds of ms per call); running it inline would
+block the event loop. The bcrypt backend releases the GIL while hashing, so a small
+thread pool gives real parallelism without blocking request handling. The pool has
+its own worker count and a bounded backlog: once the backlog is full, new requests are
+rejected with 503 instead of queueing without limit.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+import asyncio
+import time
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+from .metrics import LatencyTracker
+from ..config import get_settings
+
+T = TypeVar("T")
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=get_settings().bcrypt_rounds)
+
+
+class PasswordPool:
+    """Thread pool for bcrypt with a concurrency limit (`workers`) and a bounded backlog."""
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = max(workers, 1)
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.pending = 0  # submitted and not yet finished (running + queued)
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.queue_wait = LatencyTracker(min_samples=1)
+        self.run_time = LatencyTracker(min_samples=1)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        if self.pending >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Authentication is busy, retry shortly", headers={"Retry-After": "1"})
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password")
+        submitted = time.monotonic()
+
+        def job() -> T:
+            started = time.monotonic()
+            self.queue_wait.observe(started - submitted)
+            self.running += 1
+            try:
+                return fn(*args)
+            finally:
+                self.running -= 1
+                self.run_time.observe(time.monotonic() - started)
+
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, job)
+        finally:
+            self.pending -= 1
+            self.completed += 1
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "running": self.running,
+            "queued": max(self.pending - self.running, 0),
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "queue_wait": self.queue_wait.stats(),
+            "run_time": self.run_time.stats(),
+        }
+
+
+_pool: PasswordPool | None = None
+
+
+def get_password_pool() -> PasswordPool:
+    global _pool
+    if _pool is None:
+        settings = get_settings()
+        _pool = PasswordPool(settings.password_hash_workers, settings.password_hash_max_queue)
+    return _pool
+
+
+def close_password_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+
+
+async def hash_password(password: str) -> str:
+    return await get_password_pool().run(pwd_context.hash, password)
+
+
+async def verify_password(password: str, hashed: str) -> bool:
+    return await get_password_pool().run(pwd_context.verify, password, hashed)
+
+
+def password_pool_stats() -> Dict[str, Any]:
+    return get_password_pool().stats()
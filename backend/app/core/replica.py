@@ -0,0 +1,66 @@
+"""Read/write session routing: GET routes read from a replica unless that could miss a recent write.
+
+Writes always go through `get_session` (the primary). `get_read_session` hands out a replica
+session, except when the requesting user or the requested variant was written within
+READ_YOUR_WRITES_WINDOW seconds; those reads stay on the primary so replication lag never
+hides a client's own writes. Recent writes are tracked per process.
+"""
+from typing import Any, Dict, Iterable, Optional
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from ..services.cache import L1Cache
+from ..config import get_settings
+from . import db
+from .security import get_current_user
+
+_recent: L1Cache | None = None
+_routed = {"replica": 0, "primary": 0, "pinned": 0}
+
+
+def _recent_writes() -> L1Cache:
+    global _recent
+    if _recent is None:
+        _recent = L1Cache(100_000)
+    return _recent
+
+
+def note_writes(user_id: int | None, variant_ids: Iterable[int]):
+    """Pin reads by `user_id` and of `variant_ids` to the primary for the read-your-writes window."""
+    window = get_settings().read_your_writes_window
+    recent = _recent_writes()
+    if user_id is not None:
+        recent.set(f"u:{user_id}", True, window)
+    for variant_id in variant_ids:
+        recent.set(f"v:{variant_id}", True, window)
+
+
+def recently_written(user_id: int | None = None, variant_id: int | None = None) -> bool:
+    recent = _recent_writes()
+    return (user_id is not None and recent.get(f"u:{user_id}") is not None) or (
+        variant_id is not None and recent.get(f"v:{variant_id}") is not None
+    )
+
+
+def get_read_sessionmaker() -> Optional[async_sessionmaker]:
+    return db.ReadSessionLocal
+
+
+async def get_read_session(request: Request, session: AsyncSession = Depends(db.get_session), current_user=Depends(get_current_user)):
+    """Session for read-only routes: the replica when configured and safe, otherwise the primary."""
+    factory = get_read_sessionmaker()
+    if factory is None:
+        _routed["primary"] += 1
+        yield session
+        return
+    variant_id = request.path_params.get("variant_id")
+    if recently_written(current_user.id, int(variant_id) if variant_id is not None else None):
+        _routed["pinned"] += 1
+        yield session
+        return
+    _routed["replica"] += 1
+    async with factory() as replica_session:
+        yield replica_session
+
+
+def routing_stats() -> Dict[str, Any]:
+    return {"reads": dict(_routed), "recent_writes": _recent_writes().stats()["entries"]}
@@ -1,14 +1,16 @@
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from typing import Any, Dict
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from ..core.db import get_session
 from ..repository.users import UserRepository
+from ..services.cache import L1Cache
+from .passwords import hash_password, verify_password  # noqa: F401  (re-exported for the auth API)
 from ..config import get_settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 ALGORITHM = "HS256"
@@ -18,30 +20,63 @@ def get_secret():
     return get_settings().jwt_secret
 
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+def create_access_token(subject: str, expires_minutes: int = 60 * 24, version: int = 0) -> str:
+    # `ver` is the user's token_version at issue time; bumping it revokes older tokens
+    to_encode = {"sub": subject, "ver": version, "exp": datetime.utcnow() + timedelta(minutes=expires_minutes)}
+    return jwt.encode(to_encode, get_secret(), algorithm=ALGORITHM)
 
 
-def verify_password(password: str, hashed: str) -> bool:
-    return pwd_context.verify(password, hashed)
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """The authenticated user as seen by request handlers; detached from any DB session."""
+    id: int
+    email: str
+    token_version: int
 
 
-def create_access_token(subject: str, expires_minutes: int = 60 * 24) -> str:
-    to_encode = {"sub": subject, "exp": datetime.utcnow() + timedelta(minutes=expires_minutes)}
-    return jwt.encode(to_encode, get_secret(), algorithm=ALGORITHM)
+_principals: L1Cache | None = None
+
+
+def get_principal_cache() -> L1Cache:
+    global _principals
+    if _principals is None:
+        _principals = L1Cache(get_settings().principal_cache_max_entries)
+    return _principals
+
+
+def invalidate_principal(email: str):
+    """Drop a cached principal in this process (other processes expire it within the TTL)."""
+    get_principal_cache().delete(email)
+
+
+def principal_cache_stats() -> Dict[str, Any]:
+    return get_principal_cache().stats()
+
 
+async def get_current_user(token: str = Depends(oauth2_scheme), session: AsyncSession = Depends(get_session)) -> Principal:
+    """Verify the bearer token and resolve its principal.
 
-async def get_current_user(token: str = Depends(oauth2_scheme), session: AsyncSession = Depends(get_session)):
+    Verified principals are cached per subject for PRINCIPAL_CACHE_TTL seconds, so a warm
+    request does no auth query. A cached entry is only used when its token_version matches
+    the token's `ver` claim; otherwise the user is reloaded.
+    """
     credentials_exception = HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials", headers={"WWW-Authenticate": "Bearer"})
     try:
         payload = jwt.decode(token, get_secret(), algorithms=[ALGORITHM])
         email: str | None = payload.get("sub")  # type: ignore
         if email is None:
             raise credentials_exception
-    except JWTError:
+        version = int(payload.get("ver", 0))
+    except (JWTError, TypeError, ValueError):
         raise credentials_exception
+    cache = get_principal_cache()
+    principal = cache.get(email)
+    if principal is not None and principal.token_version == version:
+        return principal
     repo = UserRepository(session)
     user = await repo.get_by_email(email)
-    if not user:
+    if not user or user.token_version != version:
         raise credentials_exception
-    return user
+    principal = Principal(user.id, user.email, user.token_version)
+    cache.set(email, principal, get_settings().principal_cache_ttl)
+    return principal
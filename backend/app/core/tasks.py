@@ -0,0 +1,106 @@
+"""Celery tasks for asynchronous batch classification jobs."""
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, List, Sequence, TypeVar
+import asyncio
+import threading
+from loguru import logger
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.pool import NullPool
+from .celery_app import celery_app
+from .db import DATABASE_URL, build_engine
+from ..config import get_settings
+from ..repository.batch_jobs import BatchJobRepository
+from ..services.batch import evaluate_variants, persist_evaluations
+from ..services import acmg_engine, cache, coalescer, mcp_client
+from ..services.singleflight import SingleFlight
+
+T = TypeVar("T")
+
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+_sessionmaker: async_sessionmaker | None = None
+
+
+def run_async(coro: Awaitable[T]) -> T:
+    """Run `coro` on this process's long-lived task loop and block until it finishes.
+
+    In a worker every task shares this one loop, so the process-wide MCP and Redis
+    clients stay bound to it. In eager mode the task is called from an API thread and
+    the process-wide clients belong to the API loop; wrap `coro` in `own_clients()`
+    there (classify_chunk does).
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="celery-async-runner", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result()
+
+
+@asynccontextmanager
+async def own_clients():
+    """Give code on the task loop its own MCP client, Redis client, coalescers and single-flight.
+
+    Needed in eager mode, where the shared instances are bound to the API's event loop.
+    Background refreshes started here are drained and the clients closed on exit.
+    """
+    mcp, redis_client = mcp_client.build_client(), cache.new_client()
+    tokens = [
+        (mcp_client.task_client, mcp_client.task_client.set(mcp)),
+        (cache.task_client, cache.task_client.set(redis_client)),
+        (coalescer.task_coalescers, coalescer.task_coalescers.set({})),
+        (acmg_engine.task_flight, acmg_engine.task_flight.set(SingleFlight())),
+    ]
+    try:
+        yield
+    finally:
+        await acmg_engine.drain_refreshes()
+        await mcp.aclose()
+        await redis_client.aclose()
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+async def _with_own_clients(coro: Awaitable[T]) -> T:
+    async with own_clients():
+        return await coro
+
+
+def get_task_sessionmaker() -> async_sessionmaker:
+    # NullPool: connections are opened on the task loop and never shared with the API's loop
+    global _sessionmaker
+    if _sessionmaker is None:
+        _sessionmaker = async_sessionmaker(build_engine(DATABASE_URL, poolclass=NullPool), autoflush=False, expire_on_commit=False)
+    return _sessionmaker
+
+
+def chunk_variants(variants: Sequence[Any], size: int) -> List[tuple[int, List[Any]]]:
+    return [(offset, list(variants[offset:offset + size])) for offset in range(0, len(variants), size)]
+
+
+async def _classify_chunk(job_id: str, offset: int, variants: List[List[str]], user_id: int | None):
+    evaluated = await evaluate_variants([(h, b) for h, b in variants], get_settings().batch_concurrency)
+    async with get_task_sessionmaker()() as session:
+        try:
+            ok = [(h, b, r) for (h, b), r in zip(variants, evaluated) if not isinstance(r, Exception)]
+            ids = iter(await persist_evaluations(session, ok, user_id, commit=False))
+            items = []
+            for pos, ((h, b), r) in enumerate(zip(variants, evaluated), start=offset):
+                if isinstance(r, Exception):
+                    items.append(dict(job_id=job_id, position=pos, hgvs=h, genome_build=b, classification=None, variant_id=None, error=str(r) or type(r).__name__, missing_sources=None))
+                else:
+                    items.append(dict(job_id=job_id, position=pos, hgvs=h, genome_build=b, classification=r["classification"], variant_id=next(ids), error=None, missing_sources=r["missing_sources"] or None))
+            await BatchJobRepository(session).record_chunk(job_id, items)
+        except Exception as e:
+            # Never leave a job hanging: count the whole chunk as failed
+            logger.exception(f"Job {job_id} chunk at {offset} failed: {e}")
+            await session.rollback()
+            items = [dict(job_id=job_id, position=pos, hgvs=h, genome_build=b, classification=None, variant_id=None, error="chunk failed", missing_sources=None) for pos, (h, b) in enumerate(variants, start=offset)]
+            await BatchJobRepository(session).record_chunk(job_id, items)
+
+
+@celery_app.task(name="jobs.classify_chunk", acks_late=True, bind=True)
+def classify_chunk(self, job_id: str, offset: int, variants: List[List[str]], user_id: int | None = None):
+    """Classify and persist one chunk of a batch job; `variants` is a list of [hgvs, genome_build]."""
+    coro = _classify_chunk(job_id, offset, variants, user_id)
+    run_async(_with_own_clients(coro) if self.request.is_eager else coro)
@@ -1,12 +1,42 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from .api import variants
 from .api import auth
+from .api import jobs
+from .api import imports
+from .services.mcp_client import init_mcp_client, close_mcp_client, mcp_client_stats
+from .services.coalescer import coalescer_stats
+from .services.resilience import guard_stats
+from .services.cache import cache_stats
+from .services.acmg_engine import drain_refreshes, evidence_stats
+from .core.security import principal_cache_stats
+from .services.write_behind import close_write_behind, write_behind_stats
+from .core.db import db_stats
+from .core.replica import routing_stats
+from .core.passwords import close_password_pool, password_pool_stats
 
-app = FastAPI(title="Cardio Classifier API", version="0.1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await init_mcp_client()
+    yield
+    # Commit queued classifications before the process goes away
+    await close_write_behind()
+    # Background cache refreshes use the MCP and Redis clients; stop them before closing those
+    await drain_refreshes()
+    await close_mcp_client()
+    close_password_pool()
+
+app = FastAPI(title="Cardio Classifier API", version="0.1.0", lifespan=lifespan)
 
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
 app.include_router(variants.router, prefix="/variants", tags=["variants"])
+app.include_router(imports.router, prefix="/variants", tags=["variants"])
+app.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
 
 @app.get("/health")
 async def health():
     return {"status": "ok"}
+
+@app.get("/metrics")
+async def metrics():
+    return {"mcp": mcp_client_stats(), "mcp_coalescer": coalescer_stats(), "mcp_endpoints": guard_stats(), "cache": cache_stats(), "evidence": evidence_stats(), "db": {**db_stats(), "routing": routing_stats()}, "write_behind": write_behind_stats(), "auth": {"principal_cache": principal_cache_stats(), "password_hashing": password_pool_stats()}}
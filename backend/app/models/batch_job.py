@@ -0,0 +1,28 @@
+from sqlalchemy import JSON, Column, Integer, String, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from .base import Base
+
+class BatchJob(Base):
+    __tablename__ = "batch_jobs"
+    id = Column(String, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    status = Column(String, nullable=False, default="queued")  # queued | running | completed
+    total = Column(Integer, nullable=False)
+    completed = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class BatchJobItem(Base):
+    __tablename__ = "batch_job_items"
+    id = Column(Integer, primary_key=True)
+    job_id = Column(String, ForeignKey("batch_jobs.id"), nullable=False)
+    position = Column(Integer, nullable=False)
+    hgvs = Column(String, nullable=False)
+    genome_build = Column(String, nullable=False)
+    classification = Column(String, nullable=True)
+    variant_id = Column(Integer, ForeignKey("variants.id"), nullable=True)
+    error = Column(String, nullable=True)
+    missing_sources = Column(JSON(none_as_null=True), nullable=True)  # sources unavailable when classified (degraded result)
+
+    __table_args__ = (Index("ix_batch_job_items_job_position", "job_id", "position", unique=True),)
@@ -1,12 +1,16 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Index
 from sqlalchemy.sql import func
 from .base import Base
 
 class ClassificationEvent(Base):
     __tablename__ = "classification_events"
     id = Column(Integer, primary_key=True)
-    variant_id = Column(Integer, ForeignKey("variants.id"), nullable=False, index=True)
+    variant_id = Column(Integer, ForeignKey("variants.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
     classification = Column(String, nullable=False)
-    evidence = Column(JSON, nullable=False)
+    evidence = Column(JSON(none_as_null=True), nullable=True)  # legacy inline copy; new rows reference evidence_blobs via evidence_hash
+    evidence_hash = Column(String(64), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # History pages: WHERE variant_id = ? AND id < cursor ORDER BY id DESC
+    __table_args__ = (Index("ix_classification_events_variant_id_id", "variant_id", "id"),)
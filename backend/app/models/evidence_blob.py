@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary
+from sqlalchemy.sql import func
+from .base import Base
+
+class EvidenceBlob(Base):
+    """Evidence list stored once per distinct content hash and referenced by variants and events."""
+    __tablename__ = "evidence_blobs"
+    hash = Column(String(64), primary_key=True)  # sha256 of the canonical evidence JSON
+    encoding = Column(String, nullable=False)  # "json" or "zlib" (zlib-compressed JSON)
+    data = Column(LargeBinary, nullable=False)
+    size = Column(Integer, nullable=False)  # uncompressed JSON bytes
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,13 +1,24 @@
-from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey, Index
 from sqlalchemy.sql import func
 from .base import Base
 
 class Variant(Base):
     __tablename__ = "variants"
     id = Column(Integer, primary_key=True)
-    hgvs = Column(String, index=True, nullable=False)
+    hgvs = Column(String, nullable=False)  # looked up through uq_variants_hgvs_build (hgvs is its leading column)
     genome_build = Column(String, default="GRCh38")
     classification = Column(String, nullable=False)
-    evidence = Column(JSON, nullable=False)
-    created_by = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    evidence = Column(JSON(none_as_null=True), nullable=True)  # legacy inline copy; new rows reference evidence_blobs via evidence_hash
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    evidence_hash = Column(String(64), nullable=True)  # sha256 of the canonical evidence JSON; key into evidence_blobs
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_seen_at = Column(DateTime(timezone=True), server_default=func.now())  # last time it was (re)classified
+
+    __table_args__ = (
+        Index("uq_variants_hgvs_build", "hgvs", "genome_build", unique=True),
+        # Filter column + id: equality filter and keyset page (id DESC) in one index range
+        Index("ix_variants_classification_id", "classification", "id"),
+        Index("ix_variants_build_id", "genome_build", "id"),
+        Index("ix_variants_created_by_id", "created_by", "id"),
+        Index("ix_variants_created_at_id", "created_at", "id"),
+    )
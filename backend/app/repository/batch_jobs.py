@@ -0,0 +1,69 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, case
+from typing import Any, Dict, List, Optional
+from ..models.batch_job import BatchJob, BatchJobItem
+from .bulk import dialect_insert
+
+class BatchJobRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create(self, job_id: str, user_id: int | None, total: int) -> BatchJob:
+        job = BatchJob(id=job_id, user_id=user_id, total=total, status="queued", completed=0, failed=0)
+        self.session.add(job)
+        await self.session.commit()
+        return job
+
+    async def get(self, job_id: str) -> Optional[BatchJob]:
+        return await self.session.get(BatchJob, job_id)
+
+    async def record_chunk(self, job_id: str, items: List[Dict[str, Any]], commit: bool = True) -> int:
+        """Store finished items and bump the job counters atomically (safe across workers).
+
+        Idempotent: positions already recorded (a redelivered chunk) are skipped and not
+        counted again. Returns how many items were new.
+        """
+        table = BatchJobItem.__table__
+        stmt = dialect_insert(self.session, table).on_conflict_do_nothing(index_elements=["job_id", "position"]).returning(table.c.position)
+        inserted = set((await self.session.execute(stmt, items)).scalars()) if items else set()
+        items = [i for i in items if i["position"] in inserted]
+        if not items:
+            if commit:
+                await self.session.commit()
+            return 0
+        n_failed = sum(1 for i in items if i["error"] is not None)
+        n_done = len(items) - n_failed
+        finished = BatchJob.completed + BatchJob.failed + len(items) >= BatchJob.total
+        await self.session.execute(
+            update(BatchJob)
+            .where(BatchJob.id == job_id)
+            .values(
+                completed=BatchJob.completed + n_done,
+                failed=BatchJob.failed + n_failed,
+                status=case((finished, "completed"), else_="running"),
+            )
+        )
+        if commit:
+            await self.session.commit()
+        return len(items)
+
+    async def list_results(self, job_id: str, after: int = -1, limit: int = 100) -> List[BatchJobItem]:
+        """Finished items after position `after`, stopping at the first position not yet written.
+
+        Chunks finish out of order, so rows past a gap are held back until the gap fills;
+        a client paging with the last returned position therefore never skips an item.
+        `after` must itself come from such a page (everything up to it is present).
+        """
+        stmt = (
+            select(BatchJobItem)
+            .where(BatchJobItem.job_id == job_id, BatchJobItem.position > after)
+            .order_by(BatchJobItem.position)
+            .limit(limit)
+        )
+        res = await self.session.execute(stmt)
+        items = []
+        for expected, item in enumerate(res.scalars(), start=after + 1):
+            if item.position != expected:
+                break
+            items.append(item)
+        return items
@@ -0,0 +1,57 @@
+"""Multi-row insert helpers shared by the repositories."""
+from typing import Any, Dict, List
+import json
+from sqlalchemy import JSON, Table, insert, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Below this many rows a multi-row INSERT ... RETURNING beats COPY's extra sequence round trip
+COPY_THRESHOLD = 500
+
+
+def _use_copy(session: AsyncSession, n_rows: int) -> bool:
+    dialect = session.get_bind().dialect
+    return dialect.name == "postgresql" and dialect.driver == "asyncpg" and n_rows >= COPY_THRESHOLD
+
+
+async def _copy_insert(session: AsyncSession, table: Table, rows: List[Dict[str, Any]]) -> List[int]:
+    # COPY cannot return generated keys, so ids are reserved from the sequence up front
+    conn = await session.connection()
+    res = await conn.execute(
+        text("SELECT nextval(pg_get_serial_sequence(:table, 'id')) FROM generate_series(1, :n)"),
+        {"table": table.name, "n": len(rows)},
+    )
+    ids = [r[0] for r in res]
+    keys = list(rows[0])
+    json_cols = {k for k in keys if isinstance(table.c[k].type, JSON)}
+    records = [
+        (id_, *(json.dumps(row[k]) if k in json_cols and row[k] is not None else row[k] for k in keys))
+        for id_, row in zip(ids, rows)
+    ]
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(table.name, records=records, columns=["id", *keys])
+    return ids
+
+
+def dialect_insert(session: AsyncSession, table: Table):
+    """INSERT construct with ON CONFLICT support for the session's dialect (PostgreSQL or SQLite)."""
+    name = session.get_bind().dialect.name
+    if name == "postgresql":
+        return postgresql.insert(table)
+    if name == "sqlite":
+        return sqlite.insert(table)
+    raise NotImplementedError(f"ON CONFLICT upserts are not supported on {name}")
+
+
+async def insert_many(session: AsyncSession, table: Table, rows: List[Dict[str, Any]]) -> List[int]:
+    """Insert `rows` (dicts with identical keys) without committing and return their ids in order.
+
+    Uses PostgreSQL COPY for large asyncpg batches, otherwise a batched multi-row
+    INSERT ... RETURNING. No per-row refresh is issued.
+    """
+    if not rows:
+        return []
+    if _use_copy(session, len(rows)):
+        return await _copy_insert(session, table, rows)
+    res = await session.execute(insert(table).returning(table.c.id, sort_by_parameter_order=True), rows)
+    return list(res.scalars())
@@ -1,7 +1,8 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List
+from typing import Any, Dict, List, Optional
 from ..models.classification_event import ClassificationEvent
+from .bulk import insert_many
 
 class ClassificationEventRepository:
     def __init__(self, session: AsyncSession):
@@ -14,7 +15,18 @@ class ClassificationEventRepository:
         await self.session.refresh(ev)
         return ev
 
-    async def list_for_variant(self, variant_id: int, limit: int = 50) -> List[ClassificationEvent]:
-        stmt = select(ClassificationEvent).where(ClassificationEvent.variant_id == variant_id).order_by(ClassificationEvent.id.desc()).limit(limit)
+    async def add_events_many(self, rows: List[Dict[str, Any]], commit: bool = True) -> List[int]:
+        """Insert many events in one transaction; returns generated ids in input order."""
+        ids = await insert_many(self.session, ClassificationEvent.__table__, rows)
+        if commit:
+            await self.session.commit()
+        return ids
+
+    async def list_for_variant(self, variant_id: int, limit: int = 50, before_id: Optional[int] = None) -> List[ClassificationEvent]:
+        """Newest-first page of a variant's events; `before_id` is the last id of the previous page."""
+        stmt = select(ClassificationEvent).where(ClassificationEvent.variant_id == variant_id)
+        if before_id is not None:
+            stmt = stmt.where(ClassificationEvent.id < before_id)
+        stmt = stmt.order_by(ClassificationEvent.id.desc()).limit(limit)
         res = await self.session.execute(stmt)
         return list(res.scalars())
@@ -0,0 +1,76 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from typing import Any, Dict, Iterable, List, Optional
+import hashlib
+import json
+import zlib
+from ..config import get_settings
+from ..models.evidence_blob import EvidenceBlob
+from .bulk import dialect_insert
+
+# Hashes per IN lookup, well under SQLite's bound-parameter limit
+LOOKUP_CHUNK = 500
+
+
+def canonical_json(evidence: list) -> bytes:
+    return json.dumps(evidence, sort_keys=True, separators=(",", ":")).encode()
+
+
+def evidence_hash(evidence: list) -> str:
+    """Content hash of an evidence list, independent of dict key order."""
+    return hashlib.sha256(canonical_json(evidence)).hexdigest()
+
+
+def encode_blob(raw: bytes, compress_min_bytes: int) -> tuple[str, bytes]:
+    if len(raw) >= compress_min_bytes:
+        packed = zlib.compress(raw, 6)
+        if len(packed) < len(raw):
+            return "zlib", packed
+    return "json", raw
+
+
+def decode_blob(encoding: str, data: bytes) -> list:
+    return json.loads(zlib.decompress(data) if encoding == "zlib" else data)
+
+
+class EvidenceBlobRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def put_many(self, evidence_lists: Iterable[list]) -> List[str]:
+        """Store each distinct evidence list once; returns the content hash per input.
+
+        Blobs that already exist are left untouched (INSERT ... ON CONFLICT DO NOTHING).
+        Does not commit.
+        """
+        compress_min = get_settings().evidence_compress_min_bytes
+        hashes: List[str] = []
+        rows: Dict[str, Dict[str, Any]] = {}
+        for evidence in evidence_lists:
+            raw = canonical_json(evidence)
+            h = hashlib.sha256(raw).hexdigest()
+            hashes.append(h)
+            if h not in rows:
+                encoding, data = encode_blob(raw, compress_min)
+                rows[h] = dict(hash=h, encoding=encoding, data=data, size=len(raw))
+        if rows:
+            stmt = dialect_insert(self.session, EvidenceBlob.__table__).on_conflict_do_nothing(index_elements=["hash"])
+            await self.session.execute(stmt, list(rows.values()))
+        return hashes
+
+    async def get_many(self, hashes: Iterable[str]) -> Dict[str, list]:
+        """Decoded evidence for the given hashes, fetched in one batched lookup (per chunk)."""
+        wanted = list(dict.fromkeys(h for h in hashes if h))
+        found: Dict[str, list] = {}
+        for i in range(0, len(wanted), LOOKUP_CHUNK):
+            res = await self.session.execute(
+                select(EvidenceBlob.hash, EvidenceBlob.encoding, EvidenceBlob.data).where(EvidenceBlob.hash.in_(wanted[i:i + LOOKUP_CHUNK]))
+            )
+            found.update({r.hash: decode_blob(r.encoding, r.data) for r in res})
+        return found
+
+    async def resolve(self, rows: Iterable[Any]) -> List[Optional[list]]:
+        """Evidence for rows with `evidence` / `evidence_hash` attributes: inline (legacy rows) or from blobs."""
+        rows = list(rows)
+        blobs = await self.get_many(r.evidence_hash for r in rows if r.evidence is None)
+        return [r.evidence if r.evidence is not None else blobs.get(r.evidence_hash) for r in rows]
@@ -1,5 +1,5 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 from typing import Optional
 from ..models.user import User
 
@@ -18,3 +18,16 @@ class UserRepository:
         await self.session.commit()
         await self.session.refresh(user)
         return user
+
+    async def bump_token_version(self, user: User) -> int:
+        """Revoke every token issued so far for `user` (e.g. after a password or role change).
+
+        Also drops the user's cached principal, so revocation takes effect on the next request
+        in this process instead of after PRINCIPAL_CACHE_TTL.
+        """
+        await self.session.execute(update(User).where(User.id == user.id).values(token_version=User.token_version + 1))
+        await self.session.commit()
+        await self.session.refresh(user)
+        from ..core.security import invalidate_principal  # security imports this module
+        invalidate_principal(user.email)
+        return user.token_version
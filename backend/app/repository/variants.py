@@ -1,7 +1,18 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List, Optional
+from sqlalchemy import Row, Select, select, tuple_, update
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from datetime import datetime, timezone
 from ..models.variant import Variant
+from .bulk import dialect_insert
+from .evidence_blobs import evidence_hash
+
+# Keys per IN (...) lookup or update, well under SQLite's bound-parameter limit
+LOOKUP_CHUNK = 400
+
+
+class UpsertResult(NamedTuple):
+    id: int
+    changed: bool  # newly inserted, or classification / evidence differ from the stored row
 
 class VariantRepository:
     def __init__(self, session: AsyncSession):
@@ -14,12 +25,127 @@ class VariantRepository:
         await self.session.refresh(obj)
         return obj
 
+    async def upsert_many(self, rows: List[Dict[str, Any]], commit: bool = True) -> List[UpsertResult]:
+        """Insert or update variants keyed on (hgvs, genome_build); results in input order.
+
+        Rows need hgvs, genome_build, classification, evidence and created_by (`evidence` may
+        be None when the row carries a precomputed `evidence_hash` for a stored blob). A row whose
+        classification and evidence hash match the stored one only has `last_seen_at`
+        touched; changed rows are rewritten in place and new ones inserted. Repeated keys
+        within `rows` collapse onto one variant (last occurrence wins).
+
+        A row may set `degraded=True` (computed with evidence sources missing). Such a row
+        never overwrites a stored variant, which is only touched, so a source outage does not
+        flip the classification back and forth; it is inserted only when the variant is new,
+        and loses to a row another transaction inserts concurrently.
+        """
+        if not rows:
+            return []
+        now = datetime.now(timezone.utc)
+        latest: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for row in rows:
+            digest = row.get("evidence_hash") or evidence_hash(row["evidence"])
+            latest[(row["hgvs"], row["genome_build"])] = {**row, "evidence_hash": digest, "last_seen_at": now}
+        degraded = {key for key, row in latest.items() if row.pop("degraded", False)}
+        keys = list(latest)
+        existing = {}
+        for i in range(0, len(keys), LOOKUP_CHUNK):
+            res = await self.session.execute(
+                select(Variant.id, Variant.hgvs, Variant.genome_build, Variant.classification, Variant.evidence_hash)
+                .where(tuple_(Variant.hgvs, Variant.genome_build).in_(keys[i:i + LOOKUP_CHUNK]))
+            )
+            existing.update({(r.hgvs, r.genome_build): r for r in res})
+
+        results: Dict[Tuple[str, str], UpsertResult] = {}
+        touched: List[int] = []
+        changed: List[Dict[str, Any]] = []
+        new: List[Dict[str, Any]] = []
+        new_degraded: List[Dict[str, Any]] = []
+        for key, row in latest.items():
+            cur = existing.get(key)
+            if cur is None:
+                (new_degraded if key in degraded else new).append(row)
+            elif key in degraded or (cur.classification == row["classification"] and cur.evidence_hash == row["evidence_hash"]):
+                touched.append(cur.id)
+                results[key] = UpsertResult(cur.id, False)
+            else:
+                changed.append({"id": cur.id, **{k: row[k] for k in ("classification", "evidence", "evidence_hash", "last_seen_at")}})
+                results[key] = UpsertResult(cur.id, True)
+        if new_degraded:
+            # ON CONFLICT DO NOTHING: a concurrently inserted row wins and is only touched
+            stmt = dialect_insert(self.session, Variant.__table__)
+            table = Variant.__table__.c
+            stmt = stmt.on_conflict_do_nothing(index_elements=["hgvs", "genome_build"]).returning(table.id, table.hgvs, table.genome_build)
+            for r in await self.session.execute(stmt, new_degraded):
+                results[(r.hgvs, r.genome_build)] = UpsertResult(r.id, True)
+            lost = [(row["hgvs"], row["genome_build"]) for row in new_degraded if (row["hgvs"], row["genome_build"]) not in results]
+            for i in range(0, len(lost), LOOKUP_CHUNK):
+                res = await self.session.execute(
+                    select(Variant.id, Variant.hgvs, Variant.genome_build).where(tuple_(Variant.hgvs, Variant.genome_build).in_(lost[i:i + LOOKUP_CHUNK]))
+                )
+                for r in res:
+                    touched.append(r.id)
+                    results[(r.hgvs, r.genome_build)] = UpsertResult(r.id, False)
+        for i in range(0, len(touched), LOOKUP_CHUNK):
+            await self.session.execute(update(Variant).where(Variant.id.in_(touched[i:i + LOOKUP_CHUNK])).values(last_seen_at=now))
+        if changed:
+            await self.session.execute(update(Variant), changed)
+        if new:
+            # ON CONFLICT covers a concurrent insert of the same key; that row is treated as changed
+            stmt = dialect_insert(self.session, Variant.__table__)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["hgvs", "genome_build"],
+                set_={c: stmt.excluded[c] for c in ("classification", "evidence", "evidence_hash", "last_seen_at")},
+            ).returning(Variant.__table__.c.id, sort_by_parameter_order=True)
+            ids = (await self.session.execute(stmt, new)).scalars()
+            for row, vid in zip(new, ids):
+                results[(row["hgvs"], row["genome_build"])] = UpsertResult(vid, True)
+        if commit:
+            await self.session.commit()
+        return [results[(r["hgvs"], r["genome_build"])] for r in rows]
+
     async def get(self, variant_id: int) -> Optional[Variant]:
         return await self.session.get(Variant, variant_id)
 
-    async def list(self, hgvs: Optional[str] = None, limit: int = 25) -> List[Variant]:
-        stmt = select(Variant).order_by(Variant.id.desc()).limit(limit)
-        if hgvs:
-            stmt = select(Variant).where(Variant.hgvs == hgvs).order_by(Variant.id.desc()).limit(limit)
-        res = await self.session.execute(stmt)
+    async def list(self, before_id: Optional[int] = None, limit: int = 25, **filters: Any) -> List[Variant]:
+        """Newest-first page of variants matching the filters (keyset on id).
+
+        `before_id` is the last id of the previous page, so every page is an index range
+        scan regardless of depth. See `_filtered` for the accepted filters.
+        """
+        res = await self.session.execute(_filtered(select(Variant), before_id, limit, **filters))
         return list(res.scalars())
+
+    async def list_summaries(self, before_id: Optional[int] = None, limit: int = 25, **filters: Any) -> List[Row]:
+        """Like `list`, but selects only id, hgvs, genome_build and classification (no evidence)."""
+        stmt = select(Variant.id, Variant.hgvs, Variant.genome_build, Variant.classification)
+        res = await self.session.execute(_filtered(stmt, before_id, limit, **filters))
+        return list(res.all())
+
+
+def _filtered(
+    stmt: Select,
+    before_id: Optional[int],
+    limit: int,
+    hgvs: Optional[str] = None,
+    classification: Optional[str] = None,
+    genome_build: Optional[str] = None,
+    created_by: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+) -> Select:
+    if hgvs:
+        stmt = stmt.where(Variant.hgvs == hgvs)
+    if classification:
+        stmt = stmt.where(Variant.classification == classification)
+    if genome_build:
+        stmt = stmt.where(Variant.genome_build == genome_build)
+    if created_by is not None:
+        stmt = stmt.where(Variant.created_by == created_by)
+    if created_after is not None:
+        stmt = stmt.where(Variant.created_at >= created_after)
+    if created_before is not None:
+        stmt = stmt.where(Variant.created_at < created_before)
+    if before_id is not None:
+        stmt = stmt.where(Variant.id < before_id)
+    return stmt.order_by(Variant.id.desc()).limit(limit)
@@ -1,158 +1,369 @@
-from pydantic import BaseModel
-from typing import List, Dict, Any
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, NamedTuple, Optional, Tuple
+import asyncio
 import os
-import httpx
+import time
 from loguru import logger
-from .cache import cache_get, cache_set
+from .cache import (
+    cache_get_many, cache_set_many, cache_lock, cache_unlock, cache_lock_many, cache_unlock_many,
+    wrap_entry, is_entry, entry_is_stale, entry_needs_early_refresh,
+)
+from .mcp_client import get_mcp_client
+from .coalescer import get_coalescer
+from .resilience import CircuitOpen, get_guard
+from .singleflight import SingleFlight
+from .hgvs_validate import normalize_hgvs
+from .rules import RULE_STRENGTH_MAP, Evidence, EvidenceItem, VariantContext, evaluate, evaluate_many  # noqa: F401
+from .combining import STRENGTHS, classify_counts
+from ..config import get_settings
 import hashlib
 
-class EvidenceItem(BaseModel):
-    code: str
-    strength: str  # e.g., VeryStrong, Strong, Moderate, Supporting, StandAlone, Strong-Benign, Supporting-Benign
-    satisfied: bool
-    rationale: str
-    sources: list[str] = []
-
-# Mapping ACMG rule codes to categorical strengths (pathogenic or benign side)
-RULE_STRENGTH_MAP: Dict[str, str] = {
-    # Pathogenic side (subset for prototype)
-    "PVS1": "VeryStrong",
-    "PS1": "Strong",
-    "PS2": "Strong",
-    "PS3": "Strong",
-    "PS4": "Strong",
-    "PM1": "Moderate",
-    "PM2": "Moderate",
-    "PM5": "Moderate",
-    "PP3": "Supporting",
-    "PP5": "Supporting",
-    # Benign side
-    "BA1": "StandAloneBenign",
-    "BS1": "StrongBenign",
-    "BS2": "StrongBenign",
-    "BP4": "SupportingBenign",
-    "BP7": "SupportingBenign",
-}
+@dataclass(slots=True)
+class EvidenceBundle:
+    evidence: List[Evidence]
+    missing_sources: List[str] = field(default_factory=list)  # sources that were unavailable (no evidence from them)
+
+    @property
+    def degraded(self) -> bool:
+        return bool(self.missing_sources)
 
-MCP_BASE = os.getenv("MCP_SERVER_URL", "http://localhost:8100")
+class EvidenceUnavailable(RuntimeError):
+    """Raised under the "strict" partial-result policy when a source is unavailable."""
 
 async def mcp_call(path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-    url = f"{MCP_BASE}{path}"
+    """POST to the MCP server; failures propagate so the source is reported missing, never as empty evidence."""
+    return await get_mcp_client().post(path, payload)
+
+# MCP evidence sources and their endpoints, queried concurrently per variant
+EVIDENCE_SOURCES: Dict[str, str] = {
+    "clinvar": "/clinvar",
+    "gnomad": "/gnomad",
+    "predictions": "/predictions",
+}
+
+def source_deadlines() -> Dict[str, float]:
+    settings = get_settings()
+    return {
+        "clinvar": settings.clinvar_deadline,
+        "gnomad": settings.gnomad_deadline,
+        "predictions": settings.predictions_deadline,
+    }
+
+async def _fetch_source(source: str, hgvs: str, deadline: float) -> Optional[Dict[str, Any]]:
+    """One source's payload, or None when it is unavailable (breaker open, timed out or failed).
+
+    The endpoint guard wraps each upstream request: the per-variant call here, or the shared
+    bulk call inside the coalescer, so one failed bulk call counts as one breaker failure.
+    """
+    path = EVIDENCE_SOURCES[source]
     try:
-        async with httpx.AsyncClient(timeout=8.0) as client:
-            resp = await client.post(url, json=payload)
-            resp.raise_for_status()
-            return resp.json()
+        if get_settings().mcp_coalesce:
+            return await asyncio.wait_for(get_coalescer(path).get(hgvs, deadline), deadline)
+        return await get_guard(path).call(lambda: mcp_call(path, {"hgvs": hgvs}), deadline)
+    except CircuitOpen:
+        logger.debug(f"MCP source {source} circuit open; skipping {hgvs}")
+    except asyncio.TimeoutError:
+        logger.warning(f"MCP source {source} timed out for {hgvs}")
     except Exception as e:
-        logger.warning(f"MCP call failed {url}: {e}")
-        return {}
+        logger.warning(f"MCP source {source} failed for {hgvs}: {e}")
+    return None
+
+async def fetch_sources(hgvs: str, sources: Optional[List[str]] = None) -> tuple[Dict[str, Dict[str, Any]], List[str]]:
+    """Query evidence sources (all by default) concurrently, each bounded by its own deadline.
+
+    Returns the payload per source (empty for unavailable sources) and the list of unavailable sources.
+    Wall time is bounded by the slowest deadline rather than the sum of round trips.
+    """
+    sources = list(sources or EVIDENCE_SOURCES)
+    deadlines = source_deadlines()
+    results = await asyncio.gather(*(_fetch_source(src, hgvs, deadlines[src]) for src in sources))
+    payloads: Dict[str, Dict[str, Any]] = {}
+    missing: List[str] = []
+    for src, res in zip(sources, results):
+        if res is None:
+            missing.append(src)
+            res = {}
+        payloads[src] = res
+    if missing and get_settings().evidence_partial_policy == "strict":
+        raise EvidenceUnavailable(f"Evidence sources unavailable: {', '.join(missing)}")
+    return payloads, missing
+
+def source_cache_policy() -> Dict[str, tuple[str, int]]:
+    """(data version, TTL seconds) per source. Bumping a version orphans that source's cached payloads."""
+    settings = get_settings()
+    return {
+        "clinvar": (settings.clinvar_data_version, settings.clinvar_cache_ttl),
+        "gnomad": (settings.gnomad_data_version, settings.gnomad_cache_ttl),
+        "predictions": (settings.predictions_data_version, settings.predictions_cache_ttl),
+    }
+
+def payload_key(source: str, hgvs: str, genome_build: str, version: str) -> str:
+    return f"mcp:{source}:{genome_build}:{version}:{hgvs}"
 
 def deterministic_choice(values: List, key: str):
     h = int(hashlib.sha256(key.encode()).hexdigest(), 16)
     return values[h % len(values)]
 
-async def fetch_evidence(hgvs: str) -> List[EvidenceItem]:
-    evidence: List[EvidenceItem] = []
-    deterministic = os.getenv("DETERMINISTIC_TESTS", "0") == "1"
-    cache_key = f"evidence:{hgvs}"
-    if not deterministic:
-        cached = await cache_get(cache_key)
-        if cached:
-            return [EvidenceItem(**e) for e in cached]
-
-    if deterministic:
-        # Synthesize deterministic payloads
-        clinvar = {"clinical_significance": deterministic_choice([None, "Pathogenic", "Likely pathogenic", "VUS"], hgvs)}
-        gnomad = {"allele_frequency": deterministic_choice([0.00001, 0.0002, 0.002, 0.02], hgvs)}
-        deleterious_tools = deterministic_choice(list(range(6)), hgvs)
-        preds = {"deleterious_tools": deleterious_tools, "total_tools": 5}
-    else:
-        clinvar = await mcp_call("/clinvar", {"hgvs": hgvs})
-        gnomad = await mcp_call("/gnomad", {"hgvs": hgvs})
-        preds = await mcp_call("/predictions", {"hgvs": hgvs})
-    # PM1 (hotspot) heuristic: if variant has certain pattern (e.g., :c.123A>G) just a placeholder
-    if ":c." in hgvs and hgvs.endswith(">A"):
-        evidence.append(EvidenceItem(code="PM1", strength="Moderate", satisfied=True, rationale="Hotspot region heuristic", sources=["heuristic"]))
-
-    # BP7 (synonymous with no predicted splice impact) heuristic
-    if "syn" in hgvs:
-        evidence.append(EvidenceItem(code="BP7", strength="SupportingBenign", satisfied=True, rationale="Synonymous with no predicted splice impact (heuristic)", sources=["heuristic"]))
-
-    # Loss-of-function heuristic
-    if any(token in hgvs for token in ["del", "dup", "fs", "*", "stop"]):
-        evidence.append(EvidenceItem(code="PVS1", strength="VeryStrong", satisfied=True, rationale="Predicted null variant in gene with established LoF mechanism (heuristic)", sources=["heuristic"]))
-
-    # ClinVar significance translation (simplified)
-    sig = clinvar.get("clinical_significance") if isinstance(clinvar, dict) else None
-    if sig and "Pathogenic" in sig:
-        evidence.append(EvidenceItem(code="PP5", strength="Supporting", satisfied=True, rationale=f"ClinVar significance {sig}", sources=["mcp:clinvar"]))
-    elif sig and sig == "Benign":
-        evidence.append(EvidenceItem(code="BP4", strength="SupportingBenign", satisfied=True, rationale="ClinVar benign", sources=["mcp:clinvar"]))
-
-    # Population frequency for BS1 / BA1 simplistic thresholds
-    af = gnomad.get("allele_frequency") if isinstance(gnomad, dict) else None
-    if af is not None:
-        if af > 0.01:
-            evidence.append(EvidenceItem(code="BA1", strength="StandAloneBenign", satisfied=True, rationale=f"High AF {af}", sources=["mcp:gnomad"]))
-        elif af > 0.001:
-            evidence.append(EvidenceItem(code="BS1", strength="StrongBenign", satisfied=True, rationale=f"AF {af} exceeds BS1 threshold", sources=["mcp:gnomad"]))
-    # In-silico predictions
-    if preds:
-        deleterious = preds.get("deleterious_tools", 0)
-        total = preds.get("total_tools", 0) or 1
-        if deleterious / total >= 0.6 and deleterious >=3:
-            evidence.append(EvidenceItem(code="PP3", strength="Supporting", satisfied=True, rationale=f"{deleterious}/{total} deleterious tools", sources=["mcp:predictions"]))
-        elif deleterious <=1:
-            evidence.append(EvidenceItem(code="BP4", strength="SupportingBenign", satisfied=True, rationale=f"Low deleterious consensus {deleterious}/{total}", sources=["mcp:predictions"]))
-    if not deterministic:
-        await cache_set(cache_key, [e.model_dump() for e in evidence])
-    return evidence
+def _deterministic_bundle(hgvs: str) -> EvidenceBundle:
+    # Synthesize deterministic payloads
+    clinvar = {"clinical_significance": deterministic_choice([None, "Pathogenic", "Likely pathogenic", "VUS"], hgvs)}
+    gnomad = {"allele_frequency": deterministic_choice([0.00001, 0.0002, 0.002, 0.02], hgvs)}
+    deleterious_tools = deterministic_choice(list(range(6)), hgvs)
+    preds = {"deleterious_tools": deleterious_tools, "total_tools": 5}
+    return EvidenceBundle(evidence=derive_evidence(hgvs, clinvar, gnomad, preds))
 
+class _Loaded(NamedTuple):
+    payloads: Dict[str, Dict[str, Any]]
+    missing: List[str]
+    from_cache: bool  # produced by another process and already cached
+    elapsed: float = 0.0  # upstream fetch time, used to scale early refresh
 
-def combine_classification(counts: Dict[str, int]) -> str:
-    vs = counts.get("VeryStrong", 0)
-    s = counts.get("Strong", 0)
-    m = counts.get("Moderate", 0)
-    p = counts.get("Supporting", 0)
-    ba = counts.get("StandAloneBenign", 0)
-    bs = counts.get("StrongBenign", 0)
-    bp = counts.get("SupportingBenign", 0)
+# Concurrent misses for the same variant share one upstream fetch within this process
+_evidence_flight = SingleFlight()
+# Loop-private single-flight for eager Celery tasks: a shared task from the API loop cannot be awaited there
+task_flight: ContextVar[SingleFlight | None] = ContextVar("evidence_task_flight", default=None)
+# Cross-process payload locks held by this process, by lock key. A local flight for the
+# variant runs under the held lock rather than waiting on it, whichever caller took it
+_held_locks: Dict[str, str] = {}
+# Stale-while-revalidate bookkeeping: background refreshes in flight and counters
+_refreshing: set[str] = set()
+_refresh_tasks: set[asyncio.Task] = set()
+_swr_stats = {"stale_served": 0, "early_refreshes": 0, "refreshes": 0}
+
+async def fetch_evidence(hgvs: str, genome_build: str = "GRCh38") -> EvidenceBundle:
+    if os.getenv("DETERMINISTIC_TESTS", "0") == "1":
+        return _deterministic_bundle(hgvs)
+    bundle = (await fetch_evidence_many([(hgvs, genome_build)], concurrency=1))[0]
+    if isinstance(bundle, Exception):
+        raise bundle
+    return bundle
+
+def _cache_items(loaded: _Loaded, keys: Dict[str, str], policy: Dict[str, tuple[str, int]]) -> tuple[Dict[str, Any], Dict[str, int]]:
+    """Cache entries (and Redis TTLs) for freshly fetched payloads; empty payloads are never cached."""
+    items: Dict[str, Any] = {}
+    ttls: Dict[str, int] = {}
+    if loaded.from_cache:
+        return items, ttls
+    stale_window = get_settings().cache_stale_window
+    for src, payload in loaded.payloads.items():
+        if payload:
+            ttl = policy[src][1]
+            items[keys[src]] = wrap_entry(payload, ttl, loaded.elapsed)
+            # Kept past the soft TTL so it can still be served stale while it is refreshed
+            ttls[keys[src]] = ttl + stale_window
+    return items, ttls
+
+async def fetch_evidence_many(variants: List[Tuple[str, str]], concurrency: int) -> List[EvidenceBundle | Exception]:
+    """Evidence for many `(hgvs, genome_build)` pairs, in input order.
+
+    Raw MCP payloads are cached per source under build- and version-aware keys; evidence is
+    always re-derived locally, so rule changes never require refetching. All cached payloads
+    are resolved in one batched cache read, only missing sources are fetched, and new payloads
+    are written back in one pipelined batch with each source's own TTL. A failed fetch yields
+    the exception in its slot.
+
+    `concurrency` bounds upstream requests: with MCP_COALESCE the misses go out in groups of
+    MCP_COALESCE_MAX_KEYS variants, one bulk call per source each, at most `concurrency`
+    groups at a time; otherwise at most `concurrency` variants are fetched at a time.
 
-    # Benign side first
-    if ba >= 1 or bs >= 2:
-        return "Benign"
-    if (bs >= 1 and bp >=1) or (bp >= 2):
-        return "Likely Benign"
+    Entries past their soft TTL are served stale while one background task refreshes them,
+    and entries close to it are refreshed early with a probability that rises towards expiry,
+    so popular variants never wait on MCP at a TTL boundary.
+    """
+    if os.getenv("DETERMINISTIC_TESTS", "0") == "1":
+        return [_deterministic_bundle(h) for h, _ in variants]
 
-    # Pathogenic side (ClinGen refined combinations simplified)
-    if (vs >=1 and s >=1) or (vs >=1 and m >=2) or (vs >=1 and (m >=1 and p >=1)) or (s >=2 and m >=1) or (s >=1 and m >=3) or (vs >=1 and p >=2):
-        return "Pathogenic"
-    if (vs >=1 and m >=1) or (s >=1 and m >=1 and p >=2) or (s >=1 and p >=4) or (m >=3) or (m >=2 and p >=2) or (m >=1 and p >=4):
-        return "Likely Pathogenic"
+    settings = get_settings()
+    policy = source_cache_policy()
+    normalized = [(normalize_hgvs(h), b) for h, b in variants]
+    unique = list(dict.fromkeys(normalized))
+    keys = {v: {src: payload_key(src, v[0], v[1], policy[src][0]) for src in EVIDENCE_SOURCES} for v in unique}
+    cached = await cache_get_many(k for ks in keys.values() for k in ks.values())
+    now = time.time()
+    payloads: Dict[Tuple[str, str], Dict[str, Dict[str, Any]]] = {v: {} for v in unique}
+    for v in unique:
+        refresh = []
+        for src, key in keys[v].items():
+            entry = cached.get(key)
+            if not is_entry(entry):
+                continue
+            payloads[v][src] = entry["v"]
+            if entry_is_stale(entry, now):
+                _swr_stats["stale_served"] += 1
+                refresh.append(src)
+            elif entry_needs_early_refresh(entry, now, settings.cache_early_refresh_beta):
+                _swr_stats["early_refreshes"] += 1
+                refresh.append(src)
+        if refresh:
+            _schedule_refresh(v, refresh, keys[v], policy)
+    sem = asyncio.Semaphore(max(concurrency, 1))
 
-    return "VUS"
+    async def load(v: Tuple[str, str]) -> _Loaded | Exception:
+        hgvs, build = v
+        todo = [src for src in EVIDENCE_SOURCES if src not in payloads[v]]
+        try:
+            return await (task_flight.get() or _evidence_flight).do(
+                f"{build}:{hgvs}:{','.join(todo)}",
+                lambda: _load_payloads(hgvs, build, todo, [keys[v][src] for src in todo]),
+            )
+        except Exception as e:
+            logger.warning(f"Evidence fetch failed for {hgvs}: {e}")
+            return e
+
+    async def load_group(group: List[Tuple[str, str]]) -> List[_Loaded | Exception]:
+        # The group's lookups reach the coalescers together and leave as one bulk call per source
+        async with sem:
+            return await asyncio.gather(*(load(v) for v in group))
+
+    need = [v for v in unique if len(payloads[v]) < len(EVIDENCE_SOURCES)]
+    group_size = max(settings.mcp_coalesce_max_keys, 1) if settings.mcp_coalesce else 1
+    groups = [need[i:i + group_size] for i in range(0, len(need), group_size)]
+    # Cross-process locks for every miss are taken in one round trip and released in one
+    # after the new payloads are cached, so other processes waiting on them find them there
+    locked = await cache_lock_many([k for k in map(_lock_key, need) if k not in _held_locks], settings.singleflight_lock_ms)
+    tokens = {k: t for k, t in locked.items() if t is not None and k not in _held_locks}
+    _held_locks.update(tokens)
+    try:
+        loaded = dict(zip(need, [res for group in await asyncio.gather(*map(load_group, groups)) for res in group]))
+        bundles: Dict[Tuple[str, str], EvidenceBundle | Exception] = {}
+        missing: Dict[Tuple[str, str], List[str]] = {}
+        to_cache: Dict[str, Any] = {}
+        ttls: Dict[str, int] = {}
+        for v in unique:
+            res = loaded.get(v)
+            if isinstance(res, Exception):
+                bundles[v] = res
+                continue
+            missing[v] = []
+            if res is not None:
+                payloads[v].update(res.payloads)
+                missing[v] = res.missing
+                items, item_ttls = _cache_items(res, keys[v], policy)
+                to_cache.update(items)
+                ttls.update(item_ttls)
+        # All I/O is done; the rules run over the whole batch as pure CPU work
+        ready = list(missing)
+        contexts = [VariantContext(h, b, **{src: payloads[(h, b)].get(src, {}) for src in EVIDENCE_SOURCES}) for h, b in ready]
+        for v, evidence in zip(ready, evaluate_many(contexts)):
+            bundles[v] = EvidenceBundle(evidence=evidence, missing_sources=missing[v])
+        await cache_set_many(to_cache, ttl=ttls)
+        return [bundles[v] for v in normalized]
+    finally:
+        for k in tokens:
+            _held_locks.pop(k, None)
+        await cache_unlock_many(tokens)
+
+def _schedule_refresh(v: Tuple[str, str], sources: List[str], keys: Dict[str, str], policy: Dict[str, tuple[str, int]]):
+    hgvs, build = v
+    flight = f"{build}:{hgvs}:{','.join(sources)}"
+    if flight in _refreshing:
+        return
+    _refreshing.add(flight)
+
+    async def refresh():
+        try:
+            res = await _load_payloads(hgvs, build, sources, [keys[src] for src in sources], wait=False)
+            if res is not None:
+                items, ttls = _cache_items(res, keys, policy)
+                await cache_set_many(items, ttl=ttls)
+        except Exception as e:
+            logger.warning(f"Background evidence refresh failed for {hgvs}: {e}")
+        finally:
+            _refreshing.discard(flight)
+
+    _swr_stats["refreshes"] += 1
+    task = asyncio.ensure_future(refresh())
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
+
+async def drain_refreshes(timeout: float = 5.0):
+    """Let background refreshes on this loop finish within `timeout` seconds, then cancel the rest.
+
+    Called on shutdown before the MCP and Redis clients they use are closed.
+    """
+    loop = asyncio.get_running_loop()
+    tasks = [t for t in _refresh_tasks if t.get_loop() is loop and not t.done()]
+    if not tasks:
+        return
+    _, pending = await asyncio.wait(tasks, timeout=timeout)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+def _lock_key(v: Tuple[str, str]) -> str:
+    return f"payloads:{v[1]}:{v[0]}"
+
+async def _load_payloads(hgvs: str, genome_build: str, sources: List[str], cache_keys: List[str], wait: bool = True) -> Optional[_Loaded]:
+    """Fetch `sources` upstream under the cross-process lock.
+
+    Runs at once under a lock this process already holds (see `_held_locks`); its holder
+    releases it. Otherwise the lock is taken here; when another process holds it, waits for
+    its payloads (or takes over once the lock is released), or with `wait=False` returns
+    None instead.
+    """
+    settings = get_settings()
+    lock_key = _lock_key((hgvs, genome_build))
+    token = _held_locks.get(lock_key)
+    held = token is not None
+    if held and not wait:
+        return None  # a foreground load in this process is already fetching it
+    if not held:
+        token = await cache_lock(lock_key, settings.singleflight_lock_ms)
+    if token is None and not wait:
+        return None
+    wait_until = time.monotonic() + settings.singleflight_lock_ms / 1000
+    while token is None and time.monotonic() < wait_until:
+        await asyncio.sleep(settings.singleflight_poll_ms / 1000)
+        # A sibling request in this process may have taken the lock since; run under it
+        token = _held_locks.get(lock_key)
+        if token is not None:
+            held = True
+            break
+        cached = await cache_get_many(cache_keys)
+        if all(is_entry(cached.get(k)) for k in cache_keys):
+            return _Loaded({src: cached[k]["v"] for src, k in zip(sources, cache_keys)}, [], True)
+        token = await cache_lock(lock_key, settings.singleflight_lock_ms)
+    try:
+        started = time.monotonic()
+        fetched, missing = await fetch_sources(hgvs, sources)
+        return _Loaded(fetched, missing, False, time.monotonic() - started)
+    finally:
+        if token is not None and not held:
+            await cache_unlock(lock_key, token)
+
+def derive_evidence(hgvs: str, clinvar: Dict[str, Any], gnomad: Dict[str, Any], preds: Dict[str, Any]) -> List[Evidence]:
+    return evaluate(VariantContext(hgvs, clinvar=clinvar, gnomad=gnomad, predictions=preds))
+
+
+def combine_classification(counts: Dict[str, int]) -> str:
+    return classify_counts([counts.get(st, 0) for st in STRENGTHS])
 
 
 async def evaluate_variant(hgvs: str, genome_build: str) -> Dict[str, Any]:
-    evidence = await fetch_evidence(hgvs)
-    counts = {"VeryStrong":0, "Strong":0, "Moderate":0, "Supporting":0, "StandAloneBenign":0, "StrongBenign":0, "SupportingBenign":0}
-    applied = []
-    for ev in evidence:
-        if not ev.satisfied:
-            continue
-        st = ev.strength
-        if st in counts:
-            counts[st] += 1
-        elif st.startswith("StrongBenign"):
-            counts["StrongBenign"] += 1
-        elif st.startswith("SupportingBenign"):
-            counts["SupportingBenign"] += 1
-        applied.append(ev.model_dump())
-
-    classification = combine_classification(counts)
+    return score_evidence(await fetch_evidence(hgvs, genome_build))
+
+
+def score_evidence(bundle: EvidenceBundle) -> Dict[str, Any]:
+    counts = [0] * len(STRENGTHS)
+    for ev in bundle.evidence:
+        counts[ev.strength] += 1
+    # The single conversion out of the internal representation: JSON-ready dicts
+    applied = [ev.to_dict() for ev in bundle.evidence]
+
+    classification = classify_counts(counts)
+    rationale = f"Counts: {dict(zip(STRENGTHS, counts))}"
+    if bundle.missing_sources:
+        rationale += f"; no evidence from {', '.join(bundle.missing_sources)} (source unavailable)"
 
     return {
         "classification": classification,
         "applied_rules": applied,
-        "rationale": f"Counts: {counts}",
+        "rationale": rationale,
+        "missing_sources": bundle.missing_sources,
+        "degraded": bundle.degraded,
     }
+
+
+def evidence_stats() -> Dict[str, Any]:
+    return {"singleflight": _evidence_flight.stats(), "swr": {**_swr_stats, "refreshing": len(_refreshing)}}
@@ -0,0 +1,50 @@
+"""Concurrent evaluation and bulk persistence of many variants for batch endpoints."""
+from typing import Any, Dict, List, Sequence, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from .acmg_engine import fetch_evidence_many, score_evidence
+from .hgvs_validate import normalize_hgvs
+from ..repository.variants import VariantRepository
+from ..repository.classification_events import ClassificationEventRepository
+from ..repository.evidence_blobs import EvidenceBlobRepository
+from ..core.replica import note_writes
+
+
+async def evaluate_variants(variants: Sequence[Tuple[str, str]], concurrency: int) -> List[Dict[str, Any] | Exception]:
+    """Evaluate `(hgvs, genome_build)` pairs with at most `concurrency` evidence fetches in flight.
+
+    Cached evidence for the whole batch is resolved up front in one batched read, so only
+    misses go upstream. Results come back in input order. A variant whose evidence cannot
+    be fetched yields the exception in its slot instead of failing the whole batch.
+    """
+    bundles = await fetch_evidence_many(list(variants), concurrency)
+    return [b if isinstance(b, Exception) else score_evidence(b) for b in bundles]
+
+
+async def persist_evaluations(session: AsyncSession, items: Sequence[Tuple[str, str, Dict[str, Any]]], user_id: int | None, commit: bool = True) -> List[int]:
+    """Upsert `(hgvs, genome_build, result)` triples in a single transaction.
+
+    Variants are deduplicated on (normalized hgvs, genome_build). A classification event is
+    appended only when the classification or evidence actually changed; resubmitting an
+    identical result just touches `last_seen_at`, and so does a degraded result (sources missing)
+    for a variant that is already stored. Evidence goes to the content-addressed blob
+    store once per distinct hash; rows only reference it. Returns the variant ids in input order.
+    """
+    hashes = await EvidenceBlobRepository(session).put_many(r["applied_rules"] for _, _, r in items)
+    results = await VariantRepository(session).upsert_many(
+        [
+            dict(hgvs=normalize_hgvs(h), genome_build=b, classification=r["classification"], evidence=None, evidence_hash=digest, created_by=user_id, degraded=r.get("degraded", False))
+            for (h, b, r), digest in zip(items, hashes)
+        ],
+        commit=False,
+    )
+    events: Dict[int, Dict[str, Any]] = {}
+    for res, (_, _, r), digest in zip(results, items, hashes):
+        if res.changed:
+            events[res.id] = dict(variant_id=res.id, user_id=user_id, classification=r["classification"], evidence=None, evidence_hash=digest)
+    await ClassificationEventRepository(session).add_events_many(list(events.values()), commit=False)
+    if commit:
+        await session.commit()
+    ids = [res.id for res in results]
+    # Noted even before the caller commits: pinning reads to the primary slightly early is harmless
+    note_writes(user_id, ids)
+    return ids
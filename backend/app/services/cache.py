@@ -1,29 +1,261 @@
 import os
-import json
-from typing import Optional, Any
+import math
+import random
+import time
+import uuid
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Optional, Any, Dict, Iterable, Tuple
+import msgpack
 import redis.asyncio as redis
 from loguru import logger
+from ..config import get_settings
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
 _client: redis.Redis | None = None
+# Loop-private client for eager Celery tasks; see mcp_client.task_client
+task_client: ContextVar[redis.Redis | None] = ContextVar("redis_task_client", default=None)
+
+def new_client() -> redis.Redis:
+    # Raw bytes: values are msgpack-encoded, not JSON text
+    return redis.from_url(REDIS_URL, decode_responses=False)
 
 def get_client() -> redis.Redis:
     global _client
+    local = task_client.get()
+    if local is not None:
+        return local
     if _client is None:
-        _client = redis.from_url(REDIS_URL, decode_responses=True)
+        _client = new_client()
     return _client
 
+def encode(value: Any) -> bytes:
+    return msgpack.packb(value, use_bin_type=True)
+
+def decode(raw: bytes) -> Any:
+    return msgpack.unpackb(raw, raw=False)
+
+
+class L1Cache:
+    """Bounded in-process LRU with per-entry expiry, sitting in front of Redis.
+
+    Capped by entry count and, when `max_bytes` is given, by the approximate encoded size
+    of the values. Cached values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: Optional[int] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()  # key -> (expires_at, size, value)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, _, value = entry
+        if expires_at <= time.monotonic():
+            self._drop(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: float, size: int = 0):
+        if self.max_entries <= 0 or ttl <= 0 or (self.max_bytes is not None and size > self.max_bytes):
+            return
+        self._drop(key)
+        self._data[key] = (time.monotonic() + ttl, size, value)
+        self.bytes += size
+        while len(self._data) > self.max_entries or (self.max_bytes is not None and self.bytes > self.max_bytes):
+            oldest = next(iter(self._data))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def delete(self, key: str):
+        self._drop(key)
+
+    def clear(self):
+        self._data.clear()
+        self.bytes = 0
+
+    def _drop(self, key: str):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[1]
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+def wrap_entry(value: Any, ttl: float, delta: float = 0.0) -> Dict[str, Any]:
+    """Envelope for stale-while-revalidate entries: value, write time, soft TTL, recompute cost."""
+    return {"v": value, "t": time.time(), "ttl": ttl, "d": delta}
+
+def is_entry(entry: Any) -> bool:
+    return isinstance(entry, dict) and "v" in entry and "t" in entry and "ttl" in entry
+
+def entry_is_stale(entry: Dict[str, Any], now: Optional[float] = None) -> bool:
+    return (now or time.time()) >= entry["t"] + entry["ttl"]
+
+def entry_needs_early_refresh(entry: Dict[str, Any], now: Optional[float] = None, beta: float = 1.0) -> bool:
+    """Probabilistic early expiration (XFetch): refresh chance rises as expiry approaches.
+
+    Scaled by the entry's recompute cost so slow fetches start refreshing earlier.
+    """
+    now = now or time.time()
+    delta = max(entry.get("d", 0.0), 0.001)
+    return now - delta * beta * math.log(1.0 - random.random()) >= entry["t"] + entry["ttl"]
+
+
+_l1: L1Cache | None = None
+
+def get_l1() -> L1Cache:
+    global _l1
+    if _l1 is None:
+        settings = get_settings()
+        _l1 = L1Cache(settings.cache_l1_max_entries, settings.cache_l1_max_bytes)
+    return _l1
+
 async def cache_get(key: str) -> Optional[Any]:
+    l1 = get_l1()
+    value = l1.get(key)
+    if value is not None:
+        return value
     try:
-        val = await get_client().get(key)
+        # GET and PTTL in one round trip so the L1 copy expires together with Redis
+        async with get_client().pipeline(transaction=False) as pipe:
+            val, pttl = await pipe.get(key).pttl(key).execute()
         if val:
-            return json.loads(val)
+            value = decode(val)
+            if pttl and pttl > 0:
+                l1.set(key, value, pttl / 1000, len(val))
+            return value
     except Exception as e:
         logger.warning(f"Cache get failed {key}: {e}")
     return None
 
 async def cache_set(key: str, value: Any, ttl: int = 300):
+    encoded = encode(value)
+    # L1 is written first so the process keeps serving hot keys while Redis is down
+    get_l1().set(key, value, ttl, len(encoded))
     try:
-        await get_client().set(key, json.dumps(value), ex=ttl)
+        await get_client().set(key, encoded, ex=ttl)
     except Exception as e:
         logger.warning(f"Cache set failed {key}: {e}")
+
+async def cache_get_many(keys: Iterable[str]) -> Dict[str, Any]:
+    """Look up many keys: L1 first, then one pipelined MGET + PTTL round trip for the rest.
+
+    Returns only the keys that were found.
+    """
+    l1 = get_l1()
+    found: Dict[str, Any] = {}
+    misses = []
+    for key in dict.fromkeys(keys):
+        value = l1.get(key)
+        if value is not None:
+            found[key] = value
+        else:
+            misses.append(key)
+    if not misses:
+        return found
+    try:
+        async with get_client().pipeline(transaction=False) as pipe:
+            pipe.mget(misses)
+            for key in misses:
+                pipe.pttl(key)
+            vals, *pttls = await pipe.execute()
+        for key, val, pttl in zip(misses, vals, pttls):
+            if val:
+                value = decode(val)
+                found[key] = value
+                if pttl and pttl > 0:
+                    l1.set(key, value, pttl / 1000, len(val))
+    except Exception as e:
+        logger.warning(f"Cache get_many failed ({len(misses)} keys): {e}")
+    return found
+
+async def cache_set_many(items: Dict[str, Any], ttl: int | Dict[str, int] = 300):
+    """Store many keys in one pipelined round trip; `ttl` is shared or given per key."""
+    if not items:
+        return
+    l1 = get_l1()
+    encoded = {}
+    for key, value in items.items():
+        encoded[key] = encode(value)
+        l1.set(key, value, ttl[key] if isinstance(ttl, dict) else ttl, len(encoded[key]))
+    try:
+        async with get_client().pipeline(transaction=False) as pipe:
+            for key, val in encoded.items():
+                pipe.set(key, val, ex=ttl[key] if isinstance(ttl, dict) else ttl)
+            await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Cache set_many failed ({len(items)} keys): {e}")
+
+_UNLOCK_SCRIPT = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) else return 0 end"
+
+async def cache_lock(key: str, ttl_ms: int) -> Optional[str]:
+    """Try to take a short cross-process lock; returns a release token, or None if another process holds it.
+
+    Fails open (returns a token) when Redis is unreachable, since there is nobody to coordinate with.
+    """
+    token = uuid.uuid4().hex
+    try:
+        if await get_client().set(f"lock:{key}", token, nx=True, px=ttl_ms):
+            return token
+        return None
+    except Exception as e:
+        logger.warning(f"Cache lock failed {key}: {e}")
+        return token
+
+async def cache_unlock(key: str, token: str):
+    try:
+        await get_client().eval(_UNLOCK_SCRIPT, 1, f"lock:{key}", token)
+    except Exception as e:
+        logger.warning(f"Cache unlock failed {key}: {e}")
+
+async def cache_lock_many(keys: Iterable[str], ttl_ms: int) -> Dict[str, Optional[str]]:
+    """`cache_lock` for many keys in one pipelined round trip; None marks keys another process holds."""
+    tokens = {key: uuid.uuid4().hex for key in keys}
+    if not tokens:
+        return {}
+    try:
+        async with get_client().pipeline(transaction=False) as pipe:
+            for key, token in tokens.items():
+                pipe.set(f"lock:{key}", token, nx=True, px=ttl_ms)
+            taken = await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Cache lock_many failed ({len(tokens)} keys): {e}")
+        return tokens
+    return {key: token if ok else None for (key, token), ok in zip(tokens.items(), taken)}
+
+async def cache_unlock_many(tokens: Dict[str, str]):
+    if not tokens:
+        return
+    try:
+        async with get_client().pipeline(transaction=False) as pipe:
+            for key, token in tokens.items():
+                pipe.eval(_UNLOCK_SCRIPT, 1, f"lock:{key}", token)
+            await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Cache unlock_many failed ({len(tokens)} keys): {e}")
+
+def cache_stats() -> Dict[str, Any]:
+    return {"l1": get_l1().stats()}
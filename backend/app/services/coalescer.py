@@ -0,0 +1,108 @@
+"""Micro-batching of concurrent per-variant MCP lookups into bulk calls."""
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Optional
+import asyncio
+from loguru import logger
+from ..config import get_settings
+from .mcp_client import get_mcp_client
+from .resilience import get_guard
+
+PostFn = Callable[[str, Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+class BulkCoalescer:
+    """Collects lookups for one MCP endpoint and sends them as a single `<path>/bulk` call.
+
+    A batch is flushed when `window` seconds have passed since its first key or when it
+    reaches `max_keys`, whichever comes first. Concurrent lookups of the same HGVS share
+    one slot in the batch. A failed bulk call fails every waiter with its error, matching
+    the per-variant `mcp_call` behaviour; keys absent from a successful response resolve to `{}`.
+
+    With `guarded`, each bulk call runs under the endpoint's EndpointGuard, so the breaker and
+    latency window count upstream requests, not waiters. Its deadline is the longest one
+    requested by the waiters in the batch.
+    """
+
+    def __init__(self, path: str, window: float = 0.005, max_keys: int = 100, post: Optional[PostFn] = None, guarded: bool = False):
+        self.path = path
+        self.window = window
+        self.max_keys = max_keys
+        self.guarded = guarded
+        self._post = post
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._deadline = 0.0
+        self._timer: asyncio.TimerHandle | None = None
+        self._inflight: set[asyncio.Task] = set()
+        self.bulk_calls = 0
+        self.keys_sent = 0
+
+    async def get(self, hgvs: str, deadline: float = 8.0) -> Dict[str, Any]:
+        self._deadline = max(self._deadline, deadline)
+        fut = self._pending.get(hgvs)
+        if fut is None:
+            loop = asyncio.get_running_loop()
+            fut = loop.create_future()
+            self._pending[hgvs] = fut
+            if len(self._pending) >= self.max_keys:
+                self._flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window, self._flush)
+        # Shielded so a caller hitting its own deadline does not cancel the shared result
+        return await asyncio.shield(fut)
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        deadline, self._deadline = self._deadline, 0.0
+        if not batch:
+            return
+        task = asyncio.get_running_loop().create_task(self._send(batch, deadline))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _send(self, batch: Dict[str, asyncio.Future], deadline: float):
+        self.bulk_calls += 1
+        self.keys_sent += len(batch)
+        post = self._post or get_mcp_client().post
+
+        def call():
+            return post(f"{self.path}/bulk", {"hgvs": list(batch)})
+
+        try:
+            data = await (get_guard(self.path).call(call, deadline) if self.guarded else call())
+            results = data.get("results", {}) if isinstance(data, dict) else {}
+        except Exception as e:
+            logger.warning(f"MCP bulk call failed {self.path} ({len(batch)} keys): {e}")
+            for fut in batch.values():
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for hgvs, fut in batch.items():
+            if not fut.done():
+                fut.set_result(results.get(hgvs) or {})
+
+    def stats(self) -> Dict[str, Any]:
+        return {"bulk_calls": self.bulk_calls, "keys_sent": self.keys_sent, "pending": len(self._pending)}
+
+
+_coalescers: Dict[str, BulkCoalescer] = {}
+# Loop-private coalescers for eager Celery tasks; see mcp_client.task_client
+task_coalescers: ContextVar[Dict[str, BulkCoalescer] | None] = ContextVar("task_coalescers", default=None)
+
+
+def get_coalescer(path: str) -> BulkCoalescer:
+    coalescers = task_coalescers.get()
+    if coalescers is None:
+        coalescers = _coalescers
+    coalescer = coalescers.get(path)
+    if coalescer is None:
+        settings = get_settings()
+        coalescer = BulkCoalescer(path, window=settings.mcp_coalesce_window_ms / 1000, max_keys=settings.mcp_coalesce_max_keys, guarded=True)
+        coalescers[path] = coalescer
+    return coalescer
+
+
+def coalescer_stats() -> Dict[str, Any]:
+    return {path: c.stats() for path, c in _coalescers.items()}
@@ -0,0 +1,100 @@
+"""ACMG combining rules compiled into a lookup table over clipped strength counts.
+
+The combining logic only ever compares each strength count against a small threshold,
+so counts above the largest threshold behave identically. Clipping every count to that
+cap leaves a few thousand distinct inputs; the classification for each is computed
+once at import with `combine_rules` and looked up afterwards.
+"""
+from enum import IntEnum
+from itertools import product
+from typing import Dict, Sequence
+
+
+class Strength(IntEnum):
+    """Evidence strength; the value is the column in count vectors and N x 7 batch arrays."""
+    VeryStrong = 0
+    Strong = 1
+    Moderate = 2
+    Supporting = 3
+    StandAloneBenign = 4
+    StrongBenign = 5
+    SupportingBenign = 6
+
+
+STRENGTHS = tuple(s.name for s in Strength)
+CLASSIFICATIONS = ("Benign", "Likely Benign", "Pathogenic", "Likely Pathogenic", "VUS")
+# Largest threshold each count is compared against in combine_rules
+CAPS = (1, 2, 3, 4, 1, 2, 2)
+
+
+def combine_rules(counts: Dict[str, int]) -> str:
+    """Reference implementation of the combining rules; the table is built from it."""
+    vs = counts.get("VeryStrong", 0)
+    s = counts.get("Strong", 0)
+    m = counts.get("Moderate", 0)
+    p = counts.get("Supporting", 0)
+    ba = counts.get("StandAloneBenign", 0)
+    bs = counts.get("StrongBenign", 0)
+    bp = counts.get("SupportingBenign", 0)
+
+    # Benign side first
+    if ba >= 1 or bs >= 2:
+        return "Benign"
+    if (bs >= 1 and bp >=1) or (bp >= 2):
+        return "Likely Benign"
+
+    # Pathogenic side (ClinGen refined combinations simplified)
+    if (vs >=1 and s >=1) or (vs >=1 and m >=2) or (vs >=1 and (m >=1 and p >=1)) or (s >=2 and m >=1) or (s >=1 and m >=3) or (vs >=1 and p >=2):
+        return "Pathogenic"
+    if (vs >=1 and m >=1) or (s >=1 and m >=1 and p >=2) or (s >=1 and p >=4) or (m >=3) or (m >=2 and p >=2) or (m >=1 and p >=4):
+        return "Likely Pathogenic"
+
+    return "VUS"
+
+
+def _strides() -> tuple[int, ...]:
+    strides = []
+    step = 1
+    for cap in reversed(CAPS):
+        strides.append(step)
+        step *= cap + 1
+    return tuple(reversed(strides))
+
+
+STRIDES = _strides()
+# Classification index for every clipped count vector, in row-major order over CAPS
+TABLE = bytes(
+    CLASSIFICATIONS.index(combine_rules(dict(zip(STRENGTHS, combo))))
+    for combo in product(*(range(cap + 1) for cap in CAPS))
+)
+
+
+# Per-axis offsets into TABLE for counts 0..cap
+_O_VS, _O_S, _O_M, _O_P, _O_BA, _O_BS, _O_BP = (tuple(c * stride for c in range(cap + 1)) for cap, stride in zip(CAPS, STRIDES))
+
+
+def classify_counts(counts: Sequence[int]) -> str:
+    """Classification for a count vector ordered as STRENGTHS.
+
+    Unrolled over the seven axes (clipping to CAPS inline); this runs once per variant.
+    """
+    vs, s, m, p, ba, bs, bp = counts
+    return CLASSIFICATIONS[TABLE[
+        _O_VS[vs if vs < 1 else 1] + _O_S[s if s < 2 else 2] + _O_M[m if m < 3 else 3] + _O_P[p if p < 4 else 4]
+        + _O_BA[ba if ba < 1 else 1] + _O_BS[bs if bs < 2 else 2] + _O_BP[bp if bp < 2 else 2]
+    ]]
+
+
+def classify_counts_array(counts):
+    """Vectorized classification of an N x 7 integer array (columns ordered as STRENGTHS).
+
+    Returns an N-element array of classification labels. Requires NumPy.
+    """
+    import numpy as np
+
+    counts = np.asarray(counts, dtype=np.int64)
+    if counts.ndim != 2 or counts.shape[1] != len(STRENGTHS):
+        raise ValueError(f"expected an N x {len(STRENGTHS)} counts array, got shape {counts.shape}")
+    idx = np.minimum(np.maximum(counts, 0), CAPS) @ np.asarray(STRIDES, dtype=np.int64)
+    codes = np.frombuffer(TABLE, dtype=np.uint8)[idx]
+    return np.asarray(CLASSIFICATIONS, dtype=object)[codes]
@@ -25,3 +25,8 @@ def validate_hgvs_cdna(hgvs: str) -> ParsedHGVS:
         )
     transcript, change = hgvs.split(":")
     return ParsedHGVS(transcript=transcript, change=change)
+
+
+def normalize_hgvs(hgvs: str) -> str:
+    """Canonical form used for cache, dedup and single-flight keys (whitespace removed)."""
+    return "".join(hgvs.split())
@@ -0,0 +1,127 @@
+"""Process-wide pooled HTTP client for the MCP server."""
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+import importlib.util
+import httpx
+from loguru import logger
+from ..config import get_settings
+
+
+class MCPClient:
+    """Keep-alive connection pool to the MCP server shared by all requests in the process.
+
+    Tracks how many requests went out and how many of them had to open a new
+    connection, so the pool limits can be sized from real reuse numbers.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 8.0,
+        max_connections: int = 100,
+        max_keepalive: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("MCP_HTTP2 requested but the 'h2' package is not installed; using HTTP/1.1")
+            http2 = False
+        self.base_url = base_url
+        self.http2 = http2
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.requests = 0
+        self.new_connections = 0
+        self.errors = 0
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            transport=transport,
+        )
+
+    async def _trace(self, event: str, info: Dict[str, Any]):
+        # httpcore emits connect_tcp only when the pool has no idle connection to reuse
+        if event == "connection.connect_tcp.started":
+            self.new_connections += 1
+
+    async def post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        self.requests += 1
+        try:
+            resp = await self._client.post(path, json=payload, extensions={"trace": self._trace})
+            resp.raise_for_status()
+            return resp.json()
+        except Exception:
+            self.errors += 1
+            raise
+
+    @property
+    def closed(self) -> bool:
+        return self._client.is_closed
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        reused = max(self.requests - self.new_connections - self.errors, 0)
+        return {
+            "base_url": self.base_url,
+            "http2": self.http2,
+            "max_connections": self.max_connections,
+            "max_keepalive": self.max_keepalive,
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": reused,
+            "errors": self.errors,
+            "reuse_ratio": round(reused / self.requests, 4) if self.requests else None,
+        }
+
+
+_client: MCPClient | None = None
+# Set for code running on another event loop (eager Celery tasks) so it never uses `_client`,
+# whose connections belong to the API loop
+task_client: ContextVar[MCPClient | None] = ContextVar("mcp_task_client", default=None)
+
+
+def build_client() -> MCPClient:
+    settings = get_settings()
+    return MCPClient(
+        base_url=settings.mcp_server_url,
+        timeout=settings.mcp_timeout,
+        max_connections=settings.mcp_max_connections,
+        max_keepalive=settings.mcp_max_keepalive,
+        keepalive_expiry=settings.mcp_keepalive_expiry,
+        http2=settings.mcp_http2,
+    )
+
+
+def get_mcp_client() -> MCPClient:
+    """Return the shared client, creating it lazily outside the app lifespan (scripts, tests)."""
+    global _client
+    local = task_client.get()
+    if local is not None:
+        return local
+    if _client is None or _client.closed:
+        _client = build_client()
+    return _client
+
+
+async def init_mcp_client() -> MCPClient:
+    return get_mcp_client()
+
+
+async def close_mcp_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def mcp_client_stats() -> Dict[str, Any]:
+    return _client.stats() if _client is not None else {"requests": 0}
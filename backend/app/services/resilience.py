@@ -0,0 +1,171 @@
+"""Per-endpoint failure isolation for MCP calls: circuit breaking, adaptive timeouts, hedging."""
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+import asyncio
+import time
+from ..config import get_settings
+from ..core.metrics import LatencyTracker
+
+T = TypeVar("T")
+
+
+class CircuitOpen(RuntimeError):
+    """Raised instead of calling an endpoint whose breaker is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed -> open -> half-open -> closed.
+
+    After `failure_threshold` consecutive failures the breaker opens and calls fail fast
+    for `reset_timeout` seconds. It then lets a single probe through; the probe's outcome
+    closes the breaker or re-opens it for another `reset_timeout`.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+        self.opens = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self._probing:
+            self._probing = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            if self.opened_at is None or self._probing:
+                self.opens += 1
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+    def record_cancelled(self):
+        """A call was cancelled before its outcome was known: free the probe slot, count nothing."""
+        self._probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {"state": self.state, "consecutive_failures": self.failures, "opens": self.opens, "rejected": self.rejected}
+
+
+class EndpointGuard:
+    """Breaker plus latency window for one MCP endpoint."""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.latency = LatencyTracker()
+        self.timeouts = 0
+        self.hedges = 0
+
+    def timeout(self, deadline: float) -> float:
+        """Adaptive per-call timeout: a multiple of the observed tail latency, within [min, deadline]."""
+        settings = get_settings()
+        if not settings.mcp_adaptive_timeout:
+            return deadline
+        tail = self.latency.percentile(settings.mcp_timeout_percentile)
+        if tail is None:
+            return deadline
+        return min(deadline, max(settings.mcp_timeout_min, tail * settings.mcp_timeout_multiplier))
+
+    def hedge_delay(self) -> Optional[float]:
+        settings = get_settings()
+        if not settings.mcp_hedge:
+            return None
+        return self.latency.percentile(settings.mcp_hedge_percentile)
+
+    async def call(self, fn: Callable[[], Awaitable[T]], deadline: float) -> T:
+        """Run `fn` under the breaker, the adaptive timeout and (when enabled) hedging.
+
+        Raises CircuitOpen without calling `fn` while the breaker is open; timeouts and
+        errors count as failures. A cancelled call counts as neither, but releases the
+        half-open probe so the next call can probe instead.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpen("circuit open")
+        started = time.monotonic()
+        try:
+            delay = self.hedge_delay()
+            call = hedged(fn, delay, self._hedged) if delay is not None else fn()
+            result = await asyncio.wait_for(call, timeout=self.timeout(deadline))
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self.breaker.record_failure()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            self.breaker.record_cancelled()
+            raise
+        self.latency.observe(time.monotonic() - started)
+        self.breaker.record_success()
+        return result
+
+    def _hedged(self):
+        self.hedges += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.breaker.stats(), "latency": self.latency.stats(), "timeouts": self.timeouts, "hedges": self.hedges}
+
+
+async def hedged(fn: Callable[[], Awaitable[T]], delay: float, on_hedge: Optional[Callable[[], None]] = None) -> T:
+    """Start `fn`; if it has not finished after `delay` seconds start a second copy and
+    return whichever succeeds first, cancelling the other.
+
+    Errors do not trigger a hedge; the call fails only when every started attempt failed.
+    """
+    tasks = {asyncio.ensure_future(fn())}
+    hedge_started = False
+    error: Optional[BaseException] = None
+    try:
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, timeout=None if hedge_started else delay, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+            if not done and not hedge_started:
+                hedge_started = True
+                if on_hedge:
+                    on_hedge()
+                tasks.add(asyncio.ensure_future(fn()))
+        raise error  # type: ignore[misc]
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+_guards: Dict[str, EndpointGuard] = {}
+
+
+def get_guard(path: str) -> EndpointGuard:
+    guard = _guards.get(path)
+    if guard is None:
+        settings = get_settings()
+        guard = EndpointGuard(settings.mcp_breaker_failures, settings.mcp_breaker_reset)
+        _guards[path] = guard
+    return guard
+
+
+def guard_stats() -> Dict[str, Any]:
+    return {path: g.stats() for path, g in _guards.items()}
@@ -0,0 +1,177 @@
+"""ACMG rule registry evaluated over a pure, already-fetched variant context.
+
+Rules are plain functions `(VariantContext) -> Evidence | None` registered with
+`@rule`; they do no I/O, so cached contexts can be re-evaluated without touching MCP.
+Registration order is the order evidence is reported in.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import sys
+from pydantic import BaseModel
+from .combining import STRENGTHS, Strength
+
+
+class EvidenceItem(BaseModel):
+    code: str
+    strength: str  # e.g., VeryStrong, Strong, Moderate, Supporting, StandAlone, Strong-Benign, Supporting-Benign
+    satisfied: bool
+    rationale: str
+    sources: list[str] = []
+
+
+# Mapping ACMG rule codes to categorical strengths (pathogenic or benign side)
+RULE_STRENGTH_MAP: Dict[str, str] = {
+    # Pathogenic side (subset for prototype)
+    "PVS1": "VeryStrong",
+    "PS1": "Strong",
+    "PS2": "Strong",
+    "PS3": "Strong",
+    "PS4": "Strong",
+    "PM1": "Moderate",
+    "PM2": "Moderate",
+    "PM5": "Moderate",
+    "PP3": "Supporting",
+    "PP5": "Supporting",
+    # Benign side
+    "BA1": "StandAloneBenign",
+    "BS1": "StrongBenign",
+    "BS2": "StrongBenign",
+    "BP4": "SupportingBenign",
+    "BP7": "SupportingBenign",
+}
+# Interned code -> Strength, derived from RULE_STRENGTH_MAP
+CODE_STRENGTH: Dict[str, Strength] = {sys.intern(code): Strength[name] for code, name in RULE_STRENGTH_MAP.items()}
+_CODES: Dict[str, str] = {code: code for code in CODE_STRENGTH}
+
+
+class Evidence:
+    """Satisfied evidence inside the engine; becomes a dict (`to_dict`) only at the API edge.
+
+    Slotted, with the code interned and the strength taken from RULE_STRENGTH_MAP. Instances
+    are immutable by convention, so rules share constant ones.
+    """
+    __slots__ = ("code", "strength", "rationale", "sources")
+    satisfied = True
+
+    def __init__(self, code: str, rationale: str, sources: Tuple[str, ...] = ()):
+        self.code = _CODES[code]
+        self.strength = CODE_STRENGTH[self.code]
+        self.rationale = rationale
+        self.sources = sources
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"code": self.code, "strength": STRENGTHS[self.strength], "satisfied": True, "rationale": self.rationale, "sources": list(self.sources)}
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Evidence):
+            return NotImplemented
+        return (self.code, self.rationale, self.sources) == (other.code, other.rationale, other.sources)
+
+    def __repr__(self) -> str:
+        return f"Evidence({self.code!r}, {self.rationale!r}, {self.sources!r})"
+
+
+@dataclass(slots=True)
+class VariantContext:
+    """Everything the rules may look at for one variant: normalized HGVS plus raw source payloads."""
+    hgvs: str
+    genome_build: str = "GRCh38"
+    clinvar: Dict[str, Any] = field(default_factory=dict)
+    gnomad: Dict[str, Any] = field(default_factory=dict)
+    predictions: Dict[str, Any] = field(default_factory=dict)
+
+
+Rule = Callable[[VariantContext], Optional[Evidence]]
+RULES: List[Rule] = []
+
+
+def rule(fn: Rule) -> Rule:
+    RULES.append(fn)
+    return fn
+
+
+def evaluate(ctx: VariantContext) -> List[Evidence]:
+    return evaluate_many([ctx])[0]
+
+
+def evaluate_many(contexts: Sequence[VariantContext], rules: Optional[Sequence[Rule]] = None) -> List[List[Evidence]]:
+    """Evidence per context, in input order; each rule is run across the whole batch in turn."""
+    results: List[List[Evidence]] = [[] for _ in contexts]
+    for fn in rules if rules is not None else RULES:
+        for evidence, ctx in zip(results, contexts):
+            item = fn(ctx)
+            if item is not None:
+                evidence.append(item)
+    return results
+
+
+_HEURISTIC = ("heuristic",)
+_CLINVAR = ("mcp:clinvar",)
+_GNOMAD = ("mcp:gnomad",)
+_PREDICTIONS = ("mcp:predictions",)
+_PM1 = Evidence("PM1", "Hotspot region heuristic", _HEURISTIC)
+_BP7 = Evidence("BP7", "Synonymous with no predicted splice impact (heuristic)", _HEURISTIC)
+_PVS1 = Evidence("PVS1", "Predicted null variant in gene with established LoF mechanism (heuristic)", _HEURISTIC)
+_BP4_CLINVAR = Evidence("BP4", "ClinVar benign", _CLINVAR)
+
+
+@rule
+def pm1_hotspot(ctx: VariantContext) -> Optional[Evidence]:
+    # PM1 (hotspot) heuristic: if variant has certain pattern (e.g., :c.123A>G) just a placeholder
+    if ":c." in ctx.hgvs and ctx.hgvs.endswith(">A"):
+        return _PM1
+    return None
+
+
+@rule
+def bp7_synonymous(ctx: VariantContext) -> Optional[Evidence]:
+    # BP7 (synonymous with no predicted splice impact) heuristic
+    if "syn" in ctx.hgvs:
+        return _BP7
+    return None
+
+
+@rule
+def pvs1_null_variant(ctx: VariantContext) -> Optional[Evidence]:
+    # Loss-of-function heuristic
+    if any(token in ctx.hgvs for token in ["del", "dup", "fs", "*", "stop"]):
+        return _PVS1
+    return None
+
+
+@rule
+def clinvar_significance(ctx: VariantContext) -> Optional[Evidence]:
+    # ClinVar significance translation (simplified)
+    sig = ctx.clinvar.get("clinical_significance") if isinstance(ctx.clinvar, dict) else None
+    if sig and "Pathogenic" in sig:
+        return Evidence("PP5", f"ClinVar significance {sig}", _CLINVAR)
+    if sig and sig == "Benign":
+        return _BP4_CLINVAR
+    return None
+
+
+@rule
+def population_frequency(ctx: VariantContext) -> Optional[Evidence]:
+    # Population frequency for BS1 / BA1 simplistic thresholds
+    af = ctx.gnomad.get("allele_frequency") if isinstance(ctx.gnomad, dict) else None
+    if af is None:
+        return None
+    if af > 0.01:
+        return Evidence("BA1", f"High AF {af}", _GNOMAD)
+    if af > 0.001:
+        return Evidence("BS1", f"AF {af} exceeds BS1 threshold", _GNOMAD)
+    return None
+
+
+@rule
+def in_silico_predictions(ctx: VariantContext) -> Optional[Evidence]:
+    preds = ctx.predictions
+    if not preds:
+        return None
+    deleterious = preds.get("deleterious_tools", 0)
+    total = preds.get("total_tools", 0) or 1
+    if deleterious / total >= 0.6 and deleterious >= 3:
+        return Evidence("PP3", f"{deleterious}/{total} deleterious tools", _PREDICTIONS)
+    if deleterious <= 1:
+        return Evidence("BP4", f"Low deleterious consensus {deleterious}/{total}", _PREDICTIONS)
+    return None
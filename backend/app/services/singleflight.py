@@ -0,0 +1,33 @@
+"""Collapse concurrent identical lookups into one in-flight call."""
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+import asyncio
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Per-key deduplication of concurrent async calls within one process.
+
+    The first caller for a key starts `fn` as a task; callers arriving while it runs
+    await the same task. The task is shielded, so a caller that gives up (deadline,
+    client disconnect) does not cancel the shared call for the others.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._inflight.pop(k) if self._inflight.get(k) is t else None)
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"calls": self.calls, "shared": self.shared, "in_flight": len(self._inflight)}
@@ -0,0 +1,139 @@
+"""Incremental CSV / minimal VCF parsing for variant imports.
+
+Parsers consume an async iterator of text lines and yield one `ImportRecord` per
+variant, so an upload is never held in memory as a whole.
+"""
+from typing import AsyncIterator, List, NamedTuple, Optional
+import codecs
+import csv
+import re
+from fastapi import UploadFile
+
+
+class ImportRecord(NamedTuple):
+    position: int  # 0-based index of the variant within the file
+    hgvs: str
+    genome_build: str
+    error: Optional[str] = None  # set when the line could not be parsed
+
+
+async def iter_upload_lines(upload: UploadFile, block_size: int = 64 * 1024) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buf = ""
+    while chunk := await upload.read(block_size):
+        buf += decoder.decode(chunk)
+        *lines, buf = buf.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buf += decoder.decode(b"", final=True)
+    if buf:
+        yield buf.rstrip("\r")
+
+
+async def parse_csv(lines: AsyncIterator[str], default_build: str) -> AsyncIterator[ImportRecord]:
+    """CSV with an optional header; columns `hgvs` and optional `genome_build`.
+
+    Without a header the first column is the HGVS string.
+    """
+    hgvs_col, build_col = 0, None
+    first = True
+    position = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        row = next(csv.reader([line]))
+        if first:
+            first = False
+            header = [c.strip().lower() for c in row]
+            if "hgvs" in header:
+                hgvs_col = header.index("hgvs")
+                build_col = header.index("genome_build") if "genome_build" in header else None
+                continue
+        hgvs = row[hgvs_col].strip() if len(row) > hgvs_col else ""
+        build = row[build_col].strip() if build_col is not None and len(row) > build_col and row[build_col].strip() else default_build
+        yield ImportRecord(position, hgvs, build, None if hgvs else "missing hgvs")
+        position += 1
+
+
+def _build_from_reference(value: str) -> Optional[str]:
+    value = value.lower()
+    if "38" in value:
+        return "GRCh38"
+    if "37" in value or "19" in value:
+        return "GRCh37"
+    return None
+
+
+_BASE = re.compile(r"[ACGT]")
+
+
+def _substitution_error(pos: str, ref: str, alt: str) -> Optional[str]:
+    """Why `CHROM:g.POSREF>ALT` cannot be built from this record, or None when it can."""
+    if not pos.isdigit() or int(pos) < 1:
+        return f"invalid POS {pos!r}"
+    if "," in alt:
+        return "multi-allelic ALT; split the record (e.g. bcftools norm -m-) or add an HGVS INFO entry"
+    if alt.startswith("<") or alt in ("*", ".") or "[" in alt or "]" in alt:
+        return f"symbolic ALT allele {alt!r} is not supported"
+    if not _BASE.fullmatch(ref) or not _BASE.fullmatch(alt):
+        return f"REF/ALT {ref!r}/{alt!r} is not a single-base substitution; add an HGVS INFO entry"
+    if ref == alt:
+        return "ALT equals REF"
+    return None
+
+
+async def parse_vcf(lines: AsyncIterator[str], default_build: str) -> AsyncIterator[ImportRecord]:
+    """Minimal VCF: one record per data line, or per value of its `HGVS=` INFO entry.
+
+    Uses the `HGVS=` INFO entry when present, otherwise a genomic description
+    `CHROM:g.POSREF>ALT`, which only exists for a single biallelic base substitution;
+    any other record is reported as an error line. The build comes from `##reference=`
+    when it names one.
+    """
+    build = default_build
+    position = 0
+    async for line in lines:
+        if line.startswith("##"):
+            if line.lower().startswith("##reference="):
+                build = _build_from_reference(line.split("=", 1)[1]) or build
+            continue
+        if line.startswith("#") or not line.strip():
+            continue
+        cols = line.split("\t")
+        if len(cols) < 5:
+            yield ImportRecord(position, line.strip(), build, "malformed VCF record")
+            position += 1
+            continue
+        chrom, pos, _id, ref, alts = cols[:5]
+        info = dict(kv.split("=", 1) for kv in cols[7].split(";") if "=" in kv) if len(cols) > 7 else {}
+        if "HGVS" in info:
+            for hgvs in info["HGVS"].split(","):
+                yield ImportRecord(position, hgvs, build)
+                position += 1
+            continue
+        ref, alts = ref.upper(), alts.upper()
+        yield ImportRecord(position, f"{chrom}:g.{pos}{ref}>{alts}", build, _substitution_error(pos, ref, alts))
+        position += 1
+
+
+def detect_format(filename: Optional[str], declared: Optional[str]) -> str:
+    if declared:
+        return declared.lower()
+    name = (filename or "").lower()
+    return "vcf" if name.endswith(".vcf") else "csv"
+
+
+def parse_upload(upload: UploadFile, fmt: str, default_build: str) -> AsyncIterator[ImportRecord]:
+    parser = parse_vcf if fmt == "vcf" else parse_csv
+    return parser(iter_upload_lines(upload), default_build)
+
+
+async def iter_chunks(records: AsyncIterator[ImportRecord], size: int) -> AsyncIterator[List[ImportRecord]]:
+    chunk: List[ImportRecord] = []
+    async for rec in records:
+        chunk.append(rec)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,159 @@
+"""Group commit for single-variant classifications.
+
+Concurrent `/variants/classify` requests hand their evaluated result to a shared queue
+instead of each running its own transaction. A background flush persists everything
+queued in one transaction and one commit, then resolves every request with its variant
+id. Ids are only handed out after that commit, so a response never carries an id that
+is not durable.
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..config import get_settings
+from ..core.db import AsyncSessionLocal
+from .batch import persist_evaluations
+
+Item = Tuple[Tuple[str, str, Dict[str, Any]], Optional[int], asyncio.Future]
+
+
+class WriteBehindQueue:
+    """Collects evaluated results and persists them in group commits.
+
+    A group is flushed `window` seconds after its first row or once it holds `max_rows`,
+    whichever comes first. Groups are written one at a time, so rows arriving during a
+    commit form the next group. If a group fails, its rows are retried one transaction each
+    so a single bad row fails only its own request. Callers should check `accepting()`
+    and persist synchronously when it is False (queue full or shutting down).
+    """
+
+    def __init__(self, session_factory: Callable[[], AsyncSession], window: float = 0.005, max_rows: int = 100, max_pending: int = 5000):
+        self.session_factory = session_factory
+        self.window = window
+        self.max_rows = max_rows
+        self.max_pending = max_pending
+        self._pending: List[Item] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._inflight: set[asyncio.Task] = set()
+        self._write_lock = asyncio.Lock()
+        self.outstanding = 0  # submitted rows not yet committed (queued or being written)
+        self.closed = False
+        self.commits = 0
+        self.rows = 0
+        self.largest_group = 0
+        self.group_failures = 0
+
+    def accepting(self) -> bool:
+        return not self.closed and self.outstanding < self.max_pending
+
+    async def submit(self, hgvs: str, genome_build: str, result: Dict[str, Any], user_id: int | None) -> int:
+        """Queue one result; returns its variant id once the group holding it has committed."""
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._pending.append(((hgvs, genome_build, result), user_id, fut))
+        self.outstanding += 1
+        if len(self._pending) >= self.max_rows:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        # Shielded so a disconnecting client does not cancel the write for the whole group
+        return await asyncio.shield(fut)
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        group, self._pending = self._pending, []
+        if not group:
+            return
+        task = asyncio.get_running_loop().create_task(self._write(group))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _write(self, group: List[Item]):
+        async with self._write_lock:
+            try:
+                ids = await self._commit(group)
+            except Exception as e:
+                self.group_failures += 1
+                logger.warning(f"Group commit of {len(group)} classifications failed, retrying individually: {e}")
+                for entry in group:
+                    try:
+                        ids = await self._commit([entry])
+                    except Exception as item_error:
+                        self._resolve(entry, error=item_error)
+                    else:
+                        self._resolve(entry, ids[0])
+                return
+            for entry, variant_id in zip(group, ids):
+                self._resolve(entry, variant_id)
+
+    async def _commit(self, group: List[Item]) -> List[int]:
+        by_user: Dict[Optional[int], List[int]] = {}
+        for i, (_, user_id, _) in enumerate(group):
+            by_user.setdefault(user_id, []).append(i)
+        ids: List[int] = [0] * len(group)
+        async with self.session_factory() as session:
+            for user_id, positions in by_user.items():
+                persisted = await persist_evaluations(session, [group[i][0] for i in positions], user_id, commit=False)
+                for i, variant_id in zip(positions, persisted):
+                    ids[i] = variant_id
+            await session.commit()
+        self.commits += 1
+        self.rows += len(group)
+        self.largest_group = max(self.largest_group, len(group))
+        return ids
+
+    def _resolve(self, entry: Item, variant_id: int | None = None, error: BaseException | None = None):
+        self.outstanding -= 1
+        fut = entry[2]
+        if fut.done():
+            return
+        if error is not None:
+            fut.set_exception(error)
+        else:
+            fut.set_result(variant_id)
+
+    async def close(self):
+        """Stop accepting rows and wait until everything queued has been committed."""
+        self.closed = True
+        self._flush()
+        while self._inflight:
+            await asyncio.gather(*list(self._inflight), return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": True,
+            "queued": len(self._pending),
+            "outstanding": self.outstanding,
+            "commits": self.commits,
+            "rows": self.rows,
+            "rows_per_commit": round(self.rows / self.commits, 2) if self.commits else None,
+            "largest_group": self.largest_group,
+            "group_failures": self.group_failures,
+        }
+
+
+_queue: WriteBehindQueue | None = None
+
+
+def get_write_behind() -> Optional[WriteBehindQueue]:
+    """FastAPI dependency: the shared queue, or None when WRITE_BEHIND is off."""
+    global _queue
+    settings = get_settings()
+    if not settings.write_behind:
+        return None
+    if _queue is None:
+        _queue = WriteBehindQueue(AsyncSessionLocal, window=settings.write_behind_window_ms / 1000, max_rows=settings.write_behind_max_rows, max_pending=settings.write_behind_max_pending)
+    return _queue
+
+
+async def close_write_behind():
+    global _queue
+    if _queue is not None:
+        await _queue.close()
+        _queue = None
+
+
+def write_behind_stats() -> Dict[str, Any]:
+    return _queue.stats() if _queue is not None else {"enabled": False}
@@ -0,0 +1,38 @@
+"""Combining-rule throughput: boolean chain vs lookup table vs NumPy batch.
+
+    python benchmarks/bench_combine.py [n_rows]
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.combining import STRENGTHS, classify_counts, classify_counts_array, combine_rules  # noqa: E402
+
+
+def _timed(label: str, n: int, fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<14} {elapsed * 1000:8.1f} ms ({n / elapsed:,.0f} rows/s)")
+
+
+def main(n: int):
+    rng = random.Random(0)
+    rows = [[rng.choice((0, 0, 0, 1, 1, 2, 3)) for _ in STRENGTHS] for _ in range(n)]
+    print(f"{n} count vectors")
+    _timed("boolean chain", n, lambda: [combine_rules(dict(zip(STRENGTHS, r))) for r in rows])
+    _timed("lookup table", n, lambda: [classify_counts(r) for r in rows])
+    try:
+        import numpy as np
+    except ImportError:
+        print("  numpy batch    skipped (numpy not installed)")
+        return
+    arr = np.array(rows)
+    _timed("numpy batch", n, lambda: classify_counts_array(arr))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,66 @@
+"""evaluate_variant on cached inputs: CPU time and allocations per classification.
+
+    python benchmarks/bench_evaluate.py [n_variants]
+
+Payloads are pre-loaded into the in-process L1 cache, so no Redis or MCP call is made
+and the numbers cover key building, cache lookup, rule evaluation and scoring.
+"""
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ["DETERMINISTIC_TESTS"] = "0"
+os.environ.setdefault("CACHE_L1_MAX_ENTRIES", "1000000")  # every payload must stay in L1
+
+from app.services import acmg_engine  # noqa: E402
+from app.services.cache import get_l1, wrap_entry  # noqa: E402
+
+
+def preload(n: int) -> list[str]:
+    l1 = get_l1()
+    policy = acmg_engine.source_cache_policy()
+    variants = [f"NM_000000.0:c.{i}{'del' if i % 3 == 0 else 'G>A'}" for i in range(n)]
+    payloads = {
+        "clinvar": {"clinical_significance": "Pathogenic"},
+        "gnomad": {"allele_frequency": 0.002},
+        "predictions": {"deleterious_tools": 4, "total_tools": 5},
+    }
+    for hgvs in variants:
+        for src, (version, ttl) in policy.items():
+            l1.set(acmg_engine.payload_key(src, hgvs, "GRCh38", version), wrap_entry(payloads[src], ttl), ttl, 64)
+    return variants
+
+
+async def run(variants: list[str]):
+    for hgvs in variants:
+        await acmg_engine.evaluate_variant(hgvs, "GRCh38")
+
+
+async def run_batch(variants: list[str]) -> list:
+    bundles = await acmg_engine.fetch_evidence_many([(h, "GRCh38") for h in variants], concurrency=16)
+    return [acmg_engine.score_evidence(b) for b in bundles]
+
+
+def main(n: int):
+    variants = preload(n)
+    asyncio.run(run(variants[:100]))  # warm-up
+    start = time.perf_counter()
+    asyncio.run(run(variants))
+    elapsed = time.perf_counter() - start
+    batch = variants[:1000]
+    tracemalloc.start()
+    results = asyncio.run(run_batch(batch))
+    _, peak = tracemalloc.get_traced_memory()
+    blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    tracemalloc.stop()
+    print(f"{n} cached variants")
+    print(f"  evaluate_variant: {elapsed / n * 1e6:.1f} us/variant")
+    print(f"  batch of {len(results)}: peak {peak / len(results):.0f} B and {blocks / len(results):.1f} live blocks per classification")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,47 @@
+"""Micro-benchmark for the rule registry on synthetic, already-fetched contexts.
+
+    python benchmarks/bench_rules.py [n_variants]
+
+No Redis, MCP or database is touched: this measures pure rule evaluation and scoring.
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.acmg_engine import EvidenceBundle, score_evidence  # noqa: E402
+from app.services.rules import RULES, VariantContext, evaluate_many  # noqa: E402
+
+
+def synthetic_contexts(n: int) -> list[VariantContext]:
+    significances = [None, "Pathogenic", "Likely pathogenic", "Benign"]
+    frequencies = [0.00001, 0.0002, 0.002, 0.02]
+    suffixes = ["A>G", "G>A", "del", "dupT", "C>T"]
+    return [
+        VariantContext(
+            f"NM_000000.0:c.{i}{suffixes[i % len(suffixes)]}",
+            clinvar={"clinical_significance": significances[i % 4]},
+            gnomad={"allele_frequency": frequencies[(i // 4) % 4]},
+            predictions={"deleterious_tools": i % 6, "total_tools": 5},
+        )
+        for i in range(n)
+    ]
+
+
+def main(n: int):
+    contexts = synthetic_contexts(n)
+    start = time.perf_counter()
+    evidence = evaluate_many(contexts)
+    rules_s = time.perf_counter() - start
+    start = time.perf_counter()
+    for items in evidence:
+        score_evidence(EvidenceBundle(evidence=items))
+    score_s = time.perf_counter() - start
+    print(f"{n} variants, {len(RULES)} rules")
+    print(f"  evaluate_many: {rules_s * 1000:.1f} ms ({n / rules_s:,.0f} variants/s)")
+    print(f"  score:         {score_s * 1000:.1f} ms ({n / score_s:,.0f} variants/s)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,89 @@
+import asyncio
+import pytest
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from app.main import app
+from app.core.db import get_session
+from app.core import replica, security
+from app.core.security import get_current_user
+from app.models.base import Base
+from app.models import user, variant, classification_event, batch_job, evidence_blob  # noqa: F401
+from app.config import Settings
+from app.services import acmg_engine, resilience
+
+
+@pytest.fixture(autouse=True)
+def fresh_endpoint_guards(monkeypatch):
+    """Breaker and latency state is process-wide; start every test from closed breakers."""
+    monkeypatch.setattr(resilience, "_guards", {})
+
+
+@pytest.fixture(autouse=True)
+def fresh_principal_cache(monkeypatch):
+    monkeypatch.setattr(security, "_principals", None)
+
+
+@pytest.fixture(autouse=True)
+def fresh_recent_writes(monkeypatch):
+    monkeypatch.setattr(replica, "_recent", None)
+
+
+@pytest.fixture
+def fake_mcp(monkeypatch):
+    """Returns `patch(delays, **settings)`: serve canned MCP payloads after a per-path delay, with
+    the cache and cross-process lock stubbed out and the engine using Settings(**settings)."""
+    def patch(delays, **settings):
+        async def fake_mcp_call(path, payload):
+            await asyncio.sleep(delays[path])
+            return {"/clinvar": {"clinical_significance": "Pathogenic"}, "/gnomad": {"allele_frequency": 0.00001}, "/predictions": {"deleterious_tools": 4, "total_tools": 5}}[path]
+
+        async def empty_cache(*args, **kwargs):
+            return {}
+
+        async def lock(key, ttl_ms):
+            return "token"
+
+        async def lock_many(keys, ttl_ms):
+            return {k: "token" for k in keys}
+
+        monkeypatch.setenv("DETERMINISTIC_TESTS", "0")
+        monkeypatch.setattr(acmg_engine, "mcp_call", fake_mcp_call)
+        monkeypatch.setattr(acmg_engine, "cache_get_many", empty_cache)
+        monkeypatch.setattr(acmg_engine, "cache_set_many", empty_cache)
+        monkeypatch.setattr(acmg_engine, "cache_lock", lock)
+        monkeypatch.setattr(acmg_engine, "cache_unlock", empty_cache)
+        monkeypatch.setattr(acmg_engine, "cache_lock_many", lock_many)
+        monkeypatch.setattr(acmg_engine, "cache_unlock_many", empty_cache)
+        settings.setdefault("mcp_coalesce", False)
+        monkeypatch.setattr(acmg_engine, "get_settings", lambda: Settings(**settings))
+
+    return patch
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    """Session factory bound to a throwaway SQLite file with the full schema."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+async def api_client(session_factory):
+    """API client on the test database, authenticated as a freshly created user."""
+    async with session_factory() as session:
+        u = user.User(email="tester@example.org", hashed_password="x")
+        session.add(u)
+        await session.commit()
+
+    async def _session():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = _session
+    app.dependency_overrides[get_current_user] = lambda: u
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+    app.dependency_overrides.clear()
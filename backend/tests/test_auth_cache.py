@@ -0,0 +1,79 @@
+import pytest
+from httpx import AsyncClient, ASGITransport
+from app.main import app
+from app.core import security
+from app.core.db import get_session
+from app.core.security import create_access_token, invalidate_principal, principal_cache_stats
+from app.models.user import User
+from app.repository.users import UserRepository
+
+
+@pytest.fixture
+async def auth_client(session_factory, monkeypatch):
+    """Client that goes through the real bearer-token dependency; counts user lookups."""
+    lookups = []
+    original = UserRepository.get_by_email
+
+    async def counted(self, email):
+        lookups.append(email)
+        return await original(self, email)
+
+    monkeypatch.setattr(UserRepository, "get_by_email", counted)
+
+    async def _session():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = _session
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        ac.lookups = lookups
+        yield ac
+    app.dependency_overrides.clear()
+
+
+async def _make_user(session_factory, email="auth@example.org"):
+    async with session_factory() as session:
+        u = User(email=email, hashed_password="x")
+        session.add(u)
+        await session.commit()
+        return u
+
+
+@pytest.mark.asyncio
+async def test_warm_requests_skip_user_lookup(session_factory, auth_client):
+    u = await _make_user(session_factory)
+    headers = {"Authorization": f"Bearer {create_access_token(u.email, version=u.token_version)}"}
+    for _ in range(3):
+        resp = await auth_client.get("/jobs/does-not-exist", headers=headers)
+        assert resp.status_code == 404
+    assert auth_client.lookups == [u.email]
+    stats = principal_cache_stats()
+    assert stats["hits"] == 2 and stats["misses"] == 1
+
+    invalidate_principal(u.email)
+    assert (await auth_client.get("/jobs/does-not-exist", headers=headers)).status_code == 404
+    assert len(auth_client.lookups) == 2
+
+
+@pytest.mark.asyncio
+async def test_token_version_bump_revokes_cached_tokens(session_factory, auth_client):
+    u = await _make_user(session_factory)
+    old = {"Authorization": f"Bearer {create_access_token(u.email, version=u.token_version)}"}
+    assert (await auth_client.get("/jobs/does-not-exist", headers=old)).status_code == 404
+
+    async with session_factory() as session:
+        user = await session.get(User, u.id)
+        version = await UserRepository(session).bump_token_version(user)
+    assert version == 1
+    # The bump drops the cached principal, so the old token reloads the user and is refused
+    assert security.get_principal_cache().get(u.email) is None
+    assert (await auth_client.get("/jobs/does-not-exist", headers=old)).status_code == 401
+    new = {"Authorization": f"Bearer {create_access_token(u.email, version=version)}"}
+    assert (await auth_client.get("/jobs/does-not-exist", headers=new)).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_unknown_subject_is_rejected_and_not_cached(auth_client):
+    headers = {"Authorization": f"Bearer {create_access_token('ghost@example.org')}"}
+    assert (await auth_client.get("/jobs/does-not-exist", headers=headers)).status_code == 401
+    assert principal_cache_stats()["entries"] == 0
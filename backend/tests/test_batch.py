@@ -0,0 +1,112 @@
+import asyncio
+import time
+import pytest
+from app.config import Settings
+from app.services import acmg_engine, batch, coalescer
+from app.services.coalescer import BulkCoalescer
+from app.services.acmg_engine import EvidenceBundle
+from app.services.cache import wrap_entry
+
+
+@pytest.mark.asyncio
+async def test_fetch_evidence_many_bounded_ordered_and_batched(monkeypatch):
+    in_flight = 0
+    peak = 0
+    reads, writes, locks, unlocks = [], [], [], []
+
+    async def fake_load(hgvs, genome_build, sources, cache_keys, wait=True):
+        nonlocal in_flight, peak
+        assert acmg_engine._held_locks[f"payloads:{genome_build}:{hgvs}"] == f"t:payloads:{genome_build}:{hgvs}"
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        if hgvs == "bad":
+            raise ValueError("boom")
+        upstream = {"clinvar": {"clinical_significance": "Pathogenic"}, "gnomad": {"allele_frequency": 0.02}, "predictions": {}}
+        return acmg_engine._Loaded({src: upstream[src] for src in sources}, [], False)
+
+    async def fake_get_many(keys):
+        keys = list(keys)
+        reads.append(keys)
+        return {k: wrap_entry({"allele_frequency": 0.005}, 3600) for k in keys if k.startswith("mcp:gnomad:GRCh38:") and k.endswith(":v0")}
+
+    async def fake_set_many(items, ttl=300):
+        writes.append((items, ttl))
+
+    async def fake_lock_many(keys, ttl_ms):
+        locks.append(list(keys))
+        return {k: f"t:{k}" for k in locks[-1]}
+
+    async def fake_unlock_many(tokens):
+        assert len(writes) == 1  # released only once the new payloads are cached
+        unlocks.append(tokens)
+
+    monkeypatch.setenv("DETERMINISTIC_TESTS", "0")
+    monkeypatch.setattr(acmg_engine, "_load_payloads", fake_load)
+    monkeypatch.setattr(acmg_engine, "cache_get_many", fake_get_many)
+    monkeypatch.setattr(acmg_engine, "cache_set_many", fake_set_many)
+    monkeypatch.setattr(acmg_engine, "cache_lock_many", fake_lock_many)
+    monkeypatch.setattr(acmg_engine, "cache_unlock_many", fake_unlock_many)
+    monkeypatch.setattr(acmg_engine, "get_settings", lambda: Settings(mcp_coalesce=False))
+    variants = [(f"v{i}", "GRCh38") for i in range(20)] + [("bad", "GRCh38")]
+    start = time.perf_counter()
+    bundles = await acmg_engine.fetch_evidence_many(variants, concurrency=5)
+    assert time.perf_counter() - start < 0.5
+    assert peak == 5
+    assert len(reads) == 1 and len(reads[0]) == 3 * 21
+    assert len(writes) == 1
+    # One lock and one unlock round trip for all 21 misses
+    assert len(locks) == 1 and len(locks[0]) == 21
+    assert len(unlocks) == 1 and len(unlocks[0]) == 21
+    items, ttls = writes[0]
+    # Empty payloads are not cached; each source keeps its own TTL
+    assert len(items) == 20 + 19 and not any(k.startswith("mcp:predictions") for k in items)
+    # Redis keeps entries for the stale window past their soft TTL
+    stale = acmg_engine.get_settings().cache_stale_window
+    assert ttls["mcp:gnomad:GRCh38:4.1:v1"] == 30 * 24 * 3600 + stale and ttls["mcp:clinvar:GRCh38:1:v1"] == 24 * 3600 + stale
+    assert items["mcp:gnomad:GRCh38:4.1:v1"]["v"] == {"allele_frequency": 0.02}
+    assert [e.code for e in bundles[0].evidence] == ["PP5", "BS1"]
+    assert all([e.code for e in b.evidence] == ["PP5", "BA1"] for b in bundles[1:-1])
+    assert isinstance(bundles[-1], ValueError)
+
+
+@pytest.mark.asyncio
+async def test_large_batch_fills_bulk_calls(monkeypatch, fake_mcp):
+    sizes = {}
+    in_flight = 0
+    peak = 0
+
+    async def bulk(path, payload):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        sizes.setdefault(path, []).append(len(payload["hgvs"]))
+        return {"results": {}}
+
+    fake_mcp({}, mcp_coalesce=True, mcp_coalesce_max_keys=100)
+    monkeypatch.setattr(coalescer, "_coalescers", {p: BulkCoalescer(p, window=0.005, max_keys=100, post=bulk) for p in acmg_engine.EVIDENCE_SOURCES.values()})
+    variants = [(f"NM_000000.0:c.{i}A>T", "GRCh38") for i in range(500)]
+    bundles = await acmg_engine.fetch_evidence_many(variants, concurrency=2)
+    assert len(bundles) == 500 and not any(isinstance(b, Exception) for b in bundles)
+    # Groups of MCP_COALESCE_MAX_KEYS variants, at most `concurrency` groups (bulk calls per source) at a time
+    assert sizes == {p + "/bulk": [100] * 5 for p in acmg_engine.EVIDENCE_SOURCES.values()}
+    assert peak <= 2 * len(acmg_engine.EVIDENCE_SOURCES)
+
+
+@pytest.mark.asyncio
+async def test_batch_endpoint_reports_item_errors(monkeypatch, api_client):
+    async def fake_fetch_many(variants, concurrency):
+        return [RuntimeError("evidence unavailable") if h.endswith("G>C") else EvidenceBundle(evidence=[], missing_sources=["gnomad"] if h.endswith("A>G") else []) for h, _ in variants]
+
+    monkeypatch.setattr(batch, "fetch_evidence_many", fake_fetch_many)
+    payload = {"variants": [{"hgvs": "NM_000001.1:c.1A>T"}, {"hgvs": "NM_000001.1:c.2G>C"}, {"hgvs": "NM_000001.1:c.3A>G"}]}
+    resp = await api_client.post("/variants/batch", json=payload)
+    assert resp.status_code == 200
+    items = resp.json()
+    assert [i["hgvs"] for i in items] == [v["hgvs"] for v in payload["variants"]]
+    assert items[1]["error"] == "evidence unavailable" and items[1]["id"] is None
+    assert items[0]["id"] and items[2]["id"] and items[0]["classification"] == "VUS"
+    assert not items[0]["degraded"] and items[2]["degraded"] and items[2]["missing_sources"] == ["gnomad"]
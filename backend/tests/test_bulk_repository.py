@@ -0,0 +1,107 @@
+import pytest
+from sqlalchemy import event, select, func
+from app.repository import variants as variants_repo
+from app.models.variant import Variant
+from app.models.classification_event import ClassificationEvent
+from app.repository.variants import VariantRepository
+from app.services.batch import persist_evaluations
+
+
+@pytest.mark.asyncio
+async def test_upsert_many_dedupes_and_reports_changes(session_factory):
+    def row(i, classification="VUS", evidence=None):
+        return dict(hgvs=f"NM_000001.1:c.{i}A>T", genome_build="GRCh38", classification=classification, evidence=evidence or [{"code": "PM2", "rationale": "x"}], created_by=None)
+
+    async with session_factory() as session:
+        first = await VariantRepository(session).upsert_many([row(0), row(1), row(1)])
+    assert [r.changed for r in first] == [True, True, True] and first[1].id == first[2].id
+    async with session_factory() as session:
+        before = (await session.get(Variant, first[0].id)).last_seen_at
+        # Same content with reordered keys is unchanged; a new classification or new key is a change
+        again = await VariantRepository(session).upsert_many(
+            [row(0, evidence=[{"rationale": "x", "code": "PM2"}]), row(1, "Benign"), row(2)]
+        )
+    assert [r.changed for r in again] == [False, True, True]
+    assert [r.id for r in again[:2]] == [first[0].id, first[1].id]
+    async with session_factory() as session:
+        assert await session.scalar(select(func.count()).select_from(Variant)) == 3
+        assert (await session.get(Variant, first[1].id)).classification == "Benign"
+        assert (await session.get(Variant, first[0].id)).last_seen_at >= before
+
+
+@pytest.mark.asyncio
+async def test_touch_update_is_chunked(session_factory, monkeypatch):
+    monkeypatch.setattr(variants_repo, "LOOKUP_CHUNK", 2)
+    rows = [dict(hgvs=f"NM_000001.1:c.{i}A>T", genome_build="GRCh38", classification="VUS", evidence=[], created_by=None) for i in range(5)]
+    async with session_factory() as session:
+        await VariantRepository(session).upsert_many(rows)
+    updates = []
+    engine = session_factory.kw["bind"].sync_engine
+
+    def listener(conn, cursor, stmt, params, ctx, many):
+        if stmt.startswith("UPDATE"):
+            updates.append(len(params))
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        async with session_factory() as session:
+            again = await VariantRepository(session).upsert_many(rows)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert not any(r.changed for r in again)
+    assert updates == [3, 3, 2]  # last_seen_at plus at most LOOKUP_CHUNK ids per statement
+
+
+@pytest.mark.asyncio
+async def test_persist_appends_events_only_on_change(session_factory):
+    result = {"classification": "VUS", "applied_rules": [{"code": "PM2"}]}
+    async with session_factory() as session:
+        ids = await persist_evaluations(session, [(" NM_000001.1:c.5A>T", "GRCh38", result)] * 2, None)
+        assert ids[0] == ids[1]
+        assert await persist_evaluations(session, [("NM_000001.1:c.5A>T", "GRCh38", result)], None) == ids[:1]
+        await persist_evaluations(session, [("NM_000001.1:c.5A>T", "GRCh38", {**result, "classification": "Benign"})], None)
+    async with session_factory() as session:
+        events = (await session.execute(select(ClassificationEvent.classification).order_by(ClassificationEvent.id))).scalars().all()
+        assert events == ["VUS", "Benign"]
+        assert (await session.get(Variant, ids[0])).hgvs == "NM_000001.1:c.5A>T"
+
+
+@pytest.mark.asyncio
+async def test_degraded_result_never_overwrites_stored_variant(session_factory):
+    complete = {"classification": "Pathogenic", "applied_rules": [{"code": "PS1"}, {"code": "PM2"}], "degraded": False}
+    degraded = {"classification": "VUS", "applied_rules": [{"code": "PM2"}], "degraded": True}
+    async with session_factory() as session:
+        # New variant: the degraded result is all there is, so it is stored
+        (new_id,) = await persist_evaluations(session, [("NM_000001.1:c.7A>T", "GRCh38", degraded)], None)
+        (vid,) = await persist_evaluations(session, [("NM_000001.1:c.6A>T", "GRCh38", complete)], None)
+        # Outage then recovery: neither touches the stored classification or the history
+        assert await persist_evaluations(session, [("NM_000001.1:c.6A>T", "GRCh38", degraded)], None) == [vid]
+        await persist_evaluations(session, [("NM_000001.1:c.6A>T", "GRCh38", complete)], None)
+    async with session_factory() as session:
+        assert (await session.get(Variant, vid)).classification == "Pathogenic"
+        events = (await session.execute(select(ClassificationEvent.variant_id, ClassificationEvent.classification).order_by(ClassificationEvent.id))).all()
+        assert [tuple(e) for e in events] == [(new_id, "VUS"), (vid, "Pathogenic")]
+
+
+@pytest.mark.asyncio
+async def test_degraded_insert_loses_to_concurrent_insert(session_factory):
+    degraded = {"classification": "VUS", "applied_rules": [{"code": "PM2"}], "degraded": True}
+    engine = session_factory.kw["bind"].sync_engine
+    raced = []
+
+    def concurrent_insert(conn, cursor, stmt, params, ctx, many):
+        # Another transaction stores a complete row after our lookup missed it
+        if stmt.startswith("INSERT INTO variants") and not raced:
+            raced.append(True)
+            cursor.execute("INSERT INTO variants (hgvs, genome_build, classification) VALUES ('NM_000001.1:c.8A>T', 'GRCh38', 'Pathogenic')")
+
+    event.listen(engine, "before_cursor_execute", concurrent_insert)
+    try:
+        async with session_factory() as session:
+            (vid,) = await persist_evaluations(session, [("NM_000001.1:c.8A>T", "GRCh38", degraded)], None)
+    finally:
+        event.remove(engine, "before_cursor_execute", concurrent_insert)
+    assert raced
+    async with session_factory() as session:
+        assert (await session.get(Variant, vid)).classification == "Pathogenic"
+        assert (await session.execute(select(func.count()).select_from(ClassificationEvent))).scalar() == 0
@@ -0,0 +1,69 @@
+import time
+import pytest
+from app.services import cache
+from app.services.cache import L1Cache
+
+
+def test_l1_lru_eviction_and_counters():
+    l1 = L1Cache(max_entries=2, max_bytes=1000)
+    l1.set("a", 1, ttl=60, size=10)
+    l1.set("b", 2, ttl=60, size=10)
+    assert l1.get("a") == 1  # "b" becomes least recently used
+    l1.set("c", 3, ttl=60, size=10)
+    assert l1.get("b") is None
+    assert l1.get("c") == 3
+    stats = l1.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"], stats["evictions"]) == (2, 2, 1, 1)
+
+
+def test_l1_byte_cap_and_ttl():
+    l1 = L1Cache(max_entries=100, max_bytes=25)
+    l1.set("a", "x", ttl=60, size=10)
+    l1.set("b", "y", ttl=60, size=10)
+    l1.set("c", "z", ttl=60, size=10)
+    assert l1.bytes == 20 and l1.get("a") is None
+    l1.set("short", "v", ttl=0.01, size=1)
+    time.sleep(0.02)
+    assert l1.get("short") is None and l1.stats()["expirations"] == 1
+
+
+def test_l1_entry_cap_only():
+    l1 = L1Cache(max_entries=2)
+    l1.set("a", 1, ttl=60)
+    l1.set("b", 2, ttl=60)
+    l1.set("c", 3, ttl=60)
+    assert l1.get("a") is None and l1.get("c") == 3
+    assert l1.stats()["entries"] == 2 and l1.bytes == 0
+
+
+class _DownRedis:
+    def pipeline(self, *a, **kw):
+        raise ConnectionError("redis down")
+
+    async def set(self, *a, **kw):
+        raise ConnectionError("redis down")
+
+
+@pytest.mark.asyncio
+async def test_cache_serves_from_l1_when_redis_down(monkeypatch):
+    monkeypatch.setattr(cache, "_l1", L1Cache(100, 10_000))
+    monkeypatch.setattr(cache, "get_client", lambda: _DownRedis())
+    await cache.cache_set("evidence:x", [{"code": "PM2"}], ttl=60)
+    assert await cache.cache_get("evidence:x") == [{"code": "PM2"}]
+    assert await cache.cache_get("evidence:missing") is None
+
+
+@pytest.mark.asyncio
+async def test_get_many_set_many_fall_back_to_l1(monkeypatch):
+    monkeypatch.setattr(cache, "_l1", L1Cache(100, 10_000))
+    monkeypatch.setattr(cache, "get_client", lambda: _DownRedis())
+    await cache.cache_set_many({"evidence:a": [1], "evidence:b": [2]}, ttl=60)
+    assert await cache.cache_get_many(["evidence:a", "evidence:b", "evidence:c", "evidence:a"]) == {"evidence:a": [1], "evidence:b": [2]}
+
+
+@pytest.mark.asyncio
+async def test_lock_many_fails_open_when_redis_down(monkeypatch):
+    monkeypatch.setattr(cache, "get_client", lambda: _DownRedis())
+    tokens = await cache.cache_lock_many(["a", "b"], ttl_ms=100)
+    assert set(tokens) == {"a", "b"} and all(tokens.values())
+    await cache.cache_unlock_many(tokens)
@@ -0,0 +1,33 @@
+import asyncio
+import pytest
+from app.services.coalescer import BulkCoalescer
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_one_bulk_call():
+    calls = []
+
+    async def post(path, payload):
+        calls.append((path, list(payload["hgvs"])))
+        return {"results": {h: {"allele_frequency": i} for i, h in enumerate(payload["hgvs"])}}
+
+    coalescer = BulkCoalescer("/gnomad", window=0.01, max_keys=100, post=post)
+    keys = [f"NM_000000.0:c.{i}A>T" for i in range(20)]
+    results = await asyncio.gather(*(coalescer.get(k) for k in keys + keys[:5]))
+    assert len(calls) == 1
+    assert calls[0][0] == "/gnomad/bulk" and calls[0][1] == keys
+    assert [r["allele_frequency"] for r in results] == list(range(20)) + list(range(5))
+
+
+@pytest.mark.asyncio
+async def test_max_keys_flushes_early_and_failures_propagate():
+    calls = []
+
+    async def post(path, payload):
+        calls.append(len(payload["hgvs"]))
+        raise RuntimeError("mcp down")
+
+    coalescer = BulkCoalescer("/clinvar", window=10.0, max_keys=4, post=post)
+    results = await asyncio.wait_for(asyncio.gather(*(coalescer.get(f"k{i}") for i in range(8)), return_exceptions=True), timeout=1.0)
+    assert calls == [4, 4]
+    assert all(isinstance(r, RuntimeError) for r in results)
@@ -0,0 +1,29 @@
+import random
+from itertools import product
+import pytest
+from app.services.acmg_engine import combine_classification
+from app.services.combining import CAPS, STRENGTHS, classify_counts, classify_counts_array, combine_rules
+
+
+def _grid():
+    # Two past every cap, so clipping is exercised on all axes
+    return product(*(range(cap + 3) for cap in CAPS))
+
+
+def test_lookup_table_matches_reference_rules():
+    for combo in _grid():
+        counts = dict(zip(STRENGTHS, combo))
+        assert classify_counts(combo) == combine_rules(counts), counts
+    assert combine_classification({"VeryStrong": 1, "Strong": 7}) == "Pathogenic"
+    assert combine_classification({}) == "VUS"
+
+
+def test_numpy_batch_matches_reference_rules():
+    np = pytest.importorskip("numpy")
+    rng = random.Random(0)
+    rows = [list(c) for c in _grid()] + [[rng.randint(0, 20) for _ in STRENGTHS] for _ in range(1000)]
+    labels = classify_counts_array(np.array(rows))
+    assert labels.shape == (len(rows),)
+    assert list(labels) == [combine_rules(dict(zip(STRENGTHS, r))) for r in rows]
+    with pytest.raises(ValueError):
+        classify_counts_array(np.zeros((3, 6), dtype=int))
@@ -0,0 +1,50 @@
+import asyncio
+import pytest
+from sqlalchemy import text
+from sqlalchemy.pool import NullPool
+from app.config import Settings
+from app.core.db import InstrumentedPool, build_engine, pool_stats
+
+
+@pytest.mark.asyncio
+async def test_sqlite_engine_applies_pragmas_and_instrumented_pool(tmp_path):
+    engine = build_engine(f"sqlite+aiosqlite:///{tmp_path / 'e.db'}", Settings(sqlite_busy_timeout_ms=1234))
+    assert isinstance(engine.sync_engine.pool, InstrumentedPool)
+    async with engine.connect() as conn:
+        assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+        assert (await conn.execute(text("PRAGMA busy_timeout"))).scalar() == 1234
+        assert (await conn.execute(text("PRAGMA synchronous"))).scalar() == 1  # NORMAL
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_record_waits(tmp_path):
+    engine = build_engine(f"sqlite+aiosqlite:///{tmp_path / 'e.db'}", Settings(db_pool_size=1, db_max_overflow=0))
+
+    async def hold(delay):
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await asyncio.sleep(delay)
+
+    await asyncio.gather(hold(0.05), hold(0))
+    stats = pool_stats(engine)
+    assert stats["size"] == 1 and stats["checked_out"] == 0
+    assert stats["connects"] == 1 and stats["checkouts"] == 2 and stats["waited"] == 1
+    assert stats["wait_time"]["p99"] >= 0.04
+    assert stats["hold_time"]["samples"] == 2 and stats["hold_time"]["p99"] >= 0.04
+
+    # The pool recreated by dispose() keeps the same counters, and counts each event once
+    await engine.dispose()
+    await hold(0)
+    stats = pool_stats(engine)
+    assert stats["connects"] == 2 and stats["checkouts"] == 3 and stats["waited"] == 1
+    await engine.dispose()
+
+
+def test_pool_override_and_postgres_url():
+    engine = build_engine("sqlite+aiosqlite:///./unused.db", poolclass=NullPool)
+    assert pool_stats(engine) == {"pool": "NullPool"}
+    pytest.importorskip("asyncpg")
+    pg = build_engine("postgresql://u:p@localhost/db", Settings(db_statement_cache_size=0))
+    assert pg.url.drivername == "postgresql+asyncpg"
+    assert isinstance(pg.sync_engine.pool, InstrumentedPool)
@@ -0,0 +1,39 @@
+import pytest
+from sqlalchemy import select, func
+from app.models.classification_event import ClassificationEvent
+from app.models.evidence_blob import EvidenceBlob
+from app.models.variant import Variant
+from app.repository.evidence_blobs import EvidenceBlobRepository, evidence_hash
+from app.services.batch import persist_evaluations
+
+EVIDENCE = [{"code": "PM2", "strength": "Moderate", "satisfied": True, "rationale": "absent from controls " * 20, "sources": ["mcp:gnomad"]}]
+
+
+@pytest.mark.asyncio
+async def test_identical_evidence_stored_once_and_compressed(session_factory):
+    result = {"classification": "VUS", "applied_rules": EVIDENCE}
+    async with session_factory() as session:
+        await persist_evaluations(session, [(f"NM_000001.1:c.{i}A>T", "GRCh38", result) for i in range(10)], None)
+        await persist_evaluations(session, [("NM_000001.1:c.0A>T", "GRCh38", {"classification": "VUS", "applied_rules": []})], None)
+    async with session_factory() as session:
+        blobs = (await session.execute(select(EvidenceBlob))).scalars().all()
+        assert sorted(b.hash for b in blobs) == sorted([evidence_hash(EVIDENCE), evidence_hash([])])
+        big = next(b for b in blobs if b.hash == evidence_hash(EVIDENCE))
+        assert big.encoding == "zlib" and len(big.data) < big.size
+        assert await session.scalar(select(func.count()).select_from(Variant).where(Variant.evidence.isnot(None))) == 0
+        assert await session.scalar(select(func.count()).select_from(ClassificationEvent)) == 11
+        assert (await EvidenceBlobRepository(session).get_many([big.hash])) == {big.hash: EVIDENCE}
+
+
+@pytest.mark.asyncio
+async def test_history_resolves_blobs_and_legacy_rows(session_factory, api_client):
+    async with session_factory() as session:
+        (vid,) = await persist_evaluations(session, [("NM_000001.1:c.9A>T", "GRCh38", {"classification": "VUS", "applied_rules": EVIDENCE})], None)
+        await persist_evaluations(session, [("NM_000001.1:c.9A>T", "GRCh38", {"classification": "Benign", "applied_rules": []})], None)
+        session.add(ClassificationEvent(variant_id=vid, classification="VUS", evidence=[{"code": "legacy"}]))
+        await session.commit()
+    resp = await api_client.get(f"/variants/{vid}/history")
+    assert resp.status_code == 200
+    assert [e["evidence"] for e in resp.json()] == [[{"code": "legacy"}], [], EVIDENCE]
+    resp = await api_client.get(f"/variants/{vid}")
+    assert resp.json()["applied_rules"] == [] and resp.json()["classification"] == "Benign"
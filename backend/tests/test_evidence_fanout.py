@@ -0,0 +1,30 @@
+import time
+import pytest
+from app.services import acmg_engine
+
+
+@pytest.mark.asyncio
+async def test_sources_fetched_concurrently(fake_mcp):
+    fake_mcp({"/clinvar": 0.2, "/gnomad": 0.2, "/predictions": 0.2})
+    start = time.perf_counter()
+    res = await acmg_engine.evaluate_variant("NM_000000.0:c.123A>T", "GRCh38")
+    assert time.perf_counter() - start < 0.5
+    assert res["missing_sources"] == []
+    assert {r["code"] for r in res["applied_rules"]} == {"PP5", "PP3"}
+
+
+@pytest.mark.asyncio
+async def test_late_source_degrades(fake_mcp):
+    fake_mcp({"/clinvar": 0.0, "/gnomad": 1.0, "/predictions": 0.0}, gnomad_deadline=0.05)
+    start = time.perf_counter()
+    res = await acmg_engine.evaluate_variant("NM_000000.0:c.123A>T", "GRCh38")
+    assert time.perf_counter() - start < 0.5
+    assert res["missing_sources"] == ["gnomad"]
+    assert "no evidence from gnomad" in res["rationale"]
+
+
+@pytest.mark.asyncio
+async def test_late_source_strict_policy(fake_mcp):
+    fake_mcp({"/clinvar": 1.0, "/gnomad": 0.0, "/predictions": 0.0}, clinvar_deadline=0.05, evidence_partial_policy="strict")
+    with pytest.raises(acmg_engine.EvidenceUnavailable):
+        await acmg_engine.evaluate_variant("NM_000000.0:c.123A>T", "GRCh38")
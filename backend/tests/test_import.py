@@ -0,0 +1,76 @@
+import json
+import pytest
+from app.api import imports
+from app.config import Settings
+from app.services import batch
+from app.services.acmg_engine import EvidenceBundle, Evidence
+
+
+@pytest.fixture
+def fake_engine(monkeypatch, tmp_path):
+    async def fake_fetch_many(variants, concurrency):
+        return [
+            EvidenceBundle(evidence=[Evidence("BA1", "")] if b == "GRCh37" else [], missing_sources=["gnomad"] if h.endswith("c.3A>T") else [])
+            for h, b in variants
+        ]
+
+    monkeypatch.setattr(batch, "fetch_evidence_many", fake_fetch_many)
+    monkeypatch.setattr(imports, "get_settings", lambda: Settings(import_chunk_size=2, import_results_dir=str(tmp_path / "out")))
+
+
+@pytest.mark.asyncio
+async def test_csv_import_streams_ndjson(fake_engine, api_client):
+    csv_body = "hgvs,genome_build\nNM_000001.1:c.1A>T,GRCh38\nNM_000001.1:c.2A>T,GRCh37\n,GRCh38\nNM_000001.1:c.3A>T,\n"
+    resp = await api_client.post("/variants/import", files={"file": ("panel.csv", csv_body, "text/csv")})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    items = [json.loads(line) for line in resp.text.splitlines()]
+    assert [i["position"] for i in items] == [0, 1, 2, 3]
+    assert [i["classification"] for i in items] == ["VUS", "Benign", None, "VUS"]
+    assert items[2]["error"] == "missing hgvs"
+    assert all(i["id"] for i in items if not i["error"])
+    assert [i["degraded"] for i in items] == [False, False, False, True] and items[3]["missing_sources"] == ["gnomad"]
+
+
+@pytest.mark.asyncio
+async def test_vcf_import_to_result_file(fake_engine, api_client):
+    vcf = (
+        "##fileformat=VCFv4.2\n##reference=GRCh37\n"
+        "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\n"
+        "1\t100\t.\tA\tg\t.\tPASS\t.\n"
+        "2\t200\t.\tC\tT\t.\tPASS\tHGVS=NM_000001.1:c.5C>T\n"
+    )
+    resp = await api_client.post("/variants/import", params={"output": "file"}, files={"file": ("calls.vcf", vcf, "text/plain")})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["total"] == 2 and body["failed"] == 0
+    assert body["result_url"] == f"/variants/import/{body['result_id']}"
+    download = await api_client.get(body["result_url"])
+    assert download.status_code == 200 and download.headers["content-type"].startswith("application/x-ndjson")
+    items = [json.loads(line) for line in download.text.splitlines()]
+    assert [i["hgvs"] for i in items] == ["1:g.100A>G", "NM_000001.1:c.5C>T"]
+    assert {i["genome_build"] for i in items} == {"GRCh37"}
+    assert (await api_client.get("/variants/import/" + "0" * 32)).status_code == 404
+    assert (await api_client.get("/variants/import/..%2F..%2Fetc")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_vcf_import_reports_unsupported_alleles(fake_engine, api_client):
+    vcf = (
+        "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\n"
+        "1\t100\t.\tA\tG,T\t.\tPASS\t.\n"
+        "1\t200\t.\tA\t<DEL>\t.\tPASS\t.\n"
+        "1\t300\t.\tA\tA]2:500]\t.\tPASS\t.\n"
+        "1\t400\t.\tAT\tA\t.\tPASS\t.\n"
+        "1\tx\t.\tA\tG\t.\tPASS\t.\n"
+        "1\t500\t.\tC\tT\t.\tPASS\t.\n"
+    )
+    resp = await api_client.post("/variants/import", files={"file": ("calls.vcf", vcf, "text/plain")})
+    items = [json.loads(line) for line in resp.text.splitlines()]
+    assert [i["position"] for i in items] == [0, 1, 2, 3, 4, 5]
+    errors = [i["error"] for i in items]
+    assert errors[0].startswith("multi-allelic ALT")
+    assert "symbolic" in errors[1] and "symbolic" in errors[2]
+    assert "single-base substitution" in errors[3]
+    assert errors[4] == "invalid POS 'x'"
+    assert errors[5] is None and items[5]["hgvs"] == "1:g.500C>T" and items[5]["id"]
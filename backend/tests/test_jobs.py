@@ -0,0 +1,120 @@
+import asyncio
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from app.api import jobs
+from app.config import Settings
+from app.core import tasks
+from app.core.celery_app import celery_app
+from app.repository.batch_jobs import BatchJobRepository
+from app.services import batch, cache, coalescer, mcp_client
+from app.services.acmg_engine import EvidenceBundle
+
+
+def _settings():
+    return Settings(job_chunk_size=3)
+
+
+@pytest.fixture
+def eager_jobs(monkeypatch, session_factory):
+    monkeypatch.setitem(celery_app.conf, "task_always_eager", True)
+    url = session_factory.kw["bind"].url
+    monkeypatch.setattr(tasks, "_sessionmaker", async_sessionmaker(create_async_engine(url, poolclass=NullPool), expire_on_commit=False))
+
+    async def fake_fetch_many(variants, concurrency):
+        return [RuntimeError("no evidence") if "bad" in h else EvidenceBundle(evidence=[], missing_sources=["clinvar"] if h.endswith("c.6A>T") else []) for h, _ in variants]
+
+    monkeypatch.setattr(batch, "fetch_evidence_many", fake_fetch_many)
+    monkeypatch.setattr(tasks, "get_settings", _settings)
+    monkeypatch.setattr(jobs, "get_settings", _settings)
+
+
+@pytest.mark.asyncio
+async def test_job_lifecycle(eager_jobs, api_client):
+    variants = [{"hgvs": f"NM_000001.1:c.{i}A>T"} for i in range(7)] + [{"hgvs": "bad"}]
+    resp = await api_client.post("/jobs/batch", json={"variants": variants})
+    assert resp.status_code == 202
+    job = resp.json()
+    status = (await api_client.get(f"/jobs/{job['job_id']}")).json()
+    assert status["status"] == "completed"
+    assert (status["total"], status["completed"], status["failed"], status["progress"]) == (8, 7, 1, 1.0)
+
+    page1 = (await api_client.get(f"/jobs/{job['job_id']}/results", params={"limit": 5})).json()
+    assert [i["position"] for i in page1["items"]] == [0, 1, 2, 3, 4]
+    page2 = (await api_client.get(f"/jobs/{job['job_id']}/results", params={"after": page1["next_after"], "limit": 5})).json()
+    assert [i["position"] for i in page2["items"]] == [5, 6, 7]
+    assert page2["next_after"] is None
+    assert page2["items"][-1]["error"] == "no evidence" and page2["items"][0]["id"]
+    assert [i["degraded"] for i in page2["items"]] == [False, True, False] and page2["items"][1]["missing_sources"] == ["clinvar"]
+
+
+@pytest.mark.asyncio
+async def test_eager_chunks_use_their_own_loop_and_clients(eager_jobs, api_client, monkeypatch):
+    api_loop = asyncio.get_running_loop()
+    seen = []
+
+    async def fake_fetch_many(variants, concurrency):
+        seen.append((asyncio.get_running_loop(), mcp_client.get_mcp_client(), cache.get_client(), coalescer.get_coalescer("/clinvar")))
+        return [EvidenceBundle(evidence=[]) for _ in variants]
+
+    monkeypatch.setattr(batch, "fetch_evidence_many", fake_fetch_many)
+    resp = await api_client.post("/jobs/batch", json={"variants": [{"hgvs": f"NM_000001.1:c.{i}A>T"} for i in range(4)]})
+    assert resp.status_code == 202 and len(seen) == 2
+    (loop1, mcp1, redis1, co1), (loop2, mcp2, redis2, co2) = seen
+    assert loop1 is not api_loop and loop1 is loop2
+    # Private per chunk, closed afterwards, and never the API loop's shared instances
+    assert mcp1 is not mcp2 and mcp1.closed and mcp2.closed
+    assert mcp_client.get_mcp_client() not in (mcp1, mcp2) and cache.get_client() not in (redis1, redis2)
+    assert co1 is not co2 and coalescer._coalescers.get("/clinvar") not in (co1, co2)
+
+
+@pytest.mark.asyncio
+async def test_unknown_job_404(api_client):
+    assert (await api_client.get("/jobs/nope")).status_code == 404
+
+
+def test_chunk_variants():
+    assert tasks.chunk_variants([1, 2, 3, 4, 5], 2) == [(0, [1, 2]), (2, [3, 4]), (4, [5])]
+
+
+def _items(job_id, positions):
+    return [dict(job_id=job_id, position=p, hgvs=f"NM_000001.1:c.{p}A>T", genome_build="GRCh38", classification="VUS", variant_id=None, error=None) for p in positions]
+
+
+@pytest.mark.asyncio
+async def test_results_hold_back_items_past_an_unfinished_chunk(session_factory):
+    async with session_factory() as session:
+        repo = BatchJobRepository(session)
+        await repo.create("j1", None, total=6)
+        # The second chunk finishes first: nothing is served past the missing positions 0-2
+        await repo.record_chunk("j1", _items("j1", [3, 4, 5]))
+        assert await repo.list_results("j1", after=-1) == []
+        await repo.record_chunk("j1", _items("j1", [0, 1, 2]))
+        assert [i.position for i in await repo.list_results("j1", after=-1, limit=4)] == [0, 1, 2, 3]
+        assert [i.position for i in await repo.list_results("j1", after=3)] == [4, 5]
+
+
+@pytest.mark.asyncio
+async def test_record_chunk_is_idempotent(session_factory):
+    async with session_factory() as session:
+        repo = BatchJobRepository(session)
+        await repo.create("j2", None, total=3)
+        assert await repo.record_chunk("j2", _items("j2", [0, 1, 2])) == 3
+        # A redelivered chunk (acks_late) writes nothing and does not double-count
+        assert await repo.record_chunk("j2", _items("j2", [0, 1, 2])) == 0
+        job = await repo.get("j2")
+        await session.refresh(job)
+        assert (job.completed, job.failed, job.status) == (3, 0, "completed")
+        assert len(await repo.list_results("j2")) == 3
+
+
+@pytest.mark.asyncio
+async def test_redelivered_chunk_task_keeps_job_completed(eager_jobs, session_factory):
+    async with session_factory() as session:
+        await BatchJobRepository(session).create("j3", None, total=2)
+    variants = [["NM_000001.1:c.1A>T", "GRCh38"], ["NM_000001.1:c.2A>T", "GRCh38"]]
+    for _ in range(2):
+        await tasks._classify_chunk("j3", 0, variants, None)
+    async with session_factory() as session:
+        job = await BatchJobRepository(session).get("j3")
+        assert (job.completed, job.failed, job.status) == (2, 0, "completed")
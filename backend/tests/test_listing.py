@@ -0,0 +1,68 @@
+import pytest
+from app.services.batch import persist_evaluations
+
+CLASSES = ["VUS", "Benign", "Pathogenic"]
+
+
+async def _seed(session_factory, n=25):
+    async with session_factory() as session:
+        items = [(f"NM_000001.1:c.{i}A>T", "GRCh38" if i % 2 else "GRCh37", {"classification": CLASSES[i % 3], "applied_rules": []}) for i in range(n)]
+        return await persist_evaluations(session, items, None)
+
+
+async def _pages(api_client, url, **params):
+    pages, cursor = [], None
+    while True:
+        resp = await api_client.get(url, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert resp.status_code == 200
+        pages.append(resp.json())
+        cursor = resp.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_cover_everything_once(session_factory, api_client):
+    ids = await _seed(session_factory)
+    pages = await _pages(api_client, "/variants/", limit=10)
+    assert [len(p) for p in pages] == [10, 10, 5]
+    assert [v["id"] for p in pages for v in p] == sorted(ids, reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_filters_and_limit_cap(session_factory, api_client):
+    ids = await _seed(session_factory)
+    pages = await _pages(api_client, "/variants/", limit=3, classification="Benign", genome_build="GRCh38")
+    got = [v["id"] for p in pages for v in p]
+    assert got == sorted((vid for i, vid in enumerate(ids) if i % 3 == 1 and i % 2), reverse=True)
+    resp = await api_client.get("/variants/", params={"created_after": "2000-01-01T00:00:00", "created_before": "2000-01-02T00:00:00"})
+    assert resp.json() == []
+    assert (await api_client.get("/variants/", params={"limit": 10_000})).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_history_is_paginated(session_factory, api_client):
+    async with session_factory() as session:
+        for i in range(7):
+            (vid,) = await persist_evaluations(session, [("NM_000001.1:c.1A>T", "GRCh38", {"classification": CLASSES[i % 3], "applied_rules": []})], None)
+    pages = await _pages(api_client, f"/variants/{vid}/history", limit=3)
+    assert [len(p) for p in pages] == [3, 3, 1]
+    assert [e["classification"] for p in pages for e in p] == [CLASSES[i % 3] for i in reversed(range(7))]
+
+
+@pytest.mark.asyncio
+async def test_summary_view_skips_evidence(session_factory, api_client, monkeypatch):
+    from app.repository import evidence_blobs
+
+    ids = await _seed(session_factory)
+
+    async def no_blobs(self, hashes):
+        raise AssertionError("summary view must not load evidence")
+
+    with monkeypatch.context() as m:
+        m.setattr(evidence_blobs.EvidenceBlobRepository, "get_many", no_blobs)
+        pages = await _pages(api_client, "/variants/", view="summary", limit=10)
+    assert [v["id"] for p in pages for v in p] == sorted(ids, reverse=True)
+    assert set(pages[0][0]) == {"id", "hgvs", "genome_build", "classification"}
+    full = (await api_client.get("/variants/", params={"limit": 1})).json()
+    assert full[0]["rationale"] == "Persisted record" and "applied_rules" in full[0]
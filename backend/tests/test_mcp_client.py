@@ -0,0 +1,32 @@
+import httpx
+import pytest
+from app.services import mcp_client
+from app.services.mcp_client import MCPClient
+
+
+@pytest.mark.asyncio
+async def test_client_uses_base_url_and_counts_requests():
+    seen = []
+
+    def handler(request: httpx.Request):
+        seen.append(str(request.url))
+        return httpx.Response(200, json={"allele_frequency": 0.001})
+
+    client = MCPClient("http://mcp.test", transport=httpx.MockTransport(handler))
+    for _ in range(3):
+        assert await client.post("/gnomad", {"hgvs": "NM_000000.0:c.1A>T"}) == {"allele_frequency": 0.001}
+    stats = client.stats()
+    assert seen == ["http://mcp.test/gnomad"] * 3
+    assert stats["requests"] == 3 and stats["errors"] == 0
+    await client.aclose()
+    assert client.closed
+
+
+@pytest.mark.asyncio
+async def test_shared_client_lifecycle(monkeypatch):
+    monkeypatch.setattr(mcp_client, "_client", None)
+    client = await mcp_client.init_mcp_client()
+    assert mcp_client.get_mcp_client() is client
+    await mcp_client.close_mcp_client()
+    assert client.closed
+    assert mcp_client.mcp_client_stats() == {"requests": 0}
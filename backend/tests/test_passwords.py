@@ -0,0 +1,68 @@
+import asyncio
+import threading
+import time
+import pytest
+from fastapi import HTTPException
+from app.core import passwords
+from app.core.passwords import PasswordPool
+
+
+@pytest.fixture
+def fast_bcrypt(monkeypatch):
+    monkeypatch.setattr(passwords, "pwd_context", passwords.pwd_context.copy(bcrypt__rounds=4))
+    monkeypatch.setattr(passwords, "_pool", None)
+    yield
+    passwords.close_password_pool()
+
+
+@pytest.mark.asyncio
+async def test_hashing_does_not_block_event_loop():
+    pool = PasswordPool(workers=2, max_queue=8)
+    ctx = passwords.pwd_context.copy(bcrypt__rounds=10)
+    gaps = []
+
+    async def ticker(stop):
+        last = time.monotonic()
+        while not stop.is_set():
+            await asyncio.sleep(0.005)
+            now = time.monotonic()
+            gaps.append(now - last)
+            last = now
+
+    stop = asyncio.Event()
+    tick = asyncio.create_task(ticker(stop))
+    started = time.monotonic()
+    hashes = await asyncio.gather(*(pool.run(ctx.hash, f"pw{i}") for i in range(4)))
+    elapsed = time.monotonic() - started
+    stop.set()
+    await tick
+    pool.shutdown()
+    assert all(ctx.verify(f"pw{i}", h) for i, h in enumerate(hashes))
+    # The loop kept ticking while bcrypt ran on the pool threads
+    assert max(gaps) < elapsed / 2
+    stats = pool.stats()
+    assert stats["completed"] == 4 and stats["queue_wait"]["samples"] == 4 and stats["running"] == 0
+
+
+@pytest.mark.asyncio
+async def test_full_backlog_is_rejected_with_503():
+    pool = PasswordPool(workers=1, max_queue=1)
+    release = threading.Event()
+    blocked = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    with pytest.raises(HTTPException) as exc:
+        await pool.run(release.wait)
+    assert exc.value.status_code == 503
+    assert pool.stats()["queued"] == 1 and pool.stats()["rejected"] == 1
+    release.set()
+    assert await asyncio.gather(*blocked) == [True, True]
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_register_and_login_use_pool(api_client, fast_bcrypt):
+    creds = {"email": "new@example.org", "password": "s3cret-pass"}
+    assert (await api_client.post("/auth/register", json=creds)).status_code == 200
+    assert (await api_client.post("/auth/login", json=creds)).status_code == 200
+    assert (await api_client.post("/auth/login", json={**creds, "password": "wrong"})).status_code == 401
+    assert passwords.password_pool_stats()["completed"] == 3
@@ -0,0 +1,62 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from app.core import replica
+from app.models.base import Base
+from app.models.user import User
+from app.services.batch import persist_evaluations
+
+
+@pytest.fixture
+async def replica_factory(tmp_path, monkeypatch):
+    """A second SQLite file standing in for a lagging replica: same schema, no rows."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    monkeypatch.setattr(replica, "get_read_sessionmaker", lambda: factory)
+    monkeypatch.setattr(replica, "_routed", {"replica": 0, "primary": 0, "pinned": 0})
+    yield factory
+    await engine.dispose()
+
+
+async def _write(session_factory, user_id, n=1, start=0):
+    async with session_factory() as session:
+        items = [(f"NM_000001.1:c.{i}A>T", "GRCh38", {"classification": "VUS", "applied_rules": []}) for i in range(start, start + n)]
+        return await persist_evaluations(session, items, user_id)
+
+
+async def _tester_id(session_factory):
+    async with session_factory() as session:
+        return (await session.execute(select(User.id).where(User.email == "tester@example.org"))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_replica_once_writes_age_out(session_factory, replica_factory, api_client):
+    (variant_id,) = await _write(session_factory, None)
+    # Written moments ago: pinned to the primary even though the replica has not caught up
+    assert (await api_client.get(f"/variants/{variant_id}")).status_code == 200
+    assert replica._routed["pinned"] == 1
+
+    replica._recent_writes().clear()
+    assert (await api_client.get(f"/variants/{variant_id}")).status_code == 404
+    assert (await api_client.get("/variants/")).json() == []
+    assert replica._routed["replica"] == 2
+
+
+@pytest.mark.asyncio
+async def test_writer_reads_own_writes_on_list_and_history(session_factory, replica_factory, api_client):
+    user_id = await _tester_id(session_factory)
+    ids = await _write(session_factory, user_id, n=3)
+    resp = await api_client.get("/variants/")
+    assert sorted(v["id"] for v in resp.json()) == sorted(ids)
+    assert len((await api_client.get(f"/variants/{ids[0]}/history")).json()) == 1
+    assert replica._routed == {"replica": 0, "primary": 0, "pinned": 2}
+
+
+@pytest.mark.asyncio
+async def test_without_replica_reads_use_primary(session_factory, api_client, monkeypatch):
+    monkeypatch.setattr(replica, "get_read_sessionmaker", lambda: None)
+    (variant_id,) = await _write(session_factory, None)
+    replica._recent_writes().clear()
+    assert (await api_client.get(f"/variants/{variant_id}")).status_code == 200
@@ -0,0 +1,135 @@
+import asyncio
+import time
+import pytest
+from app.config import Settings
+from app.services import acmg_engine, coalescer, resilience
+from app.services.coalescer import BulkCoalescer
+from app.services.resilience import CircuitBreaker, CircuitOpen, EndpointGuard, hedged
+
+
+def test_breaker_opens_then_probes_once(monkeypatch):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10.0)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+    later = time.monotonic() + 11
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: later)
+    assert breaker.state == "half-open"
+    assert breaker.allow() and not breaker.allow()  # a single probe
+    breaker.record_failure()
+    assert breaker.state == "open" and breaker.opens == 2
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_fails_fast_and_source_reported_missing(monkeypatch, fake_mcp):
+    calls = []
+
+    async def failing(path, payload):
+        calls.append(path)
+        raise RuntimeError("mcp down")
+
+    fake_mcp({"/clinvar": 0.0, "/gnomad": 0.0, "/predictions": 0.0}, mcp_breaker_failures=2)
+    monkeypatch.setattr(resilience, "get_settings", lambda: Settings(mcp_breaker_failures=2))
+    monkeypatch.setattr(acmg_engine, "mcp_call", failing)
+    for _ in range(3):
+        res = await acmg_engine.evaluate_variant("NM_000000.0:c.1A>T", "GRCh38")
+        assert res["degraded"] and res["missing_sources"] == ["clinvar", "gnomad", "predictions"]
+    assert len(calls) == 6  # third request never reached MCP
+    assert resilience.guard_stats()["/clinvar"]["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_bulk_call_counts_once_per_endpoint(monkeypatch, fake_mcp):
+    calls = []
+
+    async def failing_bulk(path, payload):
+        calls.append((path, len(payload["hgvs"])))
+        raise RuntimeError("mcp down")
+
+    fake_mcp({}, mcp_coalesce=True)
+    monkeypatch.setattr(resilience, "get_settings", lambda: Settings(mcp_breaker_failures=5))
+    monkeypatch.setattr(coalescer, "_coalescers", {p: BulkCoalescer(p, window=0.01, post=failing_bulk, guarded=True) for p in acmg_engine.EVIDENCE_SOURCES.values()})
+    results = await asyncio.gather(*(acmg_engine.evaluate_variant(f"NM_000000.0:c.{i}A>T", "GRCh38") for i in range(6)))
+    assert all(r["missing_sources"] == ["clinvar", "gnomad", "predictions"] for r in results)
+    assert sorted(calls) == [("/clinvar/bulk", 6), ("/gnomad/bulk", 6), ("/predictions/bulk", 6)]
+    # Six waiters shared one upstream request per endpoint: one failure each, breakers stay closed
+    stats = resilience.guard_stats()
+    assert all(stats[p]["consecutive_failures"] == 1 and stats[p]["state"] == "closed" for p in acmg_engine.EVIDENCE_SOURCES.values())
+
+
+@pytest.mark.asyncio
+async def test_adaptive_timeout_tracks_latency(monkeypatch):
+    monkeypatch.setattr(resilience, "get_settings", lambda: Settings(mcp_timeout_min=0.01, mcp_timeout_multiplier=3.0))
+    guard = EndpointGuard(5, 30.0)
+    assert guard.timeout(8.0) == 8.0  # not enough samples yet
+    for _ in range(50):
+        guard.latency.observe(0.02)
+    assert guard.timeout(8.0) == pytest.approx(0.06)
+
+    async def slow():
+        await asyncio.sleep(1.0)
+
+    start = time.perf_counter()
+    with pytest.raises(asyncio.TimeoutError):
+        await guard.call(slow, 8.0)
+    assert time.perf_counter() - start < 0.5 and guard.timeouts == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_returns_faster_copy_and_cancels_other():
+    delays = [1.0, 0.01]
+    cancelled = []
+
+    async def call():
+        delay = delays.pop(0)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(delay)
+            raise
+        return delay
+
+    start = time.perf_counter()
+    assert await hedged(call, 0.02) == 0.01
+    assert time.perf_counter() - start < 0.5
+    await asyncio.sleep(0)
+    assert cancelled == [1.0]
+
+
+@pytest.mark.asyncio
+async def test_circuit_open_raises_without_calling():
+    guard = EndpointGuard(1, 30.0)
+
+    async def boom():
+        raise RuntimeError("x")
+
+    with pytest.raises(RuntimeError):
+        await guard.call(boom, 1.0)
+    with pytest.raises(CircuitOpen):
+        await guard.call(boom, 1.0)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_releases_half_open_slot(monkeypatch):
+    monkeypatch.setattr(resilience, "get_settings", lambda: Settings(mcp_hedge=False, mcp_adaptive_timeout=False))
+    guard = EndpointGuard(1, reset_timeout=0.01)
+    guard.breaker.record_failure()
+    await asyncio.sleep(0.02)
+    assert guard.breaker.state == "half-open"
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    async def ok():
+        return "ok"
+
+    probe = asyncio.ensure_future(guard.call(hang, 5.0))
+    await asyncio.sleep(0)
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+    # The cancelled probe is neither a success nor a failure; the next call probes instead
+    assert guard.breaker.state == "half-open" and guard.breaker.failures == 1
+    assert await guard.call(ok, 5.0) == "ok"
+    assert guard.breaker.state == "closed"
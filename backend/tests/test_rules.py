@@ -0,0 +1,32 @@
+import pytest
+from app.services.rules import RULE_STRENGTH_MAP, RULES, Evidence, EvidenceItem, VariantContext, evaluate, evaluate_many, pvs1_null_variant
+
+
+def test_rules_run_without_io_in_registration_order():
+    ctx = VariantContext(
+        "NM_000000.0:c.12delA",
+        clinvar={"clinical_significance": "Pathogenic"},
+        gnomad={"allele_frequency": 0.005},
+        predictions={"deleterious_tools": 4, "total_tools": 5},
+    )
+    assert [e.code for e in evaluate(ctx)] == ["PVS1", "PP5", "BS1", "PP3"]
+    assert [e.code for e in evaluate(VariantContext("NM_000000.0:c.1C>A"))] == ["PM1"]
+
+
+def test_evaluate_many_matches_single_evaluation():
+    contexts = [
+        VariantContext(f"NM_000000.0:c.{i}{s}", gnomad={"allele_frequency": af}, predictions={"deleterious_tools": d, "total_tools": 5})
+        for i, (s, af, d) in enumerate([("G>A", 0.02, 0), ("del", 0.0001, 5), ("C>T", 0.002, 2), ("dup", None, 1)])
+    ]
+    assert evaluate_many(contexts) == [evaluate(c) for c in contexts]
+    assert evaluate_many(contexts, rules=[pvs1_null_variant]) == [[], [evaluate(contexts[1])[0]], [], [evaluate(contexts[3])[0]]]
+    assert len(RULES) == 6
+
+
+def test_evidence_strength_from_map_and_edge_conversion():
+    for code, strength in RULE_STRENGTH_MAP.items():
+        ev = Evidence(code, "r", ("mcp:clinvar",))
+        assert ev.to_dict() == EvidenceItem(code=code, strength=strength, satisfied=True, rationale="r", sources=["mcp:clinvar"]).model_dump()
+        assert ev.code is Evidence("".join(code), "r").code  # interned
+    with pytest.raises(KeyError):
+        Evidence("XX9", "unknown rule")
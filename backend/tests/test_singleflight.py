@@ -0,0 +1,133 @@
+import asyncio
+import time
+import pytest
+from app.config import Settings
+from app.services import acmg_engine
+from app.services.cache import wrap_entry
+from app.services.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_singleflight_shares_one_call_and_survives_caller_cancel():
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "value"
+
+    sf = SingleFlight()
+    impatient = asyncio.ensure_future(sf.do("k", fetch))
+    others = [asyncio.ensure_future(sf.do("k", fetch)) for _ in range(9)]
+    await asyncio.sleep(0.01)
+    impatient.cancel()
+    assert await asyncio.gather(*others) == ["value"] * 9
+    assert calls == 1 and sf.stats() == {"calls": 1, "shared": 9, "in_flight": 0}
+
+
+@pytest.mark.asyncio
+async def test_burst_of_identical_variants_fetches_once(monkeypatch):
+    calls = []
+
+    async def fake_mcp_call(path, payload):
+        calls.append(path)
+        await asyncio.sleep(0.02)
+        return {}
+
+    async def empty_cache(*args, **kwargs):
+        return {}
+
+    async def lock(key, ttl_ms):
+        return "token"
+
+    async def lock_many(keys, ttl_ms):
+        return {k: "token" for k in keys}
+
+    monkeypatch.setenv("DETERMINISTIC_TESTS", "0")
+    monkeypatch.setattr(acmg_engine, "mcp_call", fake_mcp_call)
+    monkeypatch.setattr(acmg_engine, "cache_get_many", empty_cache)
+    monkeypatch.setattr(acmg_engine, "cache_set_many", empty_cache)
+    monkeypatch.setattr(acmg_engine, "cache_lock", lock)
+    monkeypatch.setattr(acmg_engine, "cache_unlock", empty_cache)
+    monkeypatch.setattr(acmg_engine, "cache_lock_many", lock_many)
+    monkeypatch.setattr(acmg_engine, "cache_unlock_many", empty_cache)
+    monkeypatch.setattr(acmg_engine, "get_settings", lambda: Settings(mcp_coalesce=False))
+    variants = ["NM_000000.0:c.123A>T", " NM_000000.0:c.123A>T "] * 10
+    await asyncio.gather(*(acmg_engine.fetch_evidence(h) for h in variants))
+    assert sorted(calls) == ["/clinvar", "/gnomad", "/predictions"]
+
+
+@pytest.mark.asyncio
+async def test_waits_for_other_process_result(monkeypatch):
+    payloads = {"clinvar": {"clinical_significance": None}, "gnomad": {"allele_frequency": 0.005}, "predictions": {"deleterious_tools": 2, "total_tools": 5}}
+    polls = []
+
+    async def cache_get_many(keys):
+        keys = list(keys)
+        polls.append(keys)
+        if len(polls) < 3:
+            return {}
+        return {k: wrap_entry(payloads[k.split(":")[1]], 3600) for k in keys}
+
+    async def held(key, ttl_ms):
+        return None
+
+    async def held_many(keys, ttl_ms):
+        return {k: None for k in keys}
+
+    async def unlock_many(tokens):
+        assert tokens == {}  # nothing was locked, so nothing is released
+
+    async def fail(*args, **kwargs):
+        raise AssertionError("should not fetch")
+
+    writes = []
+
+    async def cache_set_many(items, ttl=300):
+        writes.append(items)
+
+    monkeypatch.setenv("DETERMINISTIC_TESTS", "0")
+    monkeypatch.setattr(acmg_engine, "cache_get_many", cache_get_many)
+    monkeypatch.setattr(acmg_engine, "cache_set_many", cache_set_many)
+    monkeypatch.setattr(acmg_engine, "cache_lock", held)
+    monkeypatch.setattr(acmg_engine, "cache_lock_many", held_many)
+    monkeypatch.setattr(acmg_engine, "cache_unlock_many", unlock_many)
+    monkeypatch.setattr(acmg_engine, "fetch_sources", fail)
+    monkeypatch.setattr(acmg_engine, "get_settings", lambda: Settings(singleflight_poll_ms=1))
+    bundle = await acmg_engine.fetch_evidence("NM_000000.0:c.9A>T")
+    assert [e.code for e in bundle.evidence] == ["BS1"]
+    assert writes == [{}]  # the other process already cached these payloads
+
+
+@pytest.mark.asyncio
+async def test_local_flight_runs_under_sibling_lock(fake_mcp, monkeypatch):
+    fake_mcp({}, singleflight_lock_ms=2000, singleflight_poll_ms=5)
+    fetches = []
+    replies = 0
+
+    async def fetch_sources(hgvs, sources):
+        fetches.append(hgvs)
+        await asyncio.sleep(0.01)
+        return {src: {} for src in sources}, []
+
+    async def lock_many(keys, ttl_ms):
+        # The caller that wins the lock gets its reply last, so the loser starts the flight
+        nonlocal replies
+        replies += 1
+        if replies == 1:
+            await asyncio.sleep(0.02)
+            return {k: "token" for k in keys}
+        return {k: None for k in keys}
+
+    async def held(key, ttl_ms):
+        return None  # held by the sibling request in this process
+
+    monkeypatch.setattr(acmg_engine, "fetch_sources", fetch_sources)
+    monkeypatch.setattr(acmg_engine, "cache_lock_many", lock_many)
+    monkeypatch.setattr(acmg_engine, "cache_lock", held)
+    start = time.perf_counter()
+    await asyncio.gather(*(acmg_engine.fetch_evidence("NM_000000.0:c.7A>T") for _ in range(2)))
+    assert time.perf_counter() - start < 0.5
+    assert fetches == ["NM_000000.0:c.7A>T"]
+    assert acmg_engine._held_locks == {}
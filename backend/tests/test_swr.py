@@ -0,0 +1,82 @@
+import asyncio
+import time
+import pytest
+from app.config import Settings
+from app.services import acmg_engine
+from app.services.cache import wrap_entry, entry_is_stale, entry_needs_early_refresh
+
+PAYLOADS = {"clinvar": {"clinical_significance": "Pathogenic"}, "gnomad": {"allele_frequency": 0.00001}, "predictions": {}}
+
+
+def test_early_refresh_probability_rises_towards_expiry():
+    entry = wrap_entry({"x": 1}, ttl=100, delta=1.0)
+    entry["t"] = 0.0
+    far = sum(entry_needs_early_refresh(entry, now=10.0) for _ in range(1000))
+    near = sum(entry_needs_early_refresh(entry, now=99.0) for _ in range(1000))
+    assert far == 0 and 250 < near < 500  # P = exp(-1) one delta before expiry
+    assert not entry_needs_early_refresh(entry, now=99.0, beta=0.0)
+    assert entry_is_stale(entry, now=100.0) and not entry_is_stale(entry, now=99.0)
+
+
+@pytest.mark.asyncio
+async def test_stale_entries_served_while_one_background_refresh_runs(monkeypatch):
+    stored = {}
+    fetches = []
+
+    async def cache_get_many(keys):
+        return {k: stored[k] for k in keys if k in stored}
+
+    async def cache_set_many(items, ttl=300):
+        stored.update(items)
+
+    async def cache_lock(key, ttl_ms):
+        return "token"
+
+    async def cache_unlock(key, token):
+        pass
+
+    async def cache_lock_many(keys, ttl_ms):
+        return {k: "token" for k in keys}
+
+    async def cache_unlock_many(tokens):
+        pass
+
+    async def fetch_sources(hgvs, sources):
+        fetches.append(sources)
+        await asyncio.sleep(0.05)
+        return {src: {**PAYLOADS[src], "fresh": True} for src in sources}, []
+
+    monkeypatch.setenv("DETERMINISTIC_TESTS", "0")
+    monkeypatch.setattr(acmg_engine, "cache_get_many", cache_get_many)
+    monkeypatch.setattr(acmg_engine, "cache_set_many", cache_set_many)
+    monkeypatch.setattr(acmg_engine, "cache_lock", cache_lock)
+    monkeypatch.setattr(acmg_engine, "cache_unlock", cache_unlock)
+    monkeypatch.setattr(acmg_engine, "cache_lock_many", cache_lock_many)
+    monkeypatch.setattr(acmg_engine, "cache_unlock_many", cache_unlock_many)
+    monkeypatch.setattr(acmg_engine, "fetch_sources", fetch_sources)
+    monkeypatch.setattr(acmg_engine, "get_settings", lambda: Settings(cache_early_refresh_beta=0.0))
+    hgvs = "NM_000000.0:c.5A>T"
+    policy = acmg_engine.source_cache_policy()
+    for src, payload in PAYLOADS.items():
+        entry = wrap_entry(payload, policy[src][1])
+        entry["t"] = time.time() - policy[src][1] - 1  # past the soft TTL, inside the stale window
+        stored[acmg_engine.payload_key(src, hgvs, "GRCh38", policy[src][0])] = entry
+
+    start = time.perf_counter()
+    bundles = await asyncio.gather(*(acmg_engine.fetch_evidence(hgvs) for _ in range(5)))
+    assert time.perf_counter() - start < 0.05  # nobody waited on the upstream fetch
+    assert all([e.code for e in b.evidence] == ["PP5"] for b in bundles)
+    await asyncio.gather(*acmg_engine._refresh_tasks)
+    assert fetches == [list(PAYLOADS)]
+    assert all(e["v"].get("fresh") for e in stored.values() if e["v"])
+    assert not any(entry_is_stale(e) for e in stored.values())
+
+
+@pytest.mark.asyncio
+async def test_drain_refreshes_waits_then_cancels(monkeypatch):
+    monkeypatch.setattr(acmg_engine, "_refresh_tasks", set())
+    quick = asyncio.ensure_future(asyncio.sleep(0.01, result="done"))
+    slow = asyncio.ensure_future(asyncio.sleep(10))
+    acmg_engine._refresh_tasks.update({quick, slow})
+    await acmg_engine.drain_refreshes(timeout=0.1)
+    assert quick.result() == "done" and slow.cancelled()
@@ -0,0 +1,75 @@
+import asyncio
+import pytest
+from sqlalchemy import func, select
+from app.main import app
+from app.api import variants as variants_api
+from app.models.classification_event import ClassificationEvent
+from app.models.variant import Variant
+from app.services.write_behind import WriteBehindQueue, get_write_behind
+
+
+def _result(classification="VUS"):
+    return {"classification": classification, "applied_rules": [], "rationale": "", "missing_sources": [], "degraded": False}
+
+
+async def _count(session_factory, model):
+    async with session_factory() as session:
+        return (await session.execute(select(func.count()).select_from(model))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_submits_share_one_commit(session_factory):
+    queue = WriteBehindQueue(session_factory, window=0.01, max_rows=100)
+    ids = await asyncio.gather(*(queue.submit(f"NM_000001.1:c.{i}A>T", "GRCh38", _result(), i % 2 or None) for i in range(20)))
+    assert len(set(ids)) == 20
+    assert queue.commits == 1 and queue.stats()["rows_per_commit"] == 20 and queue.outstanding == 0
+    # Ids are handed out only after the commit, so they are visible to any new session
+    assert await _count(session_factory, Variant) == 20
+    assert await _count(session_factory, ClassificationEvent) == 20
+
+
+@pytest.mark.asyncio
+async def test_max_rows_flushes_early_and_groups_serialize(session_factory):
+    queue = WriteBehindQueue(session_factory, window=10, max_rows=5)
+    ids = await asyncio.wait_for(asyncio.gather(*(queue.submit(f"NM_000001.1:c.{i}A>T", "GRCh38", _result(), None) for i in range(10))), 5)
+    assert len(set(ids)) == 10 and queue.commits == 2 and queue.largest_group == 5
+
+
+@pytest.mark.asyncio
+async def test_failing_row_only_fails_its_own_request(session_factory):
+    queue = WriteBehindQueue(session_factory, window=0.01)
+    good = [queue.submit(f"NM_000001.1:c.{i}A>T", "GRCh38", _result(), None) for i in range(3)]
+    bad = queue.submit("NM_000001.1:c.9A>T", "GRCh38", {"classification": "VUS"}, None)
+    results = await asyncio.gather(*good, bad, return_exceptions=True)
+    assert all(isinstance(r, int) for r in results[:3]) and isinstance(results[3], KeyError)
+    assert queue.group_failures == 1 and await _count(session_factory, Variant) == 3
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_queued_rows(session_factory):
+    queue = WriteBehindQueue(session_factory, window=60)
+    pending = [asyncio.ensure_future(queue.submit(f"NM_000001.1:c.{i}A>T", "GRCh38", _result(), None)) for i in range(4)]
+    await asyncio.sleep(0)
+    await queue.close()
+    assert all(p.done() for p in pending) and await _count(session_factory, Variant) == 4
+    assert not queue.accepting()
+
+
+@pytest.mark.asyncio
+async def test_classify_endpoint_uses_write_behind(session_factory, api_client, monkeypatch):
+    async def fake_evaluate(hgvs, genome_build):
+        return _result("Likely Benign")
+
+    monkeypatch.setattr(variants_api, "evaluate_variant", fake_evaluate)
+    queue = WriteBehindQueue(session_factory, window=0.01)
+    app.dependency_overrides[get_write_behind] = lambda: queue
+    resps = await asyncio.gather(*(api_client.post("/variants/classify", json={"hgvs": f"NM_000001.1:c.{i}A>T"}) for i in range(8)))
+    assert all(r.status_code == 200 for r in resps)
+    assert len({r.json()["id"] for r in resps}) == 8
+    assert queue.commits < 8 and queue.rows == 8
+
+    # A closed queue falls back to committing on the request's own session
+    await queue.close()
+    resp = await api_client.post("/variants/classify", json={"hgvs": "NM_000001.1:c.99A>T"})
+    assert resp.status_code == 200 and queue.rows == 8
+    assert await _count(session_factory, Variant) == 9
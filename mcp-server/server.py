@@ -1,30 +1,59 @@
 from fastapi import FastAPI
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from typing import List
 import random
 
 app = FastAPI(title="Cardio MCP Server", version="0.1.0")
 
+MAX_BULK_KEYS = 1000
+
 class HGVSRequest(BaseModel):
     hgvs: str
 
-@app.get("/health")
-async def health():
-    return {"status": "ok"}
+class BulkHGVSRequest(BaseModel):
+    hgvs: List[str] = Field(max_length=MAX_BULK_KEYS)
 
-@app.post("/clinvar")
-async def clinvar(req: HGVSRequest):
+def clinvar_record(hgvs: str) -> dict:
     # Simulated ClinVar record (random significance for test variability)
     sig = random.choice([None, "Pathogenic", "Likely pathogenic", "VUS", "Benign", None])
     return {"rcv": None, "clinical_significance": sig, "variation_id": None}
 
-@app.post("/gnomad")
-async def gnomad(req: HGVSRequest):
+def gnomad_record(hgvs: str) -> dict:
     # Simulated population frequency
     af = random.choice([0.00001, 0.0001, 0.001, 0.01])
     return {"allele_frequency": af}
 
-@app.post("/predictions")
-async def predictions(req: HGVSRequest):
+def predictions_record(hgvs: str) -> dict:
     # Simulated in-silico tool consensus count deleterious
     deleterious = random.randint(0,5)
     return {"deleterious_tools": deleterious, "total_tools": 5}
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+@app.post("/clinvar")
+async def clinvar(req: HGVSRequest):
+    return clinvar_record(req.hgvs)
+
+@app.post("/gnomad")
+async def gnomad(req: HGVSRequest):
+    return gnomad_record(req.hgvs)
+
+@app.post("/predictions")
+async def predictions(req: HGVSRequest):
+    return predictions_record(req.hgvs)
+
+# Bulk variants: one request for many HGVS strings, results keyed by the input HGVS
+
+@app.post("/clinvar/bulk")
+async def clinvar_bulk(req: BulkHGVSRequest):
+    return {"results": {h: clinvar_record(h) for h in req.hgvs}}
+
+@app.post("/gnomad/bulk")
+async def gnomad_bulk(req: BulkHGVSRequest):
+    return {"results": {h: gnomad_record(h) for h in req.hgvs}}
+
+@app.post("/predictions/bulk")
+async def predictions_bulk(req: BulkHGVSRequest):
+    return {"results": {h: predictions_record(h) for h in req.hgvs}}